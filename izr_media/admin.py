@@ -7,6 +7,7 @@ from .models import (
     CalculationMethod,
     ContentItem,
     Event,
+    FourierFit,
     Gallery,
     GalleryImage,
     Hadith,
@@ -119,6 +120,14 @@ class PrayerCalculationConfigAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(FourierFit)
+class FourierFitAdmin(admin.ModelAdmin):
+    # Coefficients come from the fit_fourier management command
+    list_display = ("city", "prayer", "order", "rms_minutes", "source", "fitted_at")
+    list_filter = ("city", "prayer")
+    readonly_fields = ("coefficients", "rms_minutes", "fitted_at")
+
+
 class ContentItemInline(admin.TabularInline):
     model = ContentItem
     extra = 1  # How many extra empty fields to display
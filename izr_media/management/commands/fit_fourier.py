@@ -0,0 +1,117 @@
+from datetime import date, datetime
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+import numpy as np
+
+from izr_media.models import FourierFit, PrayerCalculationConfig
+from izr_media.prayer_times.fourier import DEFAULT_ORDER, fit, rms_error, to_utc_minutes
+from izr_media.prayer_times.fourier_table import CSV_PATH, CSV_YEAR, FourierTable
+from izr_media.prayer_times.local_calculation import (
+    LocalPrayerTimesCalculator,
+    timezone_name,
+)
+from izr_media.prayer_times.table import LEAP_DAY_INDEX, utc_offsets
+
+PRAYERS = ("Fajr", "Isha")
+
+
+class Command(BaseCommand):
+    help = (
+        "Fit truncated Fourier series to Fajr/Isha times of a city and store the "
+        "coefficients used for smoothed dynamic prayer times."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--city", default="regensburg")
+        parser.add_argument("--latitude", type=float, help="Defaults to the prayer config")
+        parser.add_argument("--longitude", type=float, help="Defaults to the prayer config")
+        parser.add_argument(
+            "--csv",
+            type=Path,
+            help="Observed local times, 'Day;Fajr;Isha' rows from Jan 1 of --year; "
+            "365 rows skip Feb 29 of a leap year. Without it the times are "
+            "computed with the local engine.",
+        )
+        parser.add_argument(
+            "--year", type=int, help=f"Year of the CSV rows (default {CSV_YEAR}) "
+            "or first year to compute (default current year)",
+        )
+        parser.add_argument("--years", type=int, default=1, help="Years to compute")
+        parser.add_argument("--order", type=int, default=DEFAULT_ORDER)
+        parser.add_argument("--dry-run", action="store_true", help="Print, do not store")
+
+    def handle(self, *args, **options):
+        config = PrayerCalculationConfig.objects.first()
+        latitude = options["latitude"]
+        longitude = options["longitude"]
+        if latitude is None or longitude is None:
+            if config is None:
+                raise CommandError("No prayer config, pass --latitude and --longitude")
+            latitude = config.default_latitude if latitude is None else latitude
+            longitude = config.default_longitude if longitude is None else longitude
+        city = options["city"].lower()
+        tz_name = timezone_name(latitude, longitude)
+
+        if options["csv"] is None and city == "regensburg" and options["year"] is None:
+            options["csv"] = CSV_PATH
+        if options["csv"] is not None:
+            year = options["year"] or CSV_YEAR
+            columns = FourierTable(options["csv"]).columns()
+            missing = [prayer for prayer in PRAYERS if prayer not in columns]
+            if missing:
+                raise CommandError(f"{options['csv']} has no column {', '.join(missing)}")
+            ordinals = np.arange(date(year, 1, 1).toordinal(), date(year + 1, 1, 1).toordinal())
+            rows = len(columns["Fajr"])
+            if rows not in (365, len(ordinals)):
+                raise CommandError(
+                    f"{options['csv']} has {rows} rows, {year} needs 365 or {len(ordinals)}"
+                )
+            if rows < len(ordinals):
+                # Day-of-year rows like the bundled CSV: no Feb 29
+                ordinals = np.delete(ordinals, LEAP_DAY_INDEX)
+            local = {prayer: columns[prayer].astype(float) for prayer in PRAYERS}
+            source = f"csv {Path(options['csv']).name} ({year})"
+        else:
+            year = options["year"] or datetime.now().year
+            calculator = LocalPrayerTimesCalculator(
+                latitude=latitude,
+                longitude=longitude,
+                calculation_method="izr",
+                fajr_angle=config.fajr_angle if config else 18.0,
+                isha_angle=config.isha_angle if config else 18.0,
+            )
+            table = calculator.compute_years(year, year + options["years"] - 1)
+            ordinals = table.ordinals
+            local = {prayer: table.times[prayer].astype(float) for prayer in PRAYERS}
+            source = f"local engine ({year}-{year + options['years'] - 1})"
+
+        offsets = utc_offsets(tz_name, longitude, ordinals)
+        for prayer in PRAYERS:
+            utc_minutes = to_utc_minutes(local[prayer], offsets)
+            try:
+                coefficients = fit(ordinals, utc_minutes, options["order"])
+            except ValueError as err:
+                raise CommandError(f"{prayer}: {err}") from err
+            rms = rms_error(coefficients, ordinals, utc_minutes)
+            self.stdout.write(
+                f"📈 {city} {prayer}: order {options['order']}, "
+                f"rms {rms:.2f} min over {len(ordinals)} days"
+            )
+            if options["dry_run"]:
+                self.stdout.write(f"   {coefficients}")
+                continue
+            FourierFit.objects.update_or_create(
+                city=city,
+                prayer=prayer,
+                defaults=dict(
+                    latitude=latitude,
+                    longitude=longitude,
+                    order=options["order"],
+                    coefficients=coefficients,
+                    rms_minutes=rms,
+                    source=source,
+                ),
+            )
+        if not options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"✅ Stored Fourier fits for {city}"))
@@ -0,0 +1,85 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from izr_media.models import PrayerCalculationConfig
+from izr_media.prayer_times.crescent import (
+    DEFAULT_CRITERION,
+    YALLOP_CLASSES,
+    hijri_month_starts,
+    propose_correction,
+)
+from izr_media.prayer_times.hijri import HIJRI_MONTHS_EN, hijri_month_range, to_hijri
+from izr_media.prayer_times.ramadan import RAMADAN
+
+
+class Command(BaseCommand):
+    help = (
+        "Estimate the Hijri month starts from crescent visibility and propose the "
+        "correction_day of the prayer config, e.g. from a nightly cron job."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--year", type=int, help="Hijri year, defaults to the next Ramadan's")
+        parser.add_argument("--month", type=int, default=RAMADAN, help="Month the correction is for")
+        parser.add_argument("--criterion", choices=sorted(YALLOP_CLASSES), default=DEFAULT_CRITERION)
+        parser.add_argument("--latitude", type=float, help="Defaults to the prayer config")
+        parser.add_argument("--longitude", type=float, help="Defaults to the prayer config")
+        parser.add_argument(
+            "--apply", action="store_true",
+            help="Store the proposal in the config (clears the prayer time caches once)",
+        )
+        parser.add_argument(
+            "--force", action="store_true", help="Apply even while the month is running",
+        )
+
+    def handle(self, *args, **options):
+        config = PrayerCalculationConfig.objects.first()
+        latitude = options["latitude"]
+        longitude = options["longitude"]
+        if latitude is None or longitude is None:
+            if config is None:
+                raise CommandError("No prayer config, pass --latitude and --longitude")
+            latitude = config.default_latitude if latitude is None else latitude
+            longitude = config.default_longitude if longitude is None else longitude
+        month = options["month"]
+        if not 1 <= month <= 12:
+            raise CommandError("--month must be between 1 and 12")
+
+        today = date.today()
+        year = options["year"]
+        if year is None:
+            year = int(to_hijri([today.toordinal()])[0][0])
+            if hijri_month_range(year, month)[1] < today:
+                year += 1
+
+        estimates = hijri_month_starts(year, latitude, longitude, options["criterion"])
+        self.stdout.write(f"🌙 Hijri year {year} at {latitude:.4f}, {longitude:.4f}")
+        for item in estimates:
+            marker = "👉" if item.month == month else "  "
+            self.stdout.write(
+                f"{marker} {HIJRI_MONTHS_EN[item.month - 1]:<18} conjunction "
+                f"{item.conjunction:%Y-%m-%d %H:%M} UTC, evening {item.evening}: "
+                f"age {item.age_hours:4.1f} h, elongation {item.elongation:4.1f}°, "
+                f"lag {item.lag_minutes:3.0f} min, q {item.q:+.3f} ({item.visibility}) "
+                f"→ starts {item.start} (Umm al-Qura {item.umm_al_qura}, {item.correction:+d})"
+            )
+
+        proposal = propose_correction(estimates, month)
+        self.stdout.write(f"📅 Proposed correction_day: {proposal}")
+        if not options["apply"]:
+            return
+        if config is None:
+            raise CommandError("No prayer config to apply the correction to")
+        if config.correction_day == proposal:
+            self.stdout.write(self.style.SUCCESS("✅ correction_day is already up to date"))
+            return
+
+        first, last = hijri_month_range(year, month, config.correction_day)
+        if first <= today <= last and not options["force"]:
+            raise CommandError(
+                f"{HIJRI_MONTHS_EN[month - 1]} is running, not clearing the caches now (use --force)"
+            )
+        config.correction_day = proposal
+        config.save()
+        self.stdout.write(self.style.SUCCESS(f"✅ Set correction_day to {proposal}"))
@@ -0,0 +1,81 @@
+from datetime import date
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+import numpy as np
+
+from izr_media.models import PrayerCalculationConfig
+from izr_media.prayer_times.angle_series import (
+    AngleSeries,
+    series_path,
+    solve_depression_angles,
+)
+from izr_media.prayer_times.fourier_table import CSV_PATH, CSV_YEAR, FourierTable
+from izr_media.prayer_times.local_calculation import timezone_name
+from izr_media.prayer_times.table import LEAP_DAY_INDEX
+
+COMMON_YEAR_DAYS = 365
+
+
+def _fill_gaps(angles: np.ndarray) -> np.ndarray:
+    """Interpolate days without an angle (sun never that low) from their neighbours."""
+    known = ~np.isnan(angles)
+    if known.all() or not known.any():
+        return angles
+    days = np.arange(len(angles))
+    return np.interp(days, days[known], angles[known], period=len(angles))
+
+
+class Command(BaseCommand):
+    help = (
+        "Solve the effective Fajr/Isha depression angle of every day from observed "
+        "times and write them as a per-day angle series."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--city", default="regensburg")
+        parser.add_argument("--latitude", type=float, help="Defaults to the prayer config")
+        parser.add_argument("--longitude", type=float, help="Defaults to the prayer config")
+        parser.add_argument(
+            "--csv",
+            type=Path,
+            default=CSV_PATH,
+            help="Observed local times, 'Day;Fajr;Isha' rows from Jan 1 of --year",
+        )
+        parser.add_argument("--year", type=int, default=CSV_YEAR, help="Year of the CSV rows")
+        parser.add_argument("--output", type=Path, help="Defaults to the city's series file")
+
+    def handle(self, *args, **options):
+        latitude = options["latitude"]
+        longitude = options["longitude"]
+        if latitude is None or longitude is None:
+            config = PrayerCalculationConfig.objects.first()
+            if config is None:
+                raise CommandError("No prayer config, pass --latitude and --longitude")
+            latitude = config.default_latitude if latitude is None else latitude
+            longitude = config.default_longitude if longitude is None else longitude
+        tz_name = timezone_name(latitude, longitude)
+
+        columns = FourierTable(options["csv"]).columns()
+        if "Fajr" not in columns or "Isha" not in columns:
+            raise CommandError(f"{options['csv']} needs Fajr and Isha columns")
+        first = date(options["year"], 1, 1).toordinal()
+        ordinals = np.arange(first, first + len(columns["Fajr"]))
+
+        angles = {}
+        for prayer, morning in (("Fajr", True), ("Isha", False)):
+            solved = solve_depression_angles(
+                ordinals, columns[prayer], latitude, longitude, tz_name, morning
+            )
+            if len(solved) > COMMON_YEAR_DAYS:
+                # The series is stored per common year, Feb 29 is derived again on use
+                solved = np.delete(solved, LEAP_DAY_INDEX)
+            angles[prayer] = _fill_gaps(solved[:COMMON_YEAR_DAYS])
+            self.stdout.write(
+                f"📐 {prayer}: {np.nanmin(angles[prayer]):.2f}° – "
+                f"{np.nanmax(angles[prayer]):.2f}°, mean {np.nanmean(angles[prayer]):.2f}°"
+            )
+
+        output = options["output"] or series_path(options["city"])
+        AngleSeries(fajr=angles["Fajr"], isha=angles["Isha"]).write(output)
+        self.stdout.write(self.style.SUCCESS(f"✅ Wrote angle series to {output}"))
@@ -0,0 +1,49 @@
+# Generated by Django 5.0 on 2026-10-18 08:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("izr_media", "0007_alter_prayercalculationconfig_isha_angle"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FourierFit",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("city", models.CharField(max_length=100)),
+                (
+                    "prayer",
+                    models.CharField(
+                        choices=[("Fajr", "Fajr"), ("Isha", "Isha")], max_length=10
+                    ),
+                ),
+                ("latitude", models.FloatField()),
+                ("longitude", models.FloatField()),
+                ("order", models.PositiveSmallIntegerField(default=4)),
+                ("coefficients", models.JSONField()),
+                ("rms_minutes", models.FloatField(default=0)),
+                (
+                    "source",
+                    models.CharField(blank=True, default="", max_length=200),
+                ),
+                ("fitted_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Fourier Fit",
+                "verbose_name_plural": "Fourier Fits",
+                "unique_together": {("city", "prayer")},
+            },
+        ),
+    ]
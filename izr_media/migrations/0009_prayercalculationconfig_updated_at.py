@@ -0,0 +1,22 @@
+# Generated by Django 5.0 on 2026-10-18 14:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("izr_media", "0008_fourierfit"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="prayercalculationconfig",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
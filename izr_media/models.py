@@ -151,6 +151,8 @@ class PrayerCalculationConfig(models.Model):
     fajr_angle = models.FloatField(
         validators=[MinValueValidator(12), MaxValueValidator(19)], default=18.0
     )  # Angle for Fajr prayer calculation
+    # Version of every cached table, feed and ETag built from this config
+    updated_at = models.DateTimeField(auto_now=True)
 
     def save(self, *args, **kwargs):
         if not self.pk and PrayerCalculationConfig.objects.exists():
@@ -203,6 +205,34 @@ class PrayerConfig(models.Model):
         verbose_name_plural = "Iqama Times"
 
 
+class FourierFit(models.Model):
+    """Fourier coefficients of a smoothed prayer time for one city."""
+
+    PRAYER_CHOICES = [
+        ("Fajr", "Fajr"),
+        ("Isha", "Isha"),
+    ]
+
+    city = models.CharField(max_length=100)  # Lowercase, as used in cache keys
+    prayer = models.CharField(choices=PRAYER_CHOICES, max_length=10)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    order = models.PositiveSmallIntegerField(default=4)
+    # [c0, a1, b1, ..., an, bn] in UTC minutes, see prayer_times/fourier.py
+    coefficients = models.JSONField()
+    rms_minutes = models.FloatField(default=0)  # Residual of the fit
+    source = models.CharField(max_length=200, blank=True, default="")
+    fitted_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.prayer} smoothing for {self.city}"
+
+    class Meta:
+        unique_together = ("city", "prayer")
+        verbose_name = "Fourier Fit"
+        verbose_name_plural = "Fourier Fits"
+
+
 # Main blog post model
 class Blog(models.Model):
     title = models.CharField(max_length=200)
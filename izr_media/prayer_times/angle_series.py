@@ -0,0 +1,118 @@
+"""Effective twilight depression angles per day.
+
+Observed Fajr/Isha times are turned back into the solar depression angle
+the sun had at that moment, by inverting the hour-angle equation the engine
+uses for :func:`~.astronomy.sun_angle_time`. The resulting day-of-year
+series is stored as a small ``Day;Fajr;Isha`` CSV and can drive the local
+engine through per-day angle arrays.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+import os
+from pathlib import Path
+from typing import Final, Protocol
+
+import numpy as np
+
+from .astronomy import JD_EPOCH, _cos, _sin, mid_day, sun_position
+from .table import common_year_rows, utc_offsets
+
+SERIES_DIR: Final = Path(__file__).parent
+# Hour guesses of the engine's single pass, see compute_prayer_times
+FAJR_GUESS: Final = 5.0
+ISHA_GUESS: Final = 18.0
+
+
+def series_path(city: str) -> Path:
+    return SERIES_DIR / f"{city.lower()}-depression-angles.csv"
+
+
+def solve_depression_angles(
+    ordinals: np.ndarray,
+    local_minutes: np.ndarray,
+    latitude: float,
+    longitude: float,
+    tz_name: str | None,
+    morning: bool,
+) -> np.ndarray:
+    """Return the sun's depression (degrees) at the given local times.
+
+    ``morning`` selects the side of solar noon (Fajr) the times are on.
+    Undefined times (NaN) give NaN angles.
+    """
+    ordinals = np.asarray(ordinals)
+    jd = ordinals + JD_EPOCH - longitude / (15 * 24)
+    shift = utc_offsets(tz_name, longitude, ordinals) - longitude / 15
+    solar_hours = np.asarray(local_minutes, dtype=float) / 60 - shift
+    return depression_at(jd, solar_hours, latitude, morning)
+
+
+def depression_at(jd, solar_hours, latitude: float, morning: bool) -> np.ndarray:
+    """Return the depression at ``solar_hours``, on the engine's own time scale.
+
+    ``jd`` is already shifted by the longitude, as in compute_prayer_times.
+    """
+    guess = FAJR_GUESS if morning else ISHA_GUESS
+    declination, _ = sun_position(jd + guess / 24)
+    noon = mid_day(jd, guess)
+    hour_angle = (noon - solar_hours if morning else solar_hours - noon) * 15
+    altitude = np.degrees(
+        np.arcsin(
+            _sin(latitude) * _sin(declination)
+            + _cos(latitude) * _cos(declination) * _cos(hour_angle)
+        )
+    )
+    return -altitude
+
+
+class AngleProvider(Protocol):
+    """Anything that gives Fajr/Isha depression angles per day."""
+
+    def for_days(self, first: date, count: int) -> tuple[np.ndarray, np.ndarray]: ...
+
+    def on(self, day: date) -> tuple[float, float]: ...
+
+
+@dataclass
+class AngleSeries:
+    """Fajr and Isha depression angles, one row per day of a common year."""
+
+    fajr: np.ndarray
+    isha: np.ndarray
+
+    def for_days(self, first: date, count: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the Fajr and Isha angles of ``count`` days from ``first``."""
+        return (
+            common_year_rows(self.fajr, first, count),
+            common_year_rows(self.isha, first, count),
+        )
+
+    def on(self, day: date) -> tuple[float, float]:
+        fajr, isha = self.for_days(day, 1)
+        return float(fajr[0]), float(isha[0])
+
+    def write(self, path: Path) -> None:
+        lines = ["Day;Fajr;Isha"] + [
+            f"{day};{fajr:.2f};{isha:.2f}"
+            for day, (fajr, isha) in enumerate(zip(self.fajr.tolist(), self.isha.tolist()), 1)
+        ]
+        Path(path).write_text("\n".join(lines) + "\n")
+
+
+_loaded: dict[Path, tuple[float, AngleSeries]] = {}
+
+
+def load_angle_series(city: str) -> AngleSeries | None:
+    """Return the stored series of the city, re-read when the file changes."""
+    path = series_path(city)
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+    cached = _loaded.get(path)
+    if cached is None or cached[0] != mtime:
+        values = np.loadtxt(path, delimiter=";", skiprows=1, usecols=(1, 2), ndmin=2)
+        cached = (mtime, AngleSeries(fajr=values[:, 0].copy(), isha=values[:, 1].copy()))
+        _loaded[path] = cached
+    return cached[1]
@@ -1,10 +1,102 @@
+"""Fajr/Isha angles for Regensburg.
+
+In ``dynamic`` mode the angle changes with the season. A city with a
+stored angle series (see the ``solve_angles`` management command) uses its
+observed angles; anywhere else a seasonal model gives the angle from the
+day of year and the latitude. Each year is computed once and shared.
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Final
+
+import numpy as np
+
 from izr_media.models import (
     PrayerCalculationConfig,
 )  # Import the PrayerConfig model
 
+from .angle_series import AngleProvider, depression_at, load_angle_series
+from .astronomy import JD_EPOCH, RISE_SET_ANGLE, sun_angle_time
+
+# Seasonal twilight length in minutes, 75 + coefficient / 55 * |latitude|, at
+# the winter solstice, ~3 months later, ~4.5 months later and the summer
+# solstice (Moonsighting Committee model)
+FAJR_SEASON_COEFFICIENTS: Final = (28.65, 19.44, 32.74, 48.10)
+ISHA_SEASON_COEFFICIENTS: Final = (25.60, 2.050, -9.21, 6.14)
+# Days since the winter solstice at which the coefficients above apply, in order
+# a, b, c, d, c, b, a
+SEASON_KNOTS: Final = (0, 91, 137, 183, 229, 275, 366)
+
+
+def _season_minutes(days_since_solstice, latitude, coefficients):
+    a, b, c, d = (75 + value / 55 * abs(latitude) for value in coefficients)
+    return np.interp(days_since_solstice, SEASON_KNOTS, (a, b, c, d, c, b, a))
+
+
+@lru_cache(maxsize=32)
+def seasonal_angles(year: int, latitude: float, longitude: float) -> tuple[np.ndarray, np.ndarray]:
+    """Fajr and Isha depression of every day of ``year`` (read-only arrays).
+
+    The model gives twilight in minutes before sunrise / after sunset, and
+    the depression of the sun at that moment is the angle.
+    """
+    ordinals = np.arange(date(year, 1, 1).toordinal(), date(year + 1, 1, 1).toordinal())
+    solstice_month = 12 if latitude >= 0 else 6
+    solstice = date(year, solstice_month, 21).toordinal()
+    previous = date(year - 1, solstice_month, 21).toordinal()
+    days = np.where(ordinals >= solstice, ordinals - solstice, ordinals - previous)
+
+    jd = ordinals + JD_EPOCH - longitude / (15 * 24)
+    sunrise = sun_angle_time(jd, RISE_SET_ANGLE, 6.0, latitude, ccw=True)
+    sunset = sun_angle_time(jd, RISE_SET_ANGLE, 18.0, latitude)
+    fajr_minutes = _season_minutes(days, latitude, FAJR_SEASON_COEFFICIENTS)
+    isha_minutes = _season_minutes(days, latitude, ISHA_SEASON_COEFFICIENTS)
+    fajr = depression_at(jd, sunrise - fajr_minutes / 60, latitude, morning=True)
+    isha = depression_at(jd, sunset + isha_minutes / 60, latitude, morning=False)
+    fajr.flags.writeable = False
+    isha.flags.writeable = False
+    return fajr, isha
+
+
+class SeasonalAngles:
+    """Per-day angles of the seasonal model (an AngleProvider)."""
+
+    def __init__(self, latitude: float, longitude: float) -> None:
+        self.latitude = latitude
+        self.longitude = longitude
+
+    def for_days(self, first: date, count: int) -> tuple[np.ndarray, np.ndarray]:
+        last_year = date.fromordinal(first.toordinal() + count - 1).year
+        years = [
+            seasonal_angles(year, self.latitude, self.longitude)
+            for year in range(first.year, last_year + 1)
+        ]
+        offset = first.toordinal() - date(first.year, 1, 1).toordinal()
+        return tuple(
+            np.concatenate([angles[side] for angles in years])[offset:offset + count]
+            for side in (0, 1)
+        )
+
+    def on(self, day: date) -> tuple[float, float]:
+        fajr, isha = seasonal_angles(day.year, self.latitude, self.longitude)
+        index = day.toordinal() - date(day.year, 1, 1).toordinal()
+        return float(fajr[index]), float(isha[index])
+
+
+def dynamic_angles(
+    city: str, latitude: float, longitude: float
+) -> AngleProvider:
+    """Return the per-day angle provider of a city in dynamic mode."""
+    return load_angle_series(city) or SeasonalAngles(latitude, longitude)
+
 
-def get_regensburg_angles():
-    config = PrayerCalculationConfig.objects.latest("id")
-    print(config.calculation_type)
+def get_regensburg_angles(config=None, day=None):
+    """Return the Fajr/Isha angles for ``day`` (default today) as configured."""
+    config = config or PrayerCalculationConfig.objects.latest("id")
     if config.calculation_type == "static":
         return {"fajr_angle": config.fajr_angle, "isha_angle": config.isha_angle}
+    day = day or datetime.now().date()
+    provider = dynamic_angles("regensburg", config.default_latitude, config.default_longitude)
+    fajr_angle, isha_angle = provider.on(day)
+    return {"fajr_angle": round(fajr_angle, 2), "isha_angle": round(isha_angle, 2)}
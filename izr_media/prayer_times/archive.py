@@ -0,0 +1,164 @@
+"""On-disk archive of raw aladhan responses.
+
+Every successful upstream body is written under a key derived from the URL and
+the normalized query parameters, so an identical request can be answered from
+disk after Redis was flushed or while the upstream is unreachable. In replay
+mode nothing goes over the network: a request that was never archived fails
+with :class:`ArchiveMissError`, and the fallback chain moves on to the next
+source. The least recently used files are dropped beyond a size and age limit.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import Any, Final, Iterator
+
+from django.conf import settings
+
+MODE_OFF: Final = "off"
+MODE_READ_THROUGH: Final = "read-through"
+MODE_REPLAY: Final = "replay"
+MODES: Final = (MODE_OFF, MODE_READ_THROUGH, MODE_REPLAY)
+
+
+class ArchiveMissError(Exception):
+    """Exception raised in replay mode for a request that was never archived"""
+
+    def __init__(self, url: str) -> None:
+        self.message = f"No archived response in replay mode. URL: {url}"
+        super().__init__(self.message)
+
+
+def request_key(url: str, params: dict[str, Any] | None) -> str:
+    """Return the archive key of a request.
+
+    Parameters are sorted and stringified so ``{"a": 1, "b": "x"}`` and
+    ``{"b": "x", "a": 1.0}`` only differ where aladhan would see a difference.
+    """
+    normalized = sorted((str(name), str(value)) for name, value in (params or {}).items())
+    canonical = json.dumps([url, normalized], separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResponseArchive:
+    """Directory of response bodies, two-level fan-out by key prefix."""
+
+    def __init__(
+        self,
+        root: Path | str,
+        mode: str = MODE_READ_THROUGH,
+        max_bytes: int | None = None,
+        max_age: float | None = None,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Archive mode must be one of {MODES}")
+        self.root = Path(root)
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == MODE_REPLAY
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, url: str, params: dict[str, Any] | None) -> bytes | None:
+        """Return the archived body of the request, or None."""
+        path = self.path(request_key(url, params))
+        try:
+            body = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        self._touch(path)
+        return body
+
+    def iter_chunks(
+        self, url: str, params: dict[str, Any] | None, chunk_size: int = 64 * 1024
+    ) -> Iterator[bytes] | None:
+        """Return an iterator over the archived body in chunks, or None."""
+        path = self.path(request_key(url, params))
+        try:
+            body = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        self._touch(path)
+
+        def chunks() -> Iterator[bytes]:
+            with body:
+                yield from iter(lambda: body.read(chunk_size), b"")
+
+        return chunks()
+
+    def put(self, url: str, params: dict[str, Any] | None, body: bytes) -> None:
+        """Store a body atomically, so readers never see a partial file."""
+        for _ in self.tee(url, params, iter((body,))):
+            pass
+
+    def tee(
+        self, url: str, params: dict[str, Any] | None, chunks: Iterator[bytes]
+    ) -> Iterator[bytes]:
+        """Pass ``chunks`` through while writing them to the archive.
+
+        The body is written to a temp file and only renamed into place once
+        the stream is exhausted, so an interrupted stream archives nothing.
+        """
+        path = self.path(request_key(url, params))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in chunks:
+                    tmp.write(chunk)
+                    yield chunk
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        self.prune()
+
+    def prune(self) -> None:
+        """Drop files unused for ``max_age`` seconds, then the least recently
+        used ones until the archive fits in ``max_bytes``."""
+        if self.max_bytes is None and self.max_age is None:
+            return
+        files = []
+        for path in self.root.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        now = time.time()
+        for mtime, size, path in files:
+            expired = self.max_age is not None and now - mtime > self.max_age
+            if not expired and (self.max_bytes is None or total <= self.max_bytes):
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        # Reads count as use, so replayed bodies outlive unused ones
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+
+def get_archive() -> ResponseArchive | None:
+    """Return the archive configured in settings, or None when it is off."""
+    if settings.ALADHAN_ARCHIVE_MODE == MODE_OFF:
+        return None
+    return ResponseArchive(
+        settings.ALADHAN_ARCHIVE_DIR,
+        settings.ALADHAN_ARCHIVE_MODE,
+        max_bytes=settings.ALADHAN_ARCHIVE_MAX_MB * 1024 * 1024 or None,
+        max_age=settings.ALADHAN_ARCHIVE_MAX_AGE_DAYS * 86400 or None,
+    )
@@ -0,0 +1,344 @@
+"""Local solar-position engine for prayer times.
+
+Port of the PrayTimes algorithm that api.aladhan.com is built on, so prayer
+times can be computed in-process instead of over the network. Every function
+accepts plain floats as well as NumPy arrays of days.
+"""
+
+from typing import Final, NamedTuple, Sequence
+
+import numpy as np
+
+# Julian day at 0h UT of a date is date.toordinal() + JD_EPOCH
+JD_EPOCH: Final = 1721424.5
+J2000: Final = 2451545.0
+
+# Refraction-corrected altitude of the sun's upper limb at sunrise/sunset
+RISE_SET_ANGLE: Final = 0.833
+
+PRAYER_NAMES: Final = (
+    "Imsak",
+    "Fajr",
+    "Sunrise",
+    "Dhuhr",
+    "Asr",
+    "Sunset",
+    "Maghrib",
+    "Isha",
+    "Midnight",
+)
+
+# Order of the values in the aladhan ``tune`` string; Maghrib comes before Sunset
+TUNE_ORDER: Final = (
+    "Imsak",
+    "Fajr",
+    "Sunrise",
+    "Dhuhr",
+    "Asr",
+    "Maghrib",
+    "Sunset",
+    "Isha",
+    "Midnight",
+)
+
+
+class MethodParams(NamedTuple):
+    """Twilight parameters of a calculation method.
+
+    Isha and Maghrib are either an angle or a number of minutes after the
+    preceding event (``isha_minutes`` / ``maghrib_minutes``).
+    """
+
+    fajr_angle: float
+    isha_angle: float | None = None
+    isha_minutes: float | None = None
+    maghrib_angle: float | None = None
+    maghrib_minutes: float = 0
+    midnight: str = "standard"
+
+
+# Same parameters aladhan uses for each of its method ids
+METHOD_PARAMS: Final = {
+    0: MethodParams(16, 14, maghrib_angle=4, midnight="jafari"),
+    1: MethodParams(18, 18),
+    2: MethodParams(15, 15),
+    3: MethodParams(18, 17),
+    4: MethodParams(18.5, isha_minutes=90),
+    5: MethodParams(19.5, 17.5),
+    7: MethodParams(17.7, 14, maghrib_angle=4.5, midnight="jafari"),
+    8: MethodParams(19.5, isha_minutes=90),
+    9: MethodParams(18, 17.5),
+    10: MethodParams(18, isha_minutes=90),
+    11: MethodParams(20, 18),
+    12: MethodParams(12, 12),
+    13: MethodParams(18, 17),
+    14: MethodParams(16, 15),
+    15: MethodParams(18, 18),
+    16: MethodParams(18.2, 18.2),
+    17: MethodParams(20, 18),
+    18: MethodParams(18, 18),
+    19: MethodParams(18, 17),
+    20: MethodParams(20, 18),
+    21: MethodParams(19, 17),
+    22: MethodParams(18, isha_minutes=77, maghrib_minutes=3),
+    23: MethodParams(18, 18, maghrib_minutes=5),
+    99: MethodParams(18, 17),
+}
+
+IMSAK_MINUTES: Final = 10
+ASR_FACTORS: Final = {0: 1, 1: 2}
+
+# Night portions used by the high latitude rules, keyed by aladhan id
+LAT_ADJ_NONE: Final = 0
+LAT_ADJ_MIDDLE_OF_NIGHT: Final = 1
+LAT_ADJ_ONE_SEVENTH: Final = 2
+LAT_ADJ_ANGLE_BASED: Final = 3
+
+
+def _sin(deg):
+    return np.sin(np.radians(deg))
+
+
+def _cos(deg):
+    return np.cos(np.radians(deg))
+
+
+def _tan(deg):
+    return np.tan(np.radians(deg))
+
+
+def _fix_hour(hours):
+    return np.mod(hours, 24.0)
+
+
+def sun_position(jd):
+    """Return the sun's declination (degrees) and equation of time (hours)."""
+    d = np.asarray(jd, dtype=float) - J2000
+    g = np.mod(357.529 + 0.98560028 * d, 360.0)
+    q = np.mod(280.459 + 0.98564736 * d, 360.0)
+    ecl_lng = np.mod(q + 1.915 * _sin(g) + 0.020 * _sin(2 * g), 360.0)
+    obliquity = 23.439 - 0.00000036 * d
+
+    right_ascension = _fix_hour(
+        np.degrees(np.arctan2(_cos(obliquity) * _sin(ecl_lng), _cos(ecl_lng))) / 15
+    )
+    equation_of_time = q / 15 - right_ascension
+    declination = np.degrees(np.arcsin(_sin(obliquity) * _sin(ecl_lng)))
+    return declination, equation_of_time
+
+
+def mid_day(jd, hours):
+    """Return the time of solar noon in hours (UTC offset by the longitude)."""
+    _, equation_of_time = sun_position(jd + hours / 24)
+    return _fix_hour(12 - equation_of_time)
+
+
+def sun_angle_time(jd, angle, hours, latitude, ccw=False):
+    """Return the time at which the sun reaches ``angle`` below the horizon.
+
+    ``ccw`` selects the morning side of noon. Days on which the sun never
+    reaches the angle come back as NaN.
+    """
+    declination, _ = sun_position(jd + hours / 24)
+    noon = mid_day(jd, hours)
+    cos_hour_angle = (-_sin(angle) - _sin(declination) * _sin(latitude)) / (
+        _cos(declination) * _cos(latitude)
+    )
+    with np.errstate(invalid="ignore"):
+        hour_angle = np.degrees(np.arccos(cos_hour_angle)) / 15
+    return noon - hour_angle if ccw else noon + hour_angle
+
+
+def asr_time(jd, factor, hours, latitude):
+    """Return Asr, when an object's shadow is ``factor`` times its length plus noon shadow."""
+    declination, _ = sun_position(jd + hours / 24)
+    angle = -np.degrees(np.arctan(1 / (factor + _tan(np.abs(latitude - declination)))))
+    return sun_angle_time(jd, angle, hours, latitude)
+
+
+def _time_diff(start, end):
+    return _fix_hour(end - start)
+
+
+def _night_portion(angle, night, lat_adj_method):
+    if lat_adj_method == LAT_ADJ_MIDDLE_OF_NIGHT:
+        portion = 1 / 2
+    elif lat_adj_method == LAT_ADJ_ONE_SEVENTH:
+        portion = 1 / 7
+    else:
+        portion = np.asarray(angle, dtype=float) / 60
+    return portion * night
+
+
+def high_latitude_days(time, base, portion, ccw=False):
+    """Return the mask of days a high-latitude rule must patch.
+
+    Those are the days the angle is never reached (NaN) and, like aladhan,
+    the days on which twilight lasts longer than the rule's share of the night.
+    """
+    diff = _time_diff(time, base) if ccw else _time_diff(base, time)
+    with np.errstate(invalid="ignore"):
+        return np.isnan(time) | (diff > portion)
+
+
+def _adjust_high_lat_time(time, base, angle, night, lat_adj_method, ccw=False):
+    portion = _night_portion(angle, night, lat_adj_method)
+    affected = high_latitude_days(time, base, portion, ccw)
+    if not np.any(affected):
+        return time
+    adjusted = base - portion if ccw else base + portion
+    if np.ndim(affected) == 0:
+        return adjusted
+    # Only the affected days are rewritten, the rest keep their angle time
+    time = np.array(np.broadcast_to(time, affected.shape), dtype=float)
+    days = np.flatnonzero(affected)
+    time.reshape(-1)[days] = np.broadcast_to(adjusted, time.shape).reshape(-1)[days]
+    return time
+
+
+def compute_prayer_times(
+    jd,
+    latitude: float,
+    longitude: float,
+    utc_offset,
+    params: MethodParams,
+    asr_factor: int = 1,
+    tune: dict[str, float] | None = None,
+    lat_adj_method: int = LAT_ADJ_ANGLE_BASED,
+    midnight: str | None = None,
+) -> dict[str, np.ndarray]:
+    """Compute prayer times for the Julian day(s) ``jd`` (0h UT of each date).
+
+    Returns local times in hours, keyed by the aladhan timing names.
+    """
+    jd = np.asarray(jd, dtype=float) - longitude / (15 * 24)
+    utc_offset = np.asarray(utc_offset, dtype=float)
+
+    # One pass from the PrayTimes default guesses, like aladhan
+    fajr = sun_angle_time(jd, params.fajr_angle, 5.0, latitude, ccw=True)
+    sunrise = sun_angle_time(jd, RISE_SET_ANGLE, 6.0, latitude, ccw=True)
+    dhuhr = mid_day(jd, 12.0)
+    asr = asr_time(jd, asr_factor, 13.0, latitude)
+    sunset = sun_angle_time(jd, RISE_SET_ANGLE, 18.0, latitude)
+    maghrib = (
+        sun_angle_time(jd, params.maghrib_angle, 18.0, latitude)
+        if params.maghrib_angle is not None
+        else sunset
+    )
+    isha = (
+        sun_angle_time(jd, params.isha_angle, 18.0, latitude)
+        if params.isha_angle is not None
+        else sunset
+    )
+
+    shift = utc_offset - longitude / 15
+    times = {
+        "Fajr": fajr + shift,
+        "Sunrise": sunrise + shift,
+        "Dhuhr": dhuhr + shift,
+        "Asr": asr + shift,
+        "Sunset": sunset + shift,
+        "Maghrib": maghrib + shift,
+        "Isha": isha + shift,
+    }
+
+    if lat_adj_method != LAT_ADJ_NONE:
+        night = _time_diff(times["Sunset"], times["Sunrise"])
+        times["Fajr"] = _adjust_high_lat_time(
+            times["Fajr"], times["Sunrise"], params.fajr_angle, night,
+            lat_adj_method, ccw=True,
+        )
+        if params.isha_angle is not None:
+            times["Isha"] = _adjust_high_lat_time(
+                times["Isha"], times["Sunset"], params.isha_angle, night,
+                lat_adj_method,
+            )
+        if params.maghrib_angle is not None:
+            times["Maghrib"] = _adjust_high_lat_time(
+                times["Maghrib"], times["Sunset"], params.maghrib_angle, night,
+                lat_adj_method,
+            )
+
+    times["Imsak"] = times["Fajr"] - IMSAK_MINUTES / 60
+    if params.maghrib_angle is None:
+        times["Maghrib"] = times["Sunset"] + params.maghrib_minutes / 60
+    if params.isha_minutes is not None:
+        times["Isha"] = times["Maghrib"] + params.isha_minutes / 60
+
+    midnight = midnight or params.midnight
+    next_morning = times["Fajr"] if midnight == "jafari" else times["Sunrise"]
+    times["Midnight"] = times["Sunset"] + _time_diff(times["Sunset"], next_morning) / 2
+
+    if tune:
+        for name, minutes in tune.items():
+            times[name] = times[name] + minutes / 60
+    return times
+
+
+def _column(values) -> np.ndarray:
+    """Per-method values as an (M, 1) column, None becoming NaN."""
+    return np.array([np.nan if value is None else value for value in values], dtype=float)[:, None]
+
+
+def compute_method_matrix(
+    jd,
+    latitude: float,
+    longitude: float,
+    utc_offset,
+    methods: Sequence[MethodParams],
+    asr_factors: Sequence[int] = (1, 2),
+    lat_adj_method: int = LAT_ADJ_ANGLE_BASED,
+) -> dict[str, np.ndarray]:
+    """Compute the times of several methods for the same days in one pass.
+
+    Sunrise, Dhuhr, Sunset and Asr do not depend on the method and come back
+    as ``(days,)`` arrays, Asr as ``(len(asr_factors), days)``. Everything
+    else is a ``(methods, days)`` matrix: the method angles are a column that
+    broadcasts against the shared declination and solar noon of each day.
+    """
+    jd = np.asarray(jd, dtype=float) - longitude / (15 * 24)
+    shift = np.asarray(utc_offset, dtype=float) - longitude / 15
+
+    sunrise = sun_angle_time(jd, RISE_SET_ANGLE, 6.0, latitude, ccw=True) + shift
+    sunset = sun_angle_time(jd, RISE_SET_ANGLE, 18.0, latitude) + shift
+    dhuhr = mid_day(jd, 12.0) + shift
+    asr = np.stack([asr_time(jd, factor, 13.0, latitude) + shift for factor in asr_factors])
+
+    fajr_angle = _column(method.fajr_angle for method in methods)
+    isha_angle = _column(method.isha_angle for method in methods)
+    maghrib_angle = _column(method.maghrib_angle for method in methods)
+    fajr = sun_angle_time(jd, fajr_angle, 5.0, latitude, ccw=True) + shift
+    isha = sun_angle_time(jd, isha_angle, 18.0, latitude) + shift
+    maghrib = sun_angle_time(jd, maghrib_angle, 18.0, latitude) + shift
+
+    if lat_adj_method != LAT_ADJ_NONE:
+        night = _time_diff(sunset, sunrise)
+        fajr = _adjust_high_lat_time(fajr, sunrise, fajr_angle, night, lat_adj_method, ccw=True)
+        isha = _adjust_high_lat_time(isha, sunset, isha_angle, night, lat_adj_method)
+        maghrib = _adjust_high_lat_time(maghrib, sunset, maghrib_angle, night, lat_adj_method)
+
+    # Methods without a Maghrib/Isha angle count minutes from the preceding event
+    maghrib = np.where(
+        np.isnan(maghrib_angle), sunset + _column(m.maghrib_minutes for m in methods) / 60, maghrib
+    )
+    isha_minutes = _column(method.isha_minutes for method in methods)
+    isha = np.where(np.isnan(isha_minutes), isha, maghrib + isha_minutes / 60)
+
+    jafari = np.array([method.midnight == "jafari" for method in methods])[:, None]
+    next_morning = np.where(jafari, fajr, sunrise)
+    return {
+        "Imsak": fajr - IMSAK_MINUTES / 60,
+        "Fajr": fajr,
+        "Sunrise": sunrise,
+        "Dhuhr": dhuhr,
+        "Asr": asr,
+        "Sunset": sunset,
+        "Maghrib": maghrib,
+        "Isha": isha,
+        "Midnight": sunset + _time_diff(sunset, next_morning) / 2,
+    }
+
+
+def to_minutes(hours):
+    """Round local hours to whole minutes since midnight (NaN stays NaN)."""
+    return np.mod(np.floor(np.asarray(hours) * 60 + 0.5), 1440)
@@ -1,11 +1,14 @@
 """Prayer times calculator api."""
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 import json
-from typing import Any, Final, List
-import unicodedata
+from typing import Any, Final, Iterator, List
 
-import requests
+from .archive import ArchiveMissError, get_archive
+from .hijri import format_hijri
+from .http_client import Deadline, DeadlineExceededError, get_client
+from .streaming import CalendarStreamError, iter_calendar_days
 
 
 class Error(Exception):
@@ -62,6 +65,12 @@ MIDNIGHT_MODES: Final = {"standard": 0, "jafari": 1}
 LAT_ADJ_METHODS: Final = {"middle of the night": 1,
                           "one seventh": 2, "angle based": 3}
 
+# Bytes read from the socket at a time when streaming the annual calendar
+STREAM_CHUNK_SIZE: Final = 64 * 1024
+
+# Extra rounds in which months that failed during a fan-out are re-requested
+FAN_OUT_RETRY_ROUNDS: Final = 2
+
 
 class PrayerTimesCalculator:
     """Prayer time calculator class."""
@@ -89,6 +98,7 @@ class PrayerTimesCalculator:
         isha_angle: float | int | None = None,
         shafaq="general",
         iso8601=False,
+        deadline: Deadline | None = None,
     ) -> None:
         if calculation_method.lower() not in CALCULATION_METHODS:
             raise CalculationMethodError(
@@ -140,6 +150,8 @@ class PrayerTimesCalculator:
         else:
             self._tune = ""
         self.iso8601 = "true" if iso8601 else "false"
+        # Shared by every upstream call of this calculator, see http_client
+        self.deadline = deadline
 
     @staticmethod
     def parse_method_settings(
@@ -189,22 +201,72 @@ class PrayerTimesCalculator:
             params["methodSettings"] = self._method_settings
         return params
 
-    def _format_response(self, data: dict) -> dict:
-        def remove_diacritics(text):
-            return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    def _get(self, url: str, params: dict[str, Any], error_message: str) -> bytes:
+        """Return the raw body of an upstream request.
+
+        Answered from the response archive when it holds the request;
+        successful upstream bodies are archived for next time.
+        """
+        archive = get_archive()
+        if archive is not None:
+            body = archive.get(url, params)
+            if body is not None:
+                return body
+            if archive.replay:
+                raise ArchiveMissError(url)
+
+        response = get_client().get(url, params=params, deadline=self.deadline)
+
+        if not response.status_code == 200:
+            raise InvalidResponseError(f"{error_message} URL: {url}")
+
+        if archive is not None:
+            archive.put(url, params, response.content)
+        return response.content
+
+    def _stream(
+        self, url: str, params: dict[str, Any], error_message: str
+    ) -> Iterator[bytes]:
+        """Yield the raw body of an upstream request in chunks as it arrives.
+
+        Same archive behaviour as :meth:`_get`, without holding the body.
+        """
+        archive = get_archive()
+        if archive is not None:
+            chunks = archive.iter_chunks(url, params, STREAM_CHUNK_SIZE)
+            if chunks is not None:
+                yield from chunks
+                return
+            if archive.replay:
+                raise ArchiveMissError(url)
+
+        response = get_client().get(url, params=params, deadline=self.deadline, stream=True)
+        with response:
+            if not response.status_code == 200:
+                raise InvalidResponseError(f"{error_message} URL: {url}")
+
+            chunks = self._within_deadline(url, response.iter_content(STREAM_CHUNK_SIZE))
+            if archive is not None:
+                chunks = archive.tee(url, params, chunks)
+            yield from chunks
+
+    def _within_deadline(self, url: str, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Pass ``chunks`` through until the deadline passes mid-body."""
+        for chunk in chunks:
+            if self.deadline is not None and self.deadline.expired:
+                raise DeadlineExceededError(url)
+            yield chunk
 
+    def _format_response(self, data: dict) -> dict:
         """Format the API response to return prayer times in the desired format."""
-        hijri = str(data["date"]["hijri"]["date"]).split("-")
-        hijri_ar = (
-            hijri[0] + " " + data["date"]["hijri"]["month"]["ar"] + " " + hijri[2]
-        )
-        hijri_en = (
-            hijri[0] + " " + data["date"]["hijri"]["month"]["en"] + " " + hijri[2]
+        hijri = data["date"]["hijri"]
+        hijri_en, hijri_ar = format_hijri(
+            int(hijri["year"]), int(hijri["month"]["number"]), int(hijri["day"])
         )
         return {
             "Datum": data["date"]["gregorian"]["date"],
             "Hijri_ar": hijri_ar,
-            "Hijri": remove_diacritics(hijri_en),
+            "Hijri": hijri_en,
             "Fajr": data["timings"]["Fajr"].split(" ")[0],
             "Shuruq": data["timings"]["Sunrise"].split(" ")[0],
             "Dhuhr": data["timings"]["Dhuhr"].split(" ")[0],
@@ -225,49 +287,99 @@ class PrayerTimesCalculator:
         url = f"{API_URL}/timings/{self._date}"
         params = self._build_params()
 
-        response = requests.get(url, params=params, timeout=10)
-
-        if not response.status_code == 200:
-            raise InvalidResponseError(
-                f"Unable to retrieve prayer times. URL: {url}")
+        body = self._get(url, params, "Unable to retrieve prayer times.")
 
-        return self._format_response(response.json()["data"])
+        return self._format_response(json.loads(body)["data"])
 
     def fetch_monthly_prayer_times(
         self, month: int, year: int, hijri: bool = False
     ) -> List[dict[str, Any]]:
-        """Fetch monthly prayer times."""
+        """Fetch monthly prayer times, parsed day by day as the body streams in."""
         url = f"{API_URL}/{'hijriCalendar' if hijri else 'calendar'}/{year}/{month}"
         params = self._build_params()
+        chunks = self._stream(url, params, "Unable to retrieve monthly prayer times.")
 
-        response = requests.get(url, params=params, timeout=10)
+        try:
+            return [self._format_response(day) for day in iter_calendar_days(chunks)]
+        except CalendarStreamError as err:
+            raise InvalidResponseError(
+                f"Unable to parse monthly prayer times. URL: {url}"
+            ) from err
 
-        if not response.status_code == 200:
+    def _fetch_annual_by_month(
+        self, year: int, hijri: bool = False
+    ) -> List[dict[str, Any]]:
+        """Fetch the 12 monthly documents of a year concurrently.
+
+        Months that fail are re-requested on their own, so one transient
+        error does not cost the whole year. With a deadline, months still
+        pending when it passes are given up and no further round starts.
+        """
+        months: dict[int, List[dict[str, Any]]] = {}
+        errors: dict[int, Exception] = {}
+        pending = list(range(1, 13))
+        executor = ThreadPoolExecutor(max_workers=12)
+        try:
+            for _ in range(1 + FAN_OUT_RETRY_ROUNDS):
+                futures = {
+                    month: executor.submit(
+                        self.fetch_monthly_prayer_times, month, year, hijri
+                    )
+                    for month in pending
+                }
+                wait(
+                    futures.values(),
+                    timeout=None if self.deadline is None else self.deadline.remaining(),
+                )
+                errors = {}
+                for month, future in futures.items():
+                    if not future.done():
+                        future.cancel()
+                        errors[month] = DeadlineExceededError(f"{API_URL}/calendar/{year}/{month}")
+                        continue
+                    try:
+                        months[month] = future.result()
+                    except Exception as err:
+                        errors[month] = err
+                pending = list(errors)
+                if not pending or (self.deadline is not None and self.deadline.expired):
+                    break
+                # A replay miss stays a miss; let the fallback chain move on
+                for err in errors.values():
+                    if isinstance(err, ArchiveMissError):
+                        raise err
+        finally:
+            # Running months end by their own timeouts, nobody waits for them
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if errors:
             raise InvalidResponseError(
-                f"Unable to retrieve monthly prayer times. URL: {url}"
+                f"Unable to retrieve annual prayer times for {year}. "
+                f"Failed months: {sorted(errors)} ({next(iter(errors.values()))})"
             )
 
-        return [self._format_response(day) for day in response.json()["data"]]
+        return [day for month in range(1, 13) for day in months[month]]
 
     def fetch_annual_prayer_times(
-        self, year: int, hijri: bool = False
+        self, year: int, hijri: bool = False, fan_out: bool = False
     ) -> List[dict[str, Any]]:
-        """Fetch annual prayer times."""
+        """Fetch annual prayer times.
+
+        With ``fan_out`` the year is assembled from 12 concurrent monthly
+        requests instead of one ``/calendar/{year}`` request. Either way the
+        bodies are parsed one day at a time as they stream in.
+        """
+        if fan_out:
+            return self._fetch_annual_by_month(year, hijri)
+
         url = f"{API_URL}/{'hijriCalendar' if hijri else 'calendar'}/{year}"
         params = self._build_params()
-        print("url : ", url)
-        response = requests.get(url, params=params, timeout=10)
+        chunks = self._stream(url, params, "Unable to retrieve annual prayer times.")
 
-        if not response.status_code == 200:
+        # Format each day as soon as it is parsed off the socket
+        try:
+            return [self._format_response(day) for day in iter_calendar_days(chunks)]
+        except CalendarStreamError as err:
             raise InvalidResponseError(
-                f"Unable to retrieve annual prayer times. URL: {url}"
-            )
-
-        year_prayer_times = []
-        for _, prayer_times_list in response.json()["data"].items():
-            for prayer_time in prayer_times_list:  # Iterate over list of prayer times
-                year_prayer_times.append(
-                    self._format_response(prayer_time)
-                )  # Format each prayer time entry
-
-        return year_prayer_times
+                f"Unable to parse annual prayer times. URL: {url}"
+            ) from err
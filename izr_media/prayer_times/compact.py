@@ -0,0 +1,166 @@
+"""Compact prayer tables: a date base plus uint16 minutes per prayer.
+
+An annual table packs into about 4.4 KB of bytes, one fixed-width record
+per day, so a single day can be read with GETRANGE without the rest. Code
+works on the minute arrays; display strings (HH:MM, dates, Hijri labels)
+are only produced by :meth:`CompactTable.records` at the response edge.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+import struct
+from typing import Any, Final, Iterable, List, Mapping
+
+import numpy as np
+
+from .hijri import hijri_labels
+from .table import MINUTE_LABELS, label_minutes
+
+COLUMNS: Final = ("Fajr", "Shuruq", "Dhuhr", "Asr", "Maghrib", "Isha")
+# Minutes value of an undefined time (no twilight at high latitudes)
+UNDEFINED: Final = 0xFFFF
+MAGIC: Final = b"PT2"
+# Magic, first day's ordinal, number of days; the days follow as records
+HEADER: Final = struct.Struct("<3sIH")
+# One day: the minutes of COLUMNS as little-endian uint16
+RECORD_SIZE: Final = 2 * len(COLUMNS)
+
+
+@dataclass
+class CompactTable:
+    """Prayer times of consecutive days from ``first``, as ``(columns, days)`` uint16."""
+
+    first: date
+    minutes: np.ndarray
+
+    def __len__(self) -> int:
+        return self.minutes.shape[1]
+
+    @property
+    def last(self) -> date:
+        return self.first + timedelta(days=len(self) - 1)
+
+    def index_of(self, day: date) -> int:
+        """Return the row of ``day``, raising KeyError when it is not covered."""
+        index = (day - self.first).days
+        if not 0 <= index < len(self):
+            raise KeyError(day.isoformat())
+        return index
+
+    def column(self, name: str) -> np.ndarray:
+        """Minutes since midnight of one prayer as floats, NaN when undefined."""
+        values = self.minutes[COLUMNS.index(name)]
+        return np.where(values == UNDEFINED, np.nan, values.astype(float))
+
+    def rows(self, start: int = 0, stop: int | None = None) -> "CompactTable":
+        """The rows ``start:stop`` as a table of their own (a view, no copy)."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        return CompactTable(self.first + timedelta(days=start), self.minutes[:, start:stop])
+
+    def between(self, first: date, last: date) -> "CompactTable":
+        """The rows of ``first``..``last`` inclusive, clipped to the table."""
+        return self.rows(max((first - self.first).days, 0), (last - self.first).days + 1)
+
+    def with_columns(self, columns: Mapping[str, np.ndarray]) -> "CompactTable":
+        """Return a copy with the given columns (float minutes) replaced."""
+        minutes = self.minutes.copy()
+        for name, values in columns.items():
+            minutes[COLUMNS.index(name)] = _to_uint16(values)
+        return CompactTable(self.first, minutes)
+
+    @classmethod
+    def concat(cls, tables: Iterable["CompactTable"]) -> "CompactTable":
+        """Join tables of consecutive date ranges."""
+        tables = [table for table in tables if len(table)]
+        for previous, table in zip(tables, tables[1:]):
+            if table.first != previous.last + timedelta(days=1):
+                raise ValueError(f"{table.first} does not follow {previous.last}")
+        return cls(tables[0].first, np.concatenate([table.minutes for table in tables], axis=1))
+
+    # ─── Bytes ──────────────────────────────────────────────────
+
+    def pack(self) -> bytes:
+        header = HEADER.pack(MAGIC, self.first.toordinal(), len(self))
+        return header + self.minutes.T.astype("<u2").tobytes()
+
+    @classmethod
+    def unpack(cls, blob: bytes) -> "CompactTable":
+        """Inverse of :meth:`pack`; raises ValueError on anything else (e.g. old JSON)."""
+        if len(blob) < HEADER.size:
+            raise ValueError("not a packed prayer table")
+        magic, ordinal, days = HEADER.unpack_from(blob)
+        if magic != MAGIC or len(blob) != HEADER.size + RECORD_SIZE * days:
+            raise ValueError("not a packed prayer table")
+        minutes = np.frombuffer(blob, dtype="<u2", offset=HEADER.size).reshape(days, len(COLUMNS))
+        return cls(date.fromordinal(ordinal), minutes.T)
+
+    @classmethod
+    def unpack_record(cls, header: bytes, row: int, record: bytes) -> "CompactTable":
+        """The one-day table of ``row`` from the packed header and that row's bytes.
+
+        Both are read with GETRANGE (see :func:`record_range`); raises
+        ValueError when they do not belong to a packed table covering ``row``.
+        """
+        if len(header) != HEADER.size or len(record) != RECORD_SIZE:
+            raise ValueError("not a packed prayer table")
+        magic, ordinal, days = HEADER.unpack(header)
+        if magic != MAGIC or not 0 <= row < days:
+            raise ValueError("row not in the packed prayer table")
+        minutes = np.frombuffer(record, dtype="<u2").reshape(1, len(COLUMNS))
+        return cls(date.fromordinal(ordinal + row), minutes.T)
+
+    # ─── Rows ───────────────────────────────────────────────────
+
+    @classmethod
+    def from_records(cls, records: List[dict[str, Any]]) -> "CompactTable":
+        """Build from consecutive formatted rows (aladhan, local engine or CSV)."""
+        day, month, year = (int(part) for part in records[0]["Datum"].split("-"))
+        minutes = np.stack(
+            [_to_uint16(label_minutes([record[name] for record in records])) for name in COLUMNS]
+        )
+        return cls(date(year, month, day), minutes)
+
+    def datum_labels(self) -> List[str]:
+        ordinals = range(self.first.toordinal(), self.first.toordinal() + len(self))
+        return [date.fromordinal(ordinal).strftime("%d-%m-%Y") for ordinal in ordinals]
+
+    def days_of_year(self) -> List[int]:
+        ordinals = range(self.first.toordinal(), self.first.toordinal() + len(self))
+        return [date.fromordinal(ordinal).timetuple().tm_yday for ordinal in ordinals]
+
+    def time_labels(self, name: str) -> List[str]:
+        # The undefined value maps to the "-----" label at index 1440
+        values = np.minimum(self.minutes[COLUMNS.index(name)], 1440).tolist()
+        return [MINUTE_LABELS[value] for value in values]
+
+    def records(
+        self, correction_day: int = 0, start: int = 0, stop: int | None = None
+    ) -> List[dict[str, Any]]:
+        """Format the rows ``start:stop`` like the calculators do.
+
+        Each row also gets its day of the year as ``Day`` (1 on Jan 1), also
+        for slices and tables running into the next year.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        part = self.rows(start, stop)
+        if not len(part):
+            return []
+        hijri, hijri_ar = hijri_labels(part.first, len(part), correction_day)
+        columns = {"Datum": part.datum_labels(), "Hijri_ar": hijri_ar, "Hijri": hijri}
+        for name in COLUMNS:
+            columns[name] = part.time_labels(name)
+        columns["Day"] = part.days_of_year()
+        keys = list(columns)
+        return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def record_range(row: int) -> tuple[int, int]:
+    """First and last byte (inclusive, as GETRANGE takes them) of a packed row."""
+    start = HEADER.size + row * RECORD_SIZE
+    return start, start + RECORD_SIZE - 1
+
+
+def _to_uint16(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    minutes = np.mod(np.round(np.nan_to_num(values)), 1440)
+    return np.where(np.isnan(values), UNDEFINED, minutes).astype(np.uint16)
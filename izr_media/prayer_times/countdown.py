@@ -0,0 +1,98 @@
+"""Current and next prayer from a sorted index of prayer instants.
+
+The annual table is flattened once into a sorted array of UTC timestamps,
+six per day, so "what is the next prayer" is a single binary search and
+the rollover from Isha to the next day's Fajr needs no special case.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone, tzinfo
+import json
+from typing import Any, Final
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .compact import CompactTable
+from .table import utc_offsets
+
+# Boundaries of the day in order; Shuruq ends the Fajr time
+INDEX_PRAYERS: Final = ("Fajr", "Shuruq", "Dhuhr", "Asr", "Maghrib", "Isha")
+UNIX_EPOCH_ORDINAL: Final = date(1970, 1, 1).toordinal()
+
+
+@dataclass
+class PrayerIndex:
+    """Sorted prayer instants (UTC seconds) and the prayer of each one."""
+
+    instants: np.ndarray
+    prayers: np.ndarray
+
+    def locate(self, now: float) -> int:
+        """Return the position of the last instant at or before ``now`` (-1 before the first)."""
+        return int(np.searchsorted(self.instants, now, side="right")) - 1
+
+    def to_json(self) -> str:
+        return json.dumps([self.instants.tolist(), self.prayers.tolist()])
+
+    @classmethod
+    def from_json(cls, data: str) -> "PrayerIndex":
+        instants, prayers = json.loads(data)
+        return cls(
+            instants=np.asarray(instants, dtype=np.int64),
+            prayers=np.asarray(prayers, dtype=np.uint8),
+        )
+
+
+def build_prayer_index(table: CompactTable, tz_name: str | None, longitude: float) -> PrayerIndex:
+    """Flatten a table of consecutive days into a :class:`PrayerIndex`.
+
+    Undefined times (high latitudes) are left out.
+    """
+    ordinals = np.arange(len(table)) + table.first.toordinal()
+    midnight = (ordinals - UNIX_EPOCH_ORDINAL) * 86400 - utc_offsets(
+        tz_name, longitude, ordinals
+    ) * 3600
+
+    minutes = np.stack([table.column(prayer) for prayer in INDEX_PRAYERS], axis=1)
+    instants = midnight[:, None] + minutes * 60
+    prayers = np.broadcast_to(np.arange(len(INDEX_PRAYERS), dtype=np.uint8), instants.shape)
+    defined = ~np.isnan(instants)
+    # Rows are consecutive days, a stable sort only reorders odd tuned times
+    order = np.argsort(instants[defined], kind="stable")
+    return PrayerIndex(
+        instants=instants[defined][order].astype(np.int64),
+        prayers=prayers[defined][order],
+    )
+
+
+def local_timezone(tz_name: str | None, longitude: float) -> tzinfo:
+    """The zone of ``tz_name``, or the longitude's whole-hour offset like utc_offsets."""
+    if tz_name is None:
+        return timezone(timedelta(hours=round(longitude / 15)))
+    return ZoneInfo(tz_name)
+
+
+def merge_indexes(*indexes: PrayerIndex) -> PrayerIndex:
+    """Concatenate the indexes of consecutive years."""
+    return PrayerIndex(
+        instants=np.concatenate([index.instants for index in indexes]),
+        prayers=np.concatenate([index.prayers for index in indexes]),
+    )
+
+
+def instant_payload(index: PrayerIndex, position: int, tz: tzinfo) -> dict[str, Any]:
+    """Name, local date and time of one instant of the index."""
+    moment = datetime.fromtimestamp(int(index.instants[position]), tz)
+    return {
+        "prayer": INDEX_PRAYERS[int(index.prayers[position])],
+        "date": moment.date().isoformat(),
+        "time": moment.strftime("%H:%M"),
+        "timestamp": int(index.instants[position]),
+    }
+
+
+def iqama_label(prayer_time: str, offset: int) -> str:
+    """Return ``prayer_time`` (HH:MM) shifted by ``offset`` minutes."""
+    moment = datetime.strptime(prayer_time, "%H:%M") + timedelta(minutes=offset)
+    return moment.strftime("%H:%M")
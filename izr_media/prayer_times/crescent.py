@@ -0,0 +1,357 @@
+"""New-moon conjunctions and crescent visibility.
+
+Estimates when each Hijri month starts for an observer by evaluating the
+young crescent on the evenings after the conjunction, following Yallop's
+q-test (NAO Technical Note 69). The moon comes from a truncated ELP series
+(Meeus, Astronomical Algorithms ch. 47 and 49), good to a fraction of a
+degree and a few minutes, which is plenty for a visibility criterion. All
+evenings of a year are evaluated as one batch of arrays.
+"""
+
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Final, NamedTuple
+
+import numpy as np
+
+from .astronomy import J2000, JD_EPOCH, RISE_SET_ANGLE, _cos, _sin, sun_angle_time
+from .hijri import hijri_month_range
+from .ramadan import RAMADAN
+
+SYNODIC_MONTH: Final = 29.530588861
+# TT - UT around 2025, far below the accuracy of the series
+DELTA_T_DAYS: Final = 69 / 86400
+EARTH_RADIUS_KM: Final = 6378.14
+# Moon's altitude at moonrise/moonset without its parallax (refraction + semi-diameter)
+MOONSET_ALTITUDE: Final = -0.5667
+# Evenings looked at from the local day of the conjunction on
+CANDIDATE_EVENINGS: Final = 3
+
+# Lower q bound of Yallop's visibility classes
+YALLOP_CLASSES: Final = {
+    "A": 0.216,  # easily visible to the naked eye
+    "B": -0.014,  # visible under perfect conditions
+    "C": -0.160,  # may need optical aid to find it first
+    "D": -0.232,  # only visible with optical aid
+    "E": -0.293,  # not visible even with a telescope
+}
+DEFAULT_CRITERION: Final = "C"
+
+# Periodic terms of the moon: multiples of D, M, M', F and the coefficient
+_LONGITUDE_TERMS: Final = np.array([
+    (0, 0, 1, 0, 6288774),
+    (2, 0, -1, 0, 1274027),
+    (2, 0, 0, 0, 658314),
+    (0, 0, 2, 0, 213618),
+    (0, 1, 0, 0, -185116),
+    (0, 0, 0, 2, -114332),
+    (2, 0, -2, 0, 58793),
+    (2, -1, -1, 0, 57066),
+    (2, 0, 1, 0, 53322),
+    (2, -1, 0, 0, 45758),
+    (0, 1, -1, 0, -40923),
+    (1, 0, 0, 0, -34720),
+    (0, 1, 1, 0, -30383),
+    (2, 0, 0, -2, 15327),
+    (0, 0, 1, 2, -12528),
+    (0, 0, 1, -2, 10980),
+    (4, 0, -1, 0, 10675),
+    (0, 0, 3, 0, 10034),
+    (4, 0, -2, 0, 8548),
+    (2, 1, -1, 0, -7888),
+    (2, 1, 0, 0, -6766),
+    (1, 0, -1, 0, -5163),
+], dtype=float)
+_DISTANCE_TERMS: Final = np.array([
+    (0, 0, 1, 0, -20905355),
+    (2, 0, -1, 0, -3699111),
+    (2, 0, 0, 0, -2955968),
+    (0, 0, 2, 0, -569925),
+    (0, 1, 0, 0, 48888),
+    (0, 0, 0, 2, -3149),
+    (2, 0, -2, 0, 246158),
+    (2, -1, -1, 0, -152138),
+    (2, 0, 1, 0, -170733),
+    (2, -1, 0, 0, -204586),
+    (0, 1, -1, 0, -129620),
+    (1, 0, 0, 0, 108743),
+    (0, 1, 1, 0, 104755),
+    (0, 0, 1, -2, 79661),
+    (4, 0, -1, 0, 48888),
+], dtype=float)
+_LATITUDE_TERMS: Final = np.array([
+    (0, 0, 0, 1, 5128122),
+    (0, 0, 1, 1, 280602),
+    (0, 0, 1, -1, 277693),
+    (2, 0, 0, -1, 173237),
+    (2, 0, -1, 1, 55413),
+    (2, 0, -1, -1, 46271),
+    (2, 0, 0, 1, 32573),
+    (0, 0, 2, 1, 17198),
+    (2, 0, 1, -1, 9266),
+    (0, 0, 2, -1, 8822),
+    (2, -1, 0, -1, 8216),
+    (2, 0, -2, -1, 4324),
+], dtype=float)
+
+# New-moon corrections: coefficient, power of E, multiples of M, M', F, Omega
+_NEW_MOON_TERMS: Final = np.array([
+    (-0.40720, 0, 0, 1, 0, 0),
+    (0.17241, 1, 1, 0, 0, 0),
+    (0.01608, 0, 0, 2, 0, 0),
+    (0.01039, 0, 0, 0, 2, 0),
+    (0.00739, 1, -1, 1, 0, 0),
+    (-0.00514, 1, 1, 1, 0, 0),
+    (0.00208, 2, 2, 0, 0, 0),
+    (-0.00111, 0, 0, 1, -2, 0),
+    (-0.00057, 0, 0, 1, 2, 0),
+    (0.00056, 1, 1, 2, 0, 0),
+    (-0.00042, 0, 0, 3, 0, 0),
+    (0.00042, 1, 1, 0, 2, 0),
+    (0.00038, 1, 1, 0, -2, 0),
+    (-0.00024, 1, -1, 2, 0, 0),
+    (-0.00017, 0, 0, 0, 0, 1),
+], dtype=float)
+
+
+class MonthEstimate(NamedTuple):
+    """Visibility-based start of a Hijri month next to the Umm al-Qura one."""
+
+    hijri_year: int
+    month: int
+    conjunction: datetime  # UTC
+    evening: date  # first evening the crescent passes the criterion, or the 30th
+    age_hours: float
+    elongation: float
+    lag_minutes: float
+    q: float
+    visibility: str
+    start: date
+    umm_al_qura: date
+
+    @property
+    def correction(self) -> int:
+        """The ``correction_day`` that makes this month start on ``start``."""
+        return (self.umm_al_qura - self.start).days
+
+
+def _series(terms: np.ndarray, args: np.ndarray, e: np.ndarray, func) -> np.ndarray:
+    """Sum periodic terms over (N,) epochs; ``args`` are D, M, M', F as (4, N)."""
+    multiples = terms[:, :4]
+    angle = multiples @ args
+    # Terms with M are scaled by the eccentricity of the earth's orbit
+    scale = e[None, :] ** np.abs(multiples[:, 1:2])
+    return (terms[:, 4:5] * scale * func(np.radians(angle))).sum(axis=0)
+
+
+def moon_position(jd) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the moon's geocentric ecliptic longitude, latitude (degrees) and distance (km)."""
+    jd = np.atleast_1d(np.asarray(jd, dtype=float))
+    t = (jd + DELTA_T_DAYS - J2000) / 36525
+    mean_longitude = 218.3164477 + 481267.88123421 * t
+    args = np.vstack([
+        297.8501921 + 445267.1114034 * t,  # D, mean elongation
+        357.5291092 + 35999.0502909 * t,  # M, sun's mean anomaly
+        134.9633964 + 477198.8675055 * t,  # M', moon's mean anomaly
+        93.2720950 + 483202.0175233 * t,  # F, argument of latitude
+    ])
+    e = 1 - 0.002516 * t - 0.0000074 * t**2
+    longitude = mean_longitude + _series(_LONGITUDE_TERMS, args, e, np.sin) / 1e6
+    latitude = _series(_LATITUDE_TERMS, args, e, np.sin) / 1e6
+    distance = 385000.56 + _series(_DISTANCE_TERMS, args, e, np.cos) / 1e3
+    return np.mod(longitude, 360.0), latitude, distance
+
+
+def _sun_ecliptic(jd) -> tuple[np.ndarray, np.ndarray]:
+    """Sun's ecliptic longitude and the obliquity, the series of sun_position."""
+    d = np.asarray(jd, dtype=float) - J2000
+    g = 357.529 + 0.98560028 * d
+    q = 280.459 + 0.98564736 * d
+    return np.mod(q + 1.915 * _sin(g) + 0.020 * _sin(2 * g), 360.0), 23.439 - 0.00000036 * d
+
+
+def _equatorial(longitude, latitude, obliquity) -> tuple[np.ndarray, np.ndarray]:
+    """Ecliptic to right ascension and declination, all in degrees."""
+    right_ascension = np.degrees(np.arctan2(
+        _sin(longitude) * _cos(obliquity) - np.tan(np.radians(latitude)) * _sin(obliquity),
+        _cos(longitude),
+    ))
+    declination = np.degrees(np.arcsin(
+        _sin(latitude) * _cos(obliquity) + _cos(latitude) * _sin(obliquity) * _sin(longitude)
+    ))
+    return right_ascension, declination
+
+
+def _hour_angle(jd, longitude: float, right_ascension) -> np.ndarray:
+    sidereal = 280.46061837 + 360.98564736629 * (np.asarray(jd) - J2000)
+    return np.mod(sidereal + longitude - right_ascension + 180, 360.0) - 180
+
+
+def _altitude(latitude: float, declination, hour_angle) -> np.ndarray:
+    return np.degrees(np.arcsin(
+        _sin(latitude) * _sin(declination) + _cos(latitude) * _cos(declination) * _cos(hour_angle)
+    ))
+
+
+def _moon_equatorial(jd) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    longitude, latitude, distance = moon_position(jd)
+    _, obliquity = _sun_ecliptic(jd)
+    right_ascension, declination = _equatorial(longitude, latitude, obliquity)
+    return right_ascension, declination, distance
+
+
+def new_moons(first_jd: float, last_jd: float) -> np.ndarray:
+    """Return the Julian days (UT) of the conjunctions between two Julian days."""
+    k = np.arange(
+        np.floor((first_jd - 2451550.09766) / SYNODIC_MONTH),
+        np.ceil((last_jd - 2451550.09766) / SYNODIC_MONTH) + 1,
+    )
+    t = k / 1236.85
+    jde = 2451550.09766 + SYNODIC_MONTH * k + 0.00015437 * t**2 - 0.000000150 * t**3
+    e = 1 - 0.002516 * t - 0.0000074 * t**2
+    angles = np.vstack([
+        2.5534 + 29.10535670 * k - 0.0000014 * t**2,  # M
+        201.5643 + 385.81693528 * k + 0.0107582 * t**2,  # M'
+        160.7108 + 390.67050284 * k - 0.0016118 * t**2,  # F
+        124.7746 - 1.56375588 * k + 0.0020672 * t**2,  # Omega
+    ])
+    terms = _NEW_MOON_TERMS
+    correction = (
+        terms[:, :1] * e[None, :] ** terms[:, 1:2]
+        * np.sin(np.radians(terms[:, 2:] @ angles))
+    ).sum(axis=0)
+    jd = jde + correction - DELTA_T_DAYS
+    return jd[(jd >= first_jd) & (jd < last_jd)]
+
+
+def crescent_at_sunset(
+    ordinals, conjunctions, latitude: float, longitude: float
+) -> dict[str, np.ndarray]:
+    """Evaluate the crescent on the evenings of the given date ordinals.
+
+    ``conjunctions`` holds the Julian day of the preceding new moon of every
+    evening. Returns sunset (JD), moon age, elongation, lag time and
+    Yallop's q, computed at the best time (sunset + 4/9 of the lag).
+    """
+    jd0 = np.asarray(ordinals, dtype=float) + JD_EPOCH
+    solar = sun_angle_time(jd0 - longitude / 360, RISE_SET_ANGLE, 18.0, latitude)
+    sunset = jd0 + (solar - longitude / 15) / 24
+
+    # Moonset: move along the moon's hour angle until it reaches the horizon
+    moonset = sunset.copy()
+    for _ in range(3):
+        right_ascension, declination, distance = _moon_equatorial(moonset)
+        parallax = np.degrees(np.arcsin(EARTH_RADIUS_KM / distance))
+        h0 = MOONSET_ALTITUDE + 0.7275 * parallax
+        cos_set = (_sin(h0) - _sin(latitude) * _sin(declination)) / (
+            _cos(latitude) * _cos(declination)
+        )
+        set_angle = np.degrees(np.arccos(np.clip(cos_set, -1, 1)))
+        hour_angle = _hour_angle(moonset, longitude, right_ascension)
+        moonset = moonset + (set_angle - hour_angle) / 347.81
+    lag = (moonset - sunset) * 1440
+
+    best = sunset + np.maximum(lag, 0) * 4 / 9 / 1440
+    sun_longitude, obliquity = _sun_ecliptic(best)
+    sun_ra, sun_dec = _equatorial(sun_longitude, 0.0, obliquity)
+    moon_ra, moon_dec, distance = _moon_equatorial(best)
+    elongation = np.degrees(np.arccos(np.clip(
+        _sin(sun_dec) * _sin(moon_dec) + _cos(sun_dec) * _cos(moon_dec) * _cos(sun_ra - moon_ra),
+        -1, 1,
+    )))
+    sun_altitude = _altitude(latitude, sun_dec, _hour_angle(best, longitude, sun_ra))
+    moon_altitude = _altitude(latitude, moon_dec, _hour_angle(best, longitude, moon_ra))
+    arcv = moon_altitude - sun_altitude
+
+    # Topocentric crescent width in arc minutes
+    parallax = np.degrees(np.arcsin(EARTH_RADIUS_KM / distance)) * 60
+    semi_diameter = 0.27245 * parallax * (1 + _sin(moon_altitude) * _sin(parallax / 60))
+    width = semi_diameter * (1 - _cos(elongation))
+    q = (arcv - (11.8371 - 6.3226 * width + 0.7319 * width**2 - 0.1018 * width**3)) / 10
+
+    age = (sunset - np.asarray(conjunctions, dtype=float)) * 24
+    # No crescent before the conjunction or with the moon setting first
+    q = np.where((age > 0) & (lag > 0), q, -np.inf)
+    return {
+        "sunset": sunset,
+        "age_hours": age,
+        "elongation": elongation,
+        "lag_minutes": lag,
+        "q": q,
+    }
+
+
+def visibility_class(q: float) -> str:
+    for name, bound in YALLOP_CLASSES.items():
+        if q > bound:
+            return name
+    return "F"
+
+
+def _utc(jd: float) -> datetime:
+    return datetime(2000, 1, 1, 12) + timedelta(days=float(jd) - J2000)
+
+
+@lru_cache(maxsize=8)
+def hijri_month_starts(
+    hijri_year: int,
+    latitude: float,
+    longitude: float,
+    criterion: str = DEFAULT_CRITERION,
+) -> tuple[MonthEstimate, ...]:
+    """Estimate the start of every month of a Hijri year for an observer.
+
+    A month starts the day after the first evening whose crescent reaches
+    the Yallop class ``criterion``; if none of the candidate evenings does,
+    the previous month is completed at 30 days and ``evening`` is its 30th.
+    """
+    threshold = YALLOP_CLASSES[criterion]
+    official = [hijri_month_range(hijri_year, month)[0] for month in range(1, 13)]
+    first_jd = official[0].toordinal() + JD_EPOCH - 20
+    moons = new_moons(first_jd, official[-1].toordinal() + JD_EPOCH + 10)
+    # The conjunction that closes the previous month of every official start
+    moons = np.array([moons[np.abs(moons - (day.toordinal() + JD_EPOCH)).argmin()] for day in official])
+
+    conjunction_days = np.floor(moons - JD_EPOCH + 0.5 + longitude / 360).astype(np.int64)
+    evenings = conjunction_days[:, None] + np.arange(CANDIDATE_EVENINGS)[None, :]
+    crescent = crescent_at_sunset(
+        evenings.ravel(), np.repeat(moons, CANDIDATE_EVENINGS), latitude, longitude
+    )
+    q = crescent["q"].reshape(evenings.shape)
+    visible = q > threshold
+    # Index of the first evening passing the test
+    chosen = visible.argmax(axis=1)
+
+    estimates = []
+    # Muharram follows the official Dhu al-Hijjah of the previous year
+    previous_start = hijri_month_range(hijri_year - 1, 12)[0]
+    for row, column in enumerate(chosen.tolist()):
+        if visible[row, column]:
+            evening = int(evenings[row, column])
+            values = {name: crescent[name][row * CANDIDATE_EVENINGS + column] for name in crescent}
+        else:
+            # Not seen on any candidate evening: the previous month gets 30 days
+            evening = previous_start.toordinal() + 29
+            late = crescent_at_sunset([evening], [moons[row]], latitude, longitude)
+            values = {name: late[name][0] for name in late}
+        start = date.fromordinal(evening + 1)
+        estimates.append(MonthEstimate(
+            hijri_year=hijri_year,
+            month=row + 1,
+            conjunction=_utc(moons[row]),
+            evening=date.fromordinal(evening),
+            age_hours=float(values["age_hours"]),
+            elongation=float(values["elongation"]),
+            lag_minutes=float(values["lag_minutes"]),
+            q=float(values["q"]),
+            visibility=visibility_class(float(values["q"])),
+            start=start,
+            umm_al_qura=official[row],
+        ))
+        previous_start = start
+    return tuple(estimates)
+
+
+def propose_correction(estimates, month: int = RAMADAN) -> int:
+    """Return the correction_day that makes ``month`` start as estimated."""
+    return next((item.correction for item in estimates if item.month == month), 0)
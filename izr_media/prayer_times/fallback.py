@@ -0,0 +1,200 @@
+"""Latency-budgeted fallback chain for prayer times.
+
+Sources are tried in order: the aladhan upstream, the local engine and, for
+Regensburg, the bundled Fourier CSV. Tables with per-day (dynamic) angles
+skip the upstream, which takes one pair of angles per request. When a source fails the next one starts
+right away; when it is still running after the latency budget the next one
+is started alongside it (hedged) and whichever succeeds first is served. The
+upstream calls share a deadline that expires once the chain has answered.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date, datetime
+import os
+import threading
+from typing import Any, Callable, Final, List, Tuple
+
+from django.conf import settings
+import numpy as np
+
+from .angle_series import AngleProvider
+from .calculation import Error, PrayerTimesCalculator
+from .fourier_table import CSV_COLUMNS, regensburg_table
+from .hijri import format_hijri, to_hijri
+from .http_client import Deadline
+from .local_calculation import LocalPrayerTimesCalculator
+from .table import MINUTE_LABELS
+
+# Source names, also sent back in the X-Prayer-Times-Source header
+SOURCE_ALADHAN: Final = "aladhan"
+SOURCE_LOCAL: Final = "local"
+SOURCE_FOURIER_CSV: Final = "fourier-csv"
+
+Source = Tuple[str, Callable[[], Any]]
+
+
+class AllSourcesFailedError(Error):
+    """Exception raised when no prayer times source could answer"""
+
+    def __init__(self, failures: List[str]) -> None:
+        self.message = "No prayer times source available: " + "; ".join(failures)
+        super().__init__(self.message)
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_pid: int | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide pool the sources run on.
+
+    Shared rather than per request, so an abandoned slow upstream call keeps
+    running in the background instead of holding the response.
+    """
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="prayer-times")
+            _executor_pid = os.getpid()
+    return _executor
+
+
+def run_with_fallback(
+    sources: List[Source], budget: float, deadline: Deadline | None = None
+) -> Tuple[str, Any]:
+    """Return ``(source name, result)`` of the first source that succeeds.
+
+    ``deadline`` is expired on return, so sources still running (a hedged
+    upstream) stop making calls.
+    """
+    queue = list(sources)
+    pending: dict[Future, str] = {}
+    failures: List[str] = []
+    try:
+        while queue or pending:
+            if queue:
+                name, fetch = queue.pop(0)
+                pending[_get_executor().submit(fetch)] = name
+            done, _ = wait(
+                pending, timeout=budget if queue else None, return_when=FIRST_COMPLETED
+            )
+            if not done:
+                print(f"⏱️ {', '.join(pending.values())} over {budget}s budget, hedging")
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    return name, future.result()
+                except Exception as err:
+                    print(f"⚠️ Prayer times source {name} failed: {err}")
+                    failures.append(f"{name}: {err}")
+        raise AllSourcesFailedError(failures)
+    finally:
+        if deadline is not None:
+            deadline.expire()
+
+
+def fourier_csv_records(first: date, last: date) -> List[dict[str, Any]]:
+    """Build formatted rows for Regensburg from the bundled Fourier CSV."""
+    ordinals = np.arange(first.toordinal(), last.toordinal() + 1)
+    columns = regensburg_table.range(first, len(ordinals))
+    labels = {
+        name: [MINUTE_LABELS[minute] for minute in columns[name].tolist()]
+        for name in CSV_COLUMNS
+    }
+    hijri_years, hijri_months, hijri_days = to_hijri(ordinals)
+    records = []
+    for index, (ordinal, hijri_year, hijri_month, hijri_day) in enumerate(zip(
+        ordinals.tolist(), hijri_years.tolist(), hijri_months.tolist(), hijri_days.tolist()
+    )):
+        hijri, hijri_ar = format_hijri(hijri_year, hijri_month, hijri_day)
+        record = {
+            "Datum": date.fromordinal(ordinal).strftime("%d-%m-%Y"),
+            "Hijri_ar": hijri_ar,
+            "Hijri": hijri,
+        }
+        record.update({name: labels[name][index] for name in CSV_COLUMNS})
+        records.append(record)
+    return records
+
+
+def preferred_source(latitude: float | None = None, per_day_angles: bool = False) -> str:
+    """Return the source that should answer first for the latitude."""
+    if settings.PRAYER_TIMES_BACKEND == SOURCE_LOCAL or per_day_angles:
+        return SOURCE_LOCAL
+    if latitude is not None and abs(float(latitude)) >= settings.PRAYER_TIMES_LOCAL_LATITUDE:
+        return SOURCE_LOCAL
+    return SOURCE_ALADHAN
+
+
+def _sources(
+    calculator_kwargs: dict[str, Any],
+    fetch: Callable[[PrayerTimesCalculator], Any],
+    csv_fetch: Callable[[], Any] | None,
+    angle_series: AngleProvider | None = None,
+    deadline: Deadline | None = None,
+) -> List[Source]:
+    sources: List[Source] = []
+    if preferred_source(calculator_kwargs.get("latitude"), angle_series is not None) != SOURCE_LOCAL:
+        upstream = PrayerTimesCalculator(**calculator_kwargs, deadline=deadline)
+        sources.append((SOURCE_ALADHAN, lambda: fetch(upstream)))
+    local = LocalPrayerTimesCalculator(**calculator_kwargs, angle_series=angle_series)
+    sources.append((SOURCE_LOCAL, lambda: fetch(local)))
+    if csv_fetch is not None:
+        sources.append((SOURCE_FOURIER_CSV, csv_fetch))
+    return sources
+
+
+def fetch_annual_with_fallback(
+    calculator_kwargs: dict[str, Any],
+    year: int,
+    hijri: bool = False,
+    regensburg: bool = False,
+    angle_series: AngleProvider | None = None,
+) -> Tuple[str, List[dict[str, Any]]]:
+    """Fetch a year of prayer times from the first source that answers in time.
+
+    ``angle_series`` gives per-day Fajr/Isha angles; only the local engine
+    (and the Fourier CSV) can follow them, so aladhan is not asked.
+    """
+    deadline = Deadline(settings.ALADHAN_DEADLINE)
+    sources = _sources(
+        calculator_kwargs,
+        lambda calculator: calculator.fetch_annual_prayer_times(
+            year=year, hijri=hijri, fan_out=settings.ALADHAN_MONTHLY_FAN_OUT
+        ),
+        (lambda: fourier_csv_records(date(year, 1, 1), date(year, 12, 31)))
+        if regensburg and not hijri
+        else None,
+        angle_series,
+        deadline,
+    )
+    return run_with_fallback(sources, settings.PRAYER_TIMES_LATENCY_BUDGET, deadline)
+
+
+def fetch_daily_with_fallback(
+    calculator_kwargs: dict[str, Any],
+    day: date,
+    regensburg: bool = False,
+    angle_series: AngleProvider | None = None,
+) -> Tuple[str, dict[str, Any]]:
+    """Fetch one day of prayer times from the first source that answers in time."""
+    deadline = Deadline(settings.ALADHAN_DEADLINE)
+    sources = _sources(
+        calculator_kwargs,
+        lambda calculator: calculator.fetch_daily_prayer_times(day.strftime("%Y-%m-%d")),
+        (lambda: fourier_csv_records(day, day)[0]) if regensburg else None,
+        angle_series,
+        deadline,
+    )
+    return run_with_fallback(sources, settings.PRAYER_TIMES_LATENCY_BUDGET, deadline)
+
+
+def cache_ttl(source: str, latitude: float | None = None, per_day_angles: bool = False) -> int:
+    """Seconds to cache a result: until the end of the year, or briefly when a
+    fallback served it so the preferred source gets another chance soon."""
+    if source != preferred_source(latitude, per_day_angles):
+        return settings.PRAYER_TIMES_FALLBACK_TTL
+    now = datetime.now()
+    end_of_year = datetime(now.year, 12, 31, 23, 59, 59)
+    return int((end_of_year - now).total_seconds())
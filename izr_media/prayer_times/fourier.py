@@ -0,0 +1,77 @@
+"""Truncated Fourier series over the solar year.
+
+A prayer time is fitted in UTC minutes as
+``c0 + sum(a_k cos(k t) + b_k sin(k t))`` where ``t`` is the phase of the
+tropical year, so one set of coefficients evaluates any day of any year and
+daylight-saving jumps never reach the fit.
+"""
+
+from datetime import date
+from typing import Final, List
+
+import numpy as np
+
+from .table import utc_offsets
+
+TROPICAL_YEAR: Final = 365.2422
+# Phase origin, any fixed day works as long as fitting and evaluation agree
+PHASE_EPOCH: Final = date(2000, 1, 1).toordinal()
+DEFAULT_ORDER: Final = 4
+MINUTES_PER_DAY: Final = 1440
+
+
+def phase(ordinals: np.ndarray) -> np.ndarray:
+    return 2 * np.pi * (np.asarray(ordinals, dtype=float) - PHASE_EPOCH) / TROPICAL_YEAR
+
+
+def design_matrix(ordinals: np.ndarray, order: int) -> np.ndarray:
+    """Columns ``1, cos t, sin t, ..., cos(order t), sin(order t)``."""
+    angle = phase(ordinals)
+    harmonics = np.arange(1, order + 1)[:, None] * angle
+    columns = np.empty((2 * order + 1, len(angle)))
+    columns[0] = 1.0
+    columns[1::2] = np.cos(harmonics)
+    columns[2::2] = np.sin(harmonics)
+    return columns.T
+
+
+def fit(ordinals: np.ndarray, utc_minutes: np.ndarray, order: int = DEFAULT_ORDER) -> List[float]:
+    """Least-squares coefficients for the given days, NaN days are ignored."""
+    utc_minutes = np.asarray(utc_minutes, dtype=float)
+    known = ~np.isnan(utc_minutes)
+    if known.sum() < 2 * order + 1:
+        raise ValueError(f"Need at least {2 * order + 1} known days for order {order}")
+    # Times around midnight UTC must not jump by a day inside the series
+    values = np.unwrap(utc_minutes[known], period=MINUTES_PER_DAY)
+    coefficients, *_ = np.linalg.lstsq(
+        design_matrix(np.asarray(ordinals)[known], order), values, rcond=None
+    )
+    return coefficients.tolist()
+
+
+def evaluate(coefficients: List[float], ordinals: np.ndarray) -> np.ndarray:
+    """UTC minutes of the series at the given day ordinals."""
+    order = (len(coefficients) - 1) // 2
+    return design_matrix(ordinals, order) @ np.asarray(coefficients, dtype=float)
+
+
+def to_utc_minutes(local_minutes: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    return np.asarray(local_minutes, dtype=float) - np.asarray(offsets) * 60
+
+
+def local_minutes(
+    coefficients: List[float], ordinals: np.ndarray, tz_name: str | None, longitude: float
+) -> np.ndarray:
+    """Whole local minutes since midnight of the series at the given days."""
+    ordinals = np.asarray(ordinals)
+    minutes = evaluate(coefficients, ordinals) + utc_offsets(tz_name, longitude, ordinals) * 60
+    return (np.rint(minutes) % MINUTES_PER_DAY).astype(np.int64)
+
+
+def rms_error(coefficients: List[float], ordinals: np.ndarray, utc_minutes: np.ndarray) -> float:
+    """Root mean square residual in minutes over the known days."""
+    utc_minutes = np.asarray(utc_minutes, dtype=float)
+    known = ~np.isnan(utc_minutes)
+    fitted = evaluate(coefficients, np.asarray(ordinals)[known])
+    residual = (utc_minutes[known] - fitted + MINUTES_PER_DAY / 2) % MINUTES_PER_DAY
+    return float(np.sqrt(np.mean((residual - MINUTES_PER_DAY / 2) ** 2)))
@@ -0,0 +1,147 @@
+"""Fourier-smoothed Fajr/Isha times.
+
+Cities with a :class:`~izr_media.models.FourierFit` (see the
+``fit_fourier`` management command) are evaluated from their coefficients.
+Regensburg without stored fits falls back to
+``prayer-times-isha-fajr-fourier-fit.csv``, 365 rows of already evaluated
+times. They are parsed once per process into minutes-since-midnight arrays
+and re-read only when the file's mtime changes. Leap years get a Feb 29 row
+interpolated between Feb 28 and Mar 1, so every later day keeps its own row.
+The rows are 2025 clock times, so they are moved to other years through UTC
+and land on the right side of that year's DST switches.
+"""
+
+from datetime import date
+from functools import lru_cache
+import os
+from pathlib import Path
+import threading
+from typing import Final
+
+import numpy as np
+
+from ..models import FourierFit
+from .compact import CompactTable
+from .fourier import local_minutes
+from .local_cache import on_invalidate
+from .local_calculation import timezone_name
+from .table import common_year_rows, utc_offsets
+
+CSV_PATH: Final = Path(__file__).parent / "prayer-times-isha-fajr-fourier-fit.csv"
+CSV_COLUMNS: Final = ("Fajr", "Shuruq", "Dhuhr", "Asr", "Maghrib", "Isha")
+OVERRIDE_COLUMNS: Final = ("Fajr", "Isha")
+
+CSV_CITY: Final = "regensburg"
+# The CSV was evaluated for 2025 (DST starts on its day 89, Mar 30)
+CSV_YEAR: Final = 2025
+CSV_TIMEZONE: Final = "Europe/Berlin"
+
+
+class FourierTable:
+    """Minutes since midnight per CSV column, one row per day of a common year."""
+
+    def __init__(self, path: Path = CSV_PATH, year: int = CSV_YEAR, tz_name: str = CSV_TIMEZONE) -> None:
+        self.path = Path(path)
+        self.year = year
+        self.tz_name = tz_name
+        self._columns: dict[str, np.ndarray] = {}
+        self._mtime: float | None = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        with open(self.path, newline="") as csv_file:
+            header = csv_file.readline().strip().split(";")
+            rows = [line.strip().split(";") for line in csv_file if line.strip()]
+        columns = {}
+        for name in CSV_COLUMNS:
+            if name not in header:
+                continue
+            position = header.index(name)
+            values = [row[position].split(":") for row in rows]
+            columns[name] = np.array(
+                [int(hours) * 60 + int(minutes) for hours, minutes in values],
+                dtype=np.uint16,
+            )
+        self._columns = columns
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Return the common-year columns, reloading them if the CSV changed."""
+        mtime = os.stat(self.path).st_mtime
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._load()
+                    self._mtime = mtime
+        return self._columns
+
+    def range(self, first: date, count: int) -> dict[str, np.ndarray]:
+        """Return ``count`` consecutive rows starting at ``first``, across years.
+
+        The rows are clock times of :attr:`year`: they are taken to UTC with
+        that year's offsets and back with the offsets of the requested days.
+        """
+        csv_first = date(self.year, 1, 1).toordinal()
+        csv_offsets = utc_offsets(self.tz_name, 0.0, np.arange(csv_first, csv_first + 365)) * 60
+        offsets = utc_offsets(
+            self.tz_name, 0.0, np.arange(first.toordinal(), first.toordinal() + count)
+        ) * 60
+        return {
+            name: np.mod(
+                np.round(common_year_rows(values - csv_offsets, first, count) + offsets), 1440
+            ).astype(np.uint16)
+            for name, values in self.columns().items()
+        }
+
+
+regensburg_table: Final = FourierTable()
+
+
+@lru_cache(maxsize=32)
+def _stored_fits(city: str) -> dict[str, tuple[tuple[float, ...], str | None, float]]:
+    return {
+        fit.prayer: (
+            tuple(fit.coefficients),
+            timezone_name(fit.latitude, fit.longitude),
+            fit.longitude,
+        )
+        for fit in FourierFit.objects.filter(city=city.lower())
+    }
+
+
+@on_invalidate
+def clear_stored_fits() -> None:
+    """Forget the coefficients read so far, after a fit was saved or deleted.
+
+    Also runs in every worker when the prayer time caches are invalidated.
+    """
+    _stored_fits.cache_clear()
+
+
+def has_smoothing(city: str) -> bool:
+    """Return True if smoothed Fajr/Isha times exist for the city."""
+    return city.lower() == CSV_CITY or bool(_stored_fits(city.lower()))
+
+
+def smoothed_minutes(city: str, first: date, count: int) -> dict[str, np.ndarray]:
+    """Smoothed minutes since midnight per prayer for ``count`` days from ``first``."""
+    fits = _stored_fits(city.lower())
+    if not fits:
+        if city.lower() != CSV_CITY:
+            return {}
+        columns = regensburg_table.range(first, count)
+        return {name: columns[name] for name in OVERRIDE_COLUMNS if name in columns}
+    ordinals = np.arange(first.toordinal(), first.toordinal() + count)
+    return {
+        prayer: local_minutes(list(coefficients), ordinals, tz_name, longitude)
+        for prayer, (coefficients, tz_name, longitude) in fits.items()
+    }
+
+
+def apply_fourier_override(table: CompactTable, city: str = CSV_CITY) -> CompactTable:
+    """Return the table with Fajr/Isha replaced by the smoothed values.
+
+    The rows are located by date, so Hijri-year ranges and leap years line up.
+    """
+    if not len(table):
+        return table
+    return table.with_columns(smoothed_minutes(city, table.first, len(table)))
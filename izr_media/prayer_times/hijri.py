@@ -0,0 +1,141 @@
+"""Vectorized Gregorian to Hijri (Umm al-Qura) conversion.
+
+The Hijri labels of a whole Gregorian year, with the site's
+``correction_day`` applied, are built once and then served by day index.
+"""
+
+from datetime import date
+from functools import lru_cache
+from typing import Any, Final, List
+
+import numpy as np
+from hijri_converter import ummalqura
+
+# Month names as aladhan spells them, already stripped of diacritics
+HIJRI_MONTHS_EN: Final = (
+    "Muharram",
+    "Safar",
+    "Rabiʿ al-awwal",
+    "Rabiʿ al-thani",
+    "Jumada al-ula",
+    "Jumada al-akhirah",
+    "Rajab",
+    "Shaʿban",
+    "Ramadan",
+    "Shawwal",
+    "Dhu al-Qaʿdah",
+    "Dhu al-Hijjah",
+)
+HIJRI_MONTHS_AR: Final = (
+    "مُحَرَّم",
+    "صَفَر",
+    "رَبيع الأوَّل",
+    "رَبيع الثاني",
+    "جُمادى الأولى",
+    "جُمادى الآخرة",
+    "رَجَب",
+    "شَعْبان",
+    "رَمَضان",
+    "شَوّال",
+    "ذوالقعدة",
+    "ذوالحجة",
+)
+
+# Month starts of the Umm al-Qura table as date ordinals
+_MONTH_STARTS: Final = np.asarray(ummalqura.MONTH_STARTS, dtype=np.int64) + 2400000 - 1721425
+
+
+def to_hijri(ordinals) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Convert date ordinals to Hijri (year, month, day) arrays.
+
+    Same result as ``hijri_converter.Gregorian.to_hijri`` for every day, in one
+    ``searchsorted`` over the Umm al-Qura month starts.
+    """
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    if ordinals.size and (
+        ordinals.min() < _MONTH_STARTS[0] or ordinals.max() >= _MONTH_STARTS[-1]
+    ):
+        raise OverflowError("date out of range")
+
+    index = np.searchsorted(_MONTH_STARTS, ordinals, side="right") - 1
+    months = index + ummalqura.HIJRI_OFFSET
+    years = months // 12
+    return years + 1, months - years * 12 + 1, ordinals - _MONTH_STARTS[index] + 1
+
+
+def format_hijri(year: int, month: int, day: int) -> tuple[str, str]:
+    """Return the German/English and Arabic Hijri strings of a date."""
+    return (
+        f"{day:02d} {HIJRI_MONTHS_EN[month - 1]} {year}",
+        f"{day:02d} {HIJRI_MONTHS_AR[month - 1]} {year}",
+    )
+
+
+def hijri_month_range(year: int, month: int, correction_day: int = 0) -> tuple[date, date]:
+    """Return the first and last Gregorian day of a Hijri month.
+
+    ``correction_day`` is the site's manual adjustment: a Gregorian day shows
+    the Hijri date of ``correction_day`` days later, so the month moves the
+    other way.
+    """
+    index = (year - 1) * 12 + month - 1 - ummalqura.HIJRI_OFFSET
+    if not 0 <= index < len(_MONTH_STARTS) - 1:
+        raise OverflowError("date out of range")
+    first = int(_MONTH_STARTS[index]) - correction_day
+    last = int(_MONTH_STARTS[index + 1]) - 1 - correction_day
+    return date.fromordinal(first), date.fromordinal(last)
+
+
+@lru_cache(maxsize=16)
+def hijri_year_labels(year: int, correction_day: int = 0) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Return the (German/English, Arabic) Hijri labels of every day of ``year``.
+
+    A Gregorian day shows the Hijri date of ``correction_day`` days later.
+    """
+    ordinals = np.arange(date(year, 1, 1).toordinal(), date(year + 1, 1, 1).toordinal())
+    labels = [
+        format_hijri(*day)
+        for day in zip(*(part.tolist() for part in to_hijri(ordinals + correction_day)))
+    ]
+    return tuple(en for en, _ in labels), tuple(ar for _, ar in labels)
+
+
+def hijri_labels(first: date, count: int, correction_day: int = 0) -> tuple[List[str], List[str]]:
+    """Return the Hijri labels of ``count`` consecutive days from ``first``."""
+    last_year = date.fromordinal(first.toordinal() + count - 1).year
+    en: List[str] = []
+    ar: List[str] = []
+    for year in range(first.year, last_year + 1):
+        year_en, year_ar = hijri_year_labels(year, correction_day)
+        en.extend(year_en)
+        ar.extend(year_ar)
+    offset = first.toordinal() - date(first.year, 1, 1).toordinal()
+    return en[offset:offset + count], ar[offset:offset + count]
+
+
+def hijri_months(first: date, count: int, correction_day: int = 0) -> List[tuple[int, int, int, int]]:
+    """Return the Hijri months of ``count`` days from ``first`` as runs.
+
+    Each run is ``(row, year, month, day)``: the Hijri date of row ``row``,
+    the following rows count on until the next run starts.
+    """
+    ordinals = np.arange(first.toordinal(), first.toordinal() + count) + correction_day
+    years, months, days = to_hijri(ordinals)
+    starts = np.flatnonzero(days == 1)
+    if not count or (starts.size and starts[0] == 0):
+        rows = starts
+    else:
+        rows = np.concatenate([[0], starts])
+    return [(row, int(years[row]), int(months[row]), int(days[row])) for row in rows.tolist()]
+
+
+def apply_hijri(records: List[dict[str, Any]], correction_day: int = 0) -> List[dict[str, Any]]:
+    """Set Hijri/Hijri_ar of consecutive daily rows from the precomputed table."""
+    if not records:
+        return records
+    day, month, year = (int(part) for part in records[0]["Datum"].split("-"))
+    en, ar = hijri_labels(date(year, month, day), len(records), correction_day)
+    for record, hijri, hijri_ar in zip(records, en, ar):
+        record["Hijri"] = hijri
+        record["Hijri_ar"] = hijri_ar
+    return records
@@ -0,0 +1,294 @@
+"""Shared HTTP client for the aladhan upstream.
+
+One pooled ``requests.Session`` per process with bounded, jittered retries,
+split connect/read timeouts, a circuit breaker and per-call latency records.
+Calls can share a :class:`Deadline`: the timeouts of every attempt are cut to
+fit in it, and once it passed (or was expired early) no call goes out.
+"""
+
+from collections import deque
+import logging
+import os
+import threading
+import time
+from typing import Any, Final
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT: Final = 3.05
+READ_TIMEOUT: Final = 8.0
+MAX_RETRIES: Final = 2
+BACKOFF_FACTOR: Final = 0.3
+BACKOFF_JITTER: Final = 0.3
+POOL_MAXSIZE: Final = 12
+FAILURE_THRESHOLD: Final = 5
+RESET_TIMEOUT: Final = 30.0
+RETRY_STATUSES: Final = (429, 500, 502, 503, 504)
+# Longest total sleep between the retries of one call (urllib3 does not sleep
+# before the first retry)
+MAX_BACKOFF: Final = sum(
+    BACKOFF_FACTOR * 2 ** (retry - 1) + BACKOFF_JITTER for retry in range(2, MAX_RETRIES + 1)
+)
+# Shortest timeout worth trying an attempt with
+MIN_TIMEOUT: Final = 0.1
+
+
+class CircuitOpenError(Exception):
+    """Exception raised when the upstream is skipped after repeated failures"""
+
+    def __init__(self, url: str, retry_in: float) -> None:
+        self.message = f"Upstream circuit open, retry in {retry_in:.0f}s. URL: {url}"
+        super().__init__(self.message)
+
+
+class DeadlineExceededError(Exception):
+    """Exception raised when a call would start after its deadline"""
+
+    def __init__(self, url: str) -> None:
+        self.message = f"Deadline for upstream calls passed. URL: {url}"
+        super().__init__(self.message)
+
+
+class Deadline:
+    """Point in time by which a group of upstream calls has to be done.
+
+    Shared by the retries, fan-out rounds and months of one fetch; expire it
+    to stop the calls still to come once their result is no longer needed.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self._expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self._expires - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def expire(self) -> None:
+        self._expires = min(self._expires, time.monotonic())
+
+
+class CircuitBreaker:
+    """Fail fast after ``failure_threshold`` consecutive upstream failures.
+
+    After ``reset_timeout`` seconds a single trial call is let through
+    (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED: Final = "closed"
+    OPEN: Final = "open"
+    HALF_OPEN: Final = "half-open"
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def retry_in(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Return whether a call may go out now."""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_cancelled(self) -> None:
+        """A call ended without an outcome; let another trial through."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class LatencyRecorder:
+    """Keep the latest call latencies, per upstream endpoint."""
+
+    def __init__(self, maxlen: int = 256) -> None:
+        self._samples: dict[str, deque] = {}
+        self._maxlen = maxlen
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float, outcome: str) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(endpoint, deque(maxlen=self._maxlen))
+            samples.append((seconds, outcome))
+        logger.debug("aladhan %s %s in %.1f ms", endpoint, outcome, seconds * 1000)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Return count, error count and p50/p95/max latency in ms per endpoint."""
+        with self._lock:
+            snapshot = {endpoint: list(samples) for endpoint, samples in self._samples.items()}
+        summary = {}
+        for endpoint, samples in snapshot.items():
+            latencies = sorted(seconds * 1000 for seconds, _ in samples)
+            summary[endpoint] = {
+                "count": len(latencies),
+                "errors": sum(1 for _, outcome in samples if outcome != "ok"),
+                "p50_ms": round(latencies[len(latencies) // 2], 1),
+                "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+                "max_ms": round(latencies[-1], 1),
+            }
+        return summary
+
+
+def _endpoint(url: str) -> str:
+    """Return the endpoint name of an aladhan URL, e.g. ``calendar``."""
+    parts = url.split("/v1/", 1)[-1].split("/")
+    return parts[0]
+
+
+class UpstreamClient:
+    """HTTP client used by :class:`PrayerTimesCalculator` for every fetch."""
+
+    def __init__(
+        self,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+        pool_maxsize: int = POOL_MAXSIZE,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.pool_maxsize = pool_maxsize
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyRecorder()
+        self._session: requests.Session | None = None
+        self._session_pid: int | None = None
+        self._lock = threading.Lock()
+
+    def _build_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            status=self.max_retries,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            backoff_factor=BACKOFF_FACTOR,
+            backoff_jitter=BACKOFF_JITTER,
+            # A Retry-After could sleep past any deadline; the breaker covers 429 storms
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=2, pool_maxsize=self.pool_maxsize, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """The keep-alive session of this process, rebuilt after a fork."""
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._lock:
+                if self._session is None or self._session_pid != pid:
+                    self._session = self._build_session()
+                    self._session_pid = pid
+        return self._session
+
+    def timeout_within(self, deadline: Deadline | None) -> tuple[float, float]:
+        """Connect/read timeouts such that all attempts of a call fit in ``deadline``."""
+        if deadline is None:
+            return self.timeout
+        attempt = (deadline.remaining() - MAX_BACKOFF) / (self.max_retries + 1)
+        attempt = max(attempt, MIN_TIMEOUT)
+        return (min(self.timeout[0], attempt), min(self.timeout[1], attempt))
+
+    def get(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        deadline: Deadline | None = None,
+        **kwargs,
+    ) -> requests.Response:
+        """GET ``url`` through the pool, the retries and the circuit breaker.
+
+        Raises :class:`CircuitOpenError` without touching the network while
+        the circuit is open, and :class:`DeadlineExceededError` once
+        ``deadline`` passed.
+        """
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceededError(url)
+        if not self.breaker.allow():
+            raise CircuitOpenError(url, self.breaker.retry_in())
+
+        endpoint = _endpoint(url)
+        start = time.perf_counter()
+        try:
+            response = self.session.get(
+                url, params=params, timeout=self.timeout_within(deadline), **kwargs
+            )
+        except requests.RequestException:
+            self.latency.record(endpoint, time.perf_counter() - start, "error")
+            # Timeouts we cut short for the deadline say nothing about the upstream
+            if deadline is None or not deadline.expired:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_cancelled()
+            raise
+
+        outcome = "ok" if response.status_code < 400 else str(response.status_code)
+        self.latency.record(endpoint, time.perf_counter() - start, outcome)
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+
+_client: UpstreamClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> UpstreamClient:
+    """Return the process-wide upstream client."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = UpstreamClient()
+    return _client
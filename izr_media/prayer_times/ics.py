@@ -0,0 +1,101 @@
+"""iCalendar (RFC 5545) feed of prayer times.
+
+Events are written in UTC straight from a :class:`~.countdown.PrayerIndex`,
+one at a time, so a year of six prayers a day never exists as a single
+string while it is generated.
+"""
+
+from datetime import datetime, timezone
+from typing import Final, Iterable, Iterator
+
+import numpy as np
+
+from .countdown import INDEX_PRAYERS, PrayerIndex
+
+ICS_CONTENT_TYPE: Final = "text/calendar; charset=utf-8"
+EVENT_MINUTES: Final = 15
+# Content lines longer than this many octets are folded
+LINE_OCTETS: Final = 75
+
+
+def _fold(line: str) -> str:
+    encoded = line.encode("utf-8")
+    if len(encoded) <= LINE_OCTETS:
+        return line + "\r\n"
+    parts = []
+    while encoded:
+        # Never cut inside a UTF-8 sequence
+        cut = min(len(encoded), LINE_OCTETS - (1 if parts else 0))
+        while cut < len(encoded) and encoded[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _utc_stamp(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def iter_ics(
+    index: PrayerIndex,
+    calendar_name: str,
+    uid_prefix: str,
+    prayers: Iterable[str] = INDEX_PRAYERS,
+    alarm_minutes: int | None = None,
+    stamp: datetime | None = None,
+    events_per_chunk: int = 64,
+) -> Iterator[str]:
+    """Yield the calendar in chunks of ``events_per_chunk`` events.
+
+    ``stamp`` is the DTSTAMP of all events (the version of the data), so the
+    same input always gives the same bytes.
+    """
+    codes = [INDEX_PRAYERS.index(prayer) for prayer in prayers]
+    selected = np.flatnonzero(np.isin(index.prayers, codes))
+    dtstamp = (stamp or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    dtstamp = dtstamp.strftime("%Y%m%dT%H%M%SZ")
+
+    yield "".join(
+        _fold(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//IZR Regensburg//Prayer Times//DE",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{_escape(calendar_name)}",
+            "X-PUBLISHED-TTL:P1D",
+            "REFRESH-INTERVAL;VALUE=DURATION:P1D",
+        )
+    )
+    for start in range(0, len(selected), events_per_chunk):
+        lines = []
+        for position in selected[start:start + events_per_chunk].tolist():
+            instant = int(index.instants[position])
+            prayer = INDEX_PRAYERS[int(index.prayers[position])]
+            begin = _utc_stamp(instant)
+            lines += [
+                "BEGIN:VEVENT",
+                f"UID:{uid_prefix}-{prayer.lower()}-{begin[:8]}",
+                f"DTSTAMP:{dtstamp}",
+                f"DTSTART:{begin}",
+                f"DURATION:PT{EVENT_MINUTES}M",
+                f"SUMMARY:{_escape(prayer)}",
+                "TRANSP:TRANSPARENT",
+            ]
+            if alarm_minutes is not None:
+                lines += [
+                    "BEGIN:VALARM",
+                    "ACTION:DISPLAY",
+                    f"DESCRIPTION:{_escape(prayer)}",
+                    f"TRIGGER:-PT{alarm_minutes}M",
+                    "END:VALARM",
+                ]
+            lines.append("END:VEVENT")
+        yield "".join(_fold(line) for line in lines)
+    yield "END:VCALENDAR\r\n"
@@ -0,0 +1,160 @@
+"""In-process cache (L1) of decoded prayer tables in front of Redis.
+
+Each worker keeps the most recently used tables, today rows and encoded
+responses for a short time. When the configuration changes, every worker
+is told over Redis pub/sub to drop its entries. A worker that is not
+subscribed, e.g. while Redis is away, serves everything from Redis.
+"""
+
+from collections import OrderedDict
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Final, List
+
+from django.conf import settings
+import redis
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL: Final = "prayer_times:invalidate"
+# Seconds before a lost subscription is opened again, doubled per failed attempt
+RESUBSCRIBE_DELAY: Final = 5.0
+MAX_RESUBSCRIBE_DELAY: Final = 60.0
+
+# Other per-process caches to drop along with this worker's L1 entries
+_clear_hooks: List[Callable[[], None]] = []
+
+
+def on_invalidate(hook: Callable[[], None]) -> Callable[[], None]:
+    """Run ``hook`` whenever the L1 cache of this worker is cleared."""
+    _clear_hooks.append(hook)
+    return hook
+
+
+class LocalCache:
+    """Thread-safe LRU cache with a time to live per entry.
+
+    :attr:`generation` counts the clears. Pass the generation seen before
+    reading the value from Redis to :meth:`set`, so a value read before an
+    invalidation is not stored after it.
+    """
+
+    def __init__(
+        self, maxsize: int = 256, ttl: float = 300.0, hooks: List[Callable[[], None]] | None = None
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hooks = [] if hooks is None else hooks
+        self.generation = 0
+        self.subscribed = False
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any) -> Any:
+        """Return the value of ``key``, or None when missing, expired or unsubscribed."""
+        if not self.subscribed:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any, ttl: float | None = None, generation: int | None = None) -> None:
+        """Store ``value`` for at most ``ttl`` seconds (the cache's default at most)."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if not self.subscribed or ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+        for hook in self.hooks:
+            hook()
+
+    def listen(self, redis_client: redis.Redis, channel: str = INVALIDATION_CHANNEL) -> None:
+        """Clear on every message of ``channel``; runs for good, meant for a daemon thread.
+
+        The cache is cleared once when the subscription is lost and once when
+        it is back; failed attempts in between leave it alone and back off.
+        """
+        delay = RESUBSCRIBE_DELAY
+        while True:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(channel)
+                # Anything published while unsubscribed was missed
+                self.clear()
+                self.subscribed = True
+                delay = RESUBSCRIBE_DELAY
+                logger.info("L1 cache subscribed to %s", channel)
+                for message in pubsub.listen():
+                    self.clear()
+                    logger.debug("L1 cache cleared: %s", message.get("data"))
+            except redis.RedisError as e:
+                if self.subscribed:
+                    logger.warning("L1 cache unsubscribed from %s: %s", channel, e)
+                else:
+                    logger.debug("L1 cache still unsubscribed from %s: %s", channel, e)
+            finally:
+                if self.subscribed:
+                    self.subscribed = False
+                    self.clear()
+                pubsub.close()
+            time.sleep(delay)
+            delay = min(delay * 2, MAX_RESUBSCRIBE_DELAY)
+
+
+_cache: LocalCache | None = None
+_cache_pid: int | None = None
+_cache_lock = threading.Lock()
+
+
+def local_cache() -> LocalCache:
+    """Return this worker's cache, subscribing it on first use.
+
+    Checked per process, as gunicorn forks the workers after imports.
+    """
+    global _cache, _cache_pid
+    with _cache_lock:
+        if _cache is None or _cache_pid != os.getpid():
+            _cache = LocalCache(
+                settings.PRAYER_TIMES_L1_SIZE, settings.PRAYER_TIMES_L1_TTL, _clear_hooks
+            )
+            _cache_pid = os.getpid()
+            if settings.PRAYER_TIMES_L1_SIZE > 0:
+                threading.Thread(
+                    target=_cache.listen,
+                    args=(settings.REDIS_CLIENT,),
+                    name="prayer-times-l1",
+                    daemon=True,
+                ).start()
+    return _cache
+
+
+def invalidate_local_caches(reason: str = "") -> None:
+    """Drop the L1 entries of every worker, this one right away."""
+    if _cache is not None and _cache_pid == os.getpid():
+        _cache.clear()
+    try:
+        settings.REDIS_CLIENT.publish(INVALIDATION_CHANNEL, reason)
+    except redis.RedisError as e:
+        logger.warning("Could not publish L1 cache invalidation: %s", e)
@@ -0,0 +1,136 @@
+"""Offline prayer times calculator backed by the local solar-position engine."""
+
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, List
+
+from timezonefinder import TimezoneFinder
+
+from .astronomy import (
+    ASR_FACTORS,
+    LAT_ADJ_ANGLE_BASED,
+    LAT_ADJ_NONE,
+    METHOD_PARAMS,
+    TUNE_ORDER,
+    MethodParams,
+)
+from .angle_series import AngleProvider
+from .calculation import MIDNIGHT_MODES, PrayerTimesCalculator
+from .hijri import hijri_month_range
+from .table import PrayerTable, build_prayer_table
+
+
+@lru_cache(maxsize=1)
+def _timezone_finder() -> TimezoneFinder:
+    return TimezoneFinder()
+
+
+@lru_cache(maxsize=128)
+def timezone_name(latitude: float, longitude: float) -> str | None:
+    """Return the IANA timezone for the coordinates, like aladhan resolves it."""
+    return _timezone_finder().timezone_at(lng=longitude, lat=latitude)
+
+
+class LocalPrayerTimesCalculator(PrayerTimesCalculator):
+    """Prayer time calculator that never leaves the process.
+
+    Accepts the same arguments as :class:`PrayerTimesCalculator` and returns
+    the same formatted dictionaries from the ``fetch_*`` methods. The
+    ``compute_*`` methods return the underlying :class:`PrayerTable`.
+    With an ``angle_series`` the Fajr/Isha angles change from day to day.
+    """
+
+    def __init__(self, *args, angle_series: AngleProvider | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._angle_series = angle_series
+
+    def _method_params(self) -> MethodParams:
+        params = METHOD_PARAMS.get(self._calculation_method, METHOD_PARAMS[3])
+        if self._method_settings:
+            fajr, maghrib, isha = (
+                None if value == "null" else float(value)
+                for value in self._method_settings.split(",")
+            )
+            params = params._replace(
+                fajr_angle=params.fajr_angle if fajr is None else fajr,
+                isha_angle=params.isha_angle if isha is None else isha,
+                isha_minutes=params.isha_minutes if isha is None else None,
+                maghrib_angle=params.maghrib_angle if maghrib is None else maghrib,
+            )
+        return params
+
+    def _tune_minutes(self) -> dict[str, float]:
+        if not self._tune:
+            return {}
+        return {
+            name: float(value)
+            for name, value in zip(TUNE_ORDER, self._tune.split(","))
+            if float(value)
+        }
+
+    def _midnight(self) -> str | None:
+        if self._midnight_mode is None:
+            return None
+        return next(
+            name for name, mode in MIDNIGHT_MODES.items() if mode == self._midnight_mode
+        )
+
+    def compute_table(self, first: date, last: date) -> PrayerTable:
+        """Compute the prayer table from ``first`` to ``last`` inclusive."""
+        params = self._method_params()
+        lat_adj_method = self._lat_adj_method or LAT_ADJ_ANGLE_BASED
+        if self._angle_series is not None:
+            # Observed angles already carry whatever high-latitude rule produced them
+            lat_adj_method = self._lat_adj_method or LAT_ADJ_NONE
+            fajr, isha = self._angle_series.for_days(
+                first, last.toordinal() - first.toordinal() + 1
+            )
+            params = params._replace(fajr_angle=fajr, isha_angle=isha, isha_minutes=None)
+        return build_prayer_table(
+            first,
+            last,
+            latitude=self._latitude,
+            longitude=self._longitude,
+            tz_name=timezone_name(self._latitude, self._longitude),
+            params=params,
+            asr_factor=ASR_FACTORS.get(self._school, 1),
+            tune=self._tune_minutes(),
+            lat_adj_method=lat_adj_method,
+            midnight=self._midnight(),
+        )
+
+    def compute_years(self, first_year: int, last_year: int | None = None) -> PrayerTable:
+        """Compute one table covering every day of the given (range of) years."""
+        return self.compute_table(
+            date(first_year, 1, 1), date(last_year or first_year, 12, 31)
+        )
+
+    def fetch_daily_prayer_times(self, date) -> dict[str, Any]:
+        """Compute daily prayer times for the specified date."""
+        try:
+            date_parsed = datetime.strptime(date, "%Y-%m-%d").date()
+        except ValueError as err:
+            raise ValueError(
+                "Invalid date string. Must be 'yyyy-mm-dd'") from err
+
+        return self.compute_table(date_parsed, date_parsed).record(0)
+
+    def fetch_monthly_prayer_times(
+        self, month: int, year: int, hijri: bool = False
+    ) -> List[dict[str, Any]]:
+        """Compute monthly prayer times."""
+        if hijri:
+            return self.compute_table(*hijri_month_range(year, month)).records()
+        first = date(year, month, 1)
+        last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+        return self.compute_table(first, last).records()
+
+    def fetch_annual_prayer_times(
+        self, year: int, hijri: bool = False, fan_out: bool = False
+    ) -> List[dict[str, Any]]:
+        """Compute annual prayer times (``fan_out`` has nothing to split here)."""
+        if hijri:
+            first, _ = hijri_month_range(year, 1)
+            _, last = hijri_month_range(year, 12)
+            return self.compute_table(first, last).records()
+        return self.compute_years(year).records()
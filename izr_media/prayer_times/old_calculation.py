@@ -1,8 +1,8 @@
 from datetime import datetime, time, timedelta
 from pyIslam.praytimes import PrayerConf, Prayer, MethodInfo, LIST_FAJR_ISHA_METHODS, FixedTime
-from pyIslam.hijri import HijriDate
 from pytz import timezone
 from timezonefinder import TimezoneFinder
+from izr_media.prayer_times.hijri import hijri_labels
 from izr_media.models import (
     PrayerCalculationConfig,
 )  # Import the PrayerConfig model
@@ -98,7 +98,11 @@ class OldPrayerTimesCalculator:
 
         asr_fiqh = 1
 
-        for day in range((self.end_date - self.start_date).days + 1):
+        # Hijri dates of the whole range from the precomputed table
+        day_count = (self.end_date - self.start_date).days + 1
+        hijri_en, hijri_ar = hijri_labels(self.start_date, day_count, correction_day)
+
+        for day in range(day_count):
             current_date = self.start_date + timedelta(days=day)
             tz_name = self.tz_finder.timezone_at(
                 lng=self.longitude, lat=self.latitude)
@@ -109,13 +113,11 @@ class OldPrayerTimesCalculator:
             prayer_conf = PrayerConf(
                 self.longitude, self.latitude, utc_offset, fajr_isha_method, asr_fiqh)
             prayer = Prayer(prayer_conf, current_date)
-            hijri = HijriDate.get_hijri(
-                current_date, correction_val=correction_day)
 
             prayer_times = {
                 "Datum": current_date.strftime("%d-%m-%Y"),
-                "Hijri": hijri.format(2),
-                "Hijri_ar": hijri.format(1),
+                "Hijri": hijri_en[day],
+                "Hijri_ar": hijri_ar[day],
                 "Fajr": round_time_to_minute(prayer.fajr_time()).strftime("%H:%M"),
                 "Shuruq": round_time_to_minute(prayer.sherook_time()).strftime("%H:%M"),
                 "Dhuhr": round_time_to_minute(prayer.dohr_time()).strftime("%H:%M"),
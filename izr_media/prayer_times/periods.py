@@ -0,0 +1,63 @@
+"""Date ranges of the ``period`` values and their slices of annual tables.
+
+Annual tables hold one row per day from Jan 1, so a day's row is found by
+its offset in the year and any range is a slice per year it touches.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Final, Iterator
+
+PERIODS: Final = ("annual", "day", "week", "month", "range")
+# Longest from/to range served at once
+RANGE_MAX_DAYS: Final = 366
+
+
+def _day(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def period_bounds(
+    period: str, value=None, date_from: str | None = None, date_to: str | None = None,
+    today: date | None = None,
+) -> tuple[date, date]:
+    """Return the first and last day of a period.
+
+    ``value`` is the year for "annual", a date (YYYY-MM-DD) for "day" and
+    "week" (its Monday to Sunday) and a month (YYYY-MM) for "month"; all
+    default to the current one. "range" takes ``date_from`` and
+    ``date_to``, both inclusive. Raises ValueError on anything else.
+    """
+    today = today or date.today()
+    if period == "annual":
+        year = int(value or today.year)
+        return date(year, 1, 1), date(year, 12, 31)
+    if period == "day":
+        day = _day(value) if value else today
+        return day, day
+    if period == "week":
+        day = _day(value) if value else today
+        monday = day - timedelta(days=day.weekday())
+        return monday, monday + timedelta(days=6)
+    if period == "month":
+        first = datetime.strptime(value, "%Y-%m").date() if value else today.replace(day=1)
+        following = date(first.year + first.month // 12, first.month % 12 + 1, 1)
+        return first, following - timedelta(days=1)
+    if period == "range":
+        if not date_from or not date_to:
+            raise ValueError("period 'range' needs 'from' and 'to'")
+        first, last = _day(date_from), _day(date_to)
+        if last < first:
+            raise ValueError("'to' is before 'from'")
+        if (last - first).days >= RANGE_MAX_DAYS:
+            raise ValueError(f"at most {RANGE_MAX_DAYS} days per request")
+        return first, last
+    raise ValueError(f"period must be one of {', '.join(PERIODS)}")
+
+
+def year_slices(first: date, last: date) -> Iterator[tuple[int, slice]]:
+    """Yield ``(year, rows)`` slices of the annual tables covering first..last."""
+    for year in range(first.year, last.year + 1):
+        start = max(first, date(year, 1, 1))
+        stop = min(last, date(year, 12, 31))
+        offset = date(year, 1, 1).toordinal()
+        yield year, slice(start.toordinal() - offset, stop.toordinal() - offset + 1)
@@ -0,0 +1,69 @@
+"""Ramadan timetable: the month's days of the annual table with Imsak, Iftar,
+Tarawih and the iqama times already filled in."""
+
+from datetime import time, timedelta
+from typing import Any, Final, List
+
+import numpy as np
+
+from .compact import CompactTable
+from .sunnah import sunnah_times
+from .table import minute_labels
+
+RAMADAN: Final = 9
+FRIDAY: Final = 4
+
+# Iqama offsets of PrayerConfig, in minutes after the adhan, per column
+IQAMA_COLUMNS: Final = {
+    "Fajr": "fajr",
+    "Dhuhr": "dhuhr",
+    "Asr": "asr",
+    "Maghrib": "maghrib",
+    "Isha": "isha",
+}
+
+
+def _label(value: time) -> str:
+    return value.strftime("%H:%M")
+
+
+def ramadan_timetable(
+    table: CompactTable,
+    tarawih_time: time,
+    jumaa_time: time,
+    iqama_config=None,
+    imsak_offset: float = -10,
+    correction_day: int = 0,
+) -> List[dict[str, Any]]:
+    """Build the Ramadan rows from the month's slice of the annual table."""
+    if not len(table):
+        return []
+    records = table.records(correction_day)
+    imsak = [item["Imsak"] for item in sunnah_times(table, imsak_offset=imsak_offset)]
+    iqama = {}
+    if iqama_config is not None:
+        for column, field in IQAMA_COLUMNS.items():
+            minutes = table.column(column)
+            iqama[column] = minute_labels(np.mod(minutes + getattr(iqama_config, field), 1440))
+
+    timetable = []
+    for index, record in enumerate(records):
+        row = {
+            "Datum": record["Datum"],
+            "Hijri": record["Hijri"],
+            "Hijri_ar": record["Hijri_ar"],
+            "Imsak": imsak[index],
+            "Fajr": record["Fajr"],
+            "Shuruq": record["Shuruq"],
+            "Dhuhr": record["Dhuhr"],
+            "Asr": record["Asr"],
+            "Iftar": record["Maghrib"],
+            "Isha": record["Isha"],
+            "Tarawih": _label(tarawih_time),
+        }
+        if (table.first + timedelta(days=index)).weekday() == FRIDAY:
+            row["Jumaa"] = _label(jumaa_time)
+        if iqama:
+            row["Iqama"] = {column: values[index] for column, values in iqama.items()}
+        timetable.append(row)
+    return timetable
@@ -0,0 +1,89 @@
+"""Incremental parsing of aladhan annual calendar payloads.
+
+An annual ``/calendar/{year}`` body looks like
+``{"code": 200, "status": "OK", "data": {"1": [{day}, ...], ..., "12": [...]}}``
+and a monthly ``/calendar/{year}/{month}`` body like
+``{"code": 200, "status": "OK", "data": [{day}, ...]}``.
+:func:`iter_calendar_days` yields the day objects of either one by one as the
+bytes arrive, so only one day is ever decoded at a time.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Final, Iterable, Iterator
+
+_DATA_START: Final = re.compile(r'"data"\s*:\s*([\[{])')
+_MONTH_START: Final = re.compile(r'\s*,?\s*"[^"]*"\s*:\s*\[')
+_DATA_END: Final = re.compile(r"\s*\}")
+_DAY_SEPARATOR: Final = re.compile(r"\s*,?\s*")
+_MONTH_END: Final = re.compile(r"\]")
+
+_decoder: Final = json.JSONDecoder()
+
+
+class CalendarStreamError(ValueError):
+    """Exception raised when the calendar payload is not the expected shape"""
+
+    pass
+
+
+def iter_calendar_days(chunks: Iterable[bytes]) -> Iterator[dict[str, Any]]:
+    """Yield the per-day objects of an annual or monthly calendar body given as chunks."""
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    state = "prefix"
+    # A monthly body has a single list of days instead of months
+    single_month = False
+    chunks = iter(chunks)
+    finished = False
+
+    while state != "done":
+        progressed = False
+        if state == "prefix":
+            match = _DATA_START.search(buffer, position)
+            if match:
+                single_month = match.group(1) == "["
+                state = "days" if single_month else "months"
+                position, progressed = match.end(), True
+        elif state == "months":
+            match = _MONTH_START.match(buffer, position)
+            if match:
+                position, state, progressed = match.end(), "days", True
+            else:
+                match = _DATA_END.match(buffer, position)
+                if match:
+                    position, state, progressed = match.end(), "done", True
+        elif state == "days":
+            position = _DAY_SEPARATOR.match(buffer, position).end()
+            match = _MONTH_END.match(buffer, position)
+            if match:
+                state = "done" if single_month else "months"
+                position, progressed = match.end(), True
+            elif position < len(buffer):
+                try:
+                    day, end = _decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    pass  # incomplete until proven otherwise by the end of the stream
+                else:
+                    yield day
+                    position, progressed = end, True
+
+        if progressed:
+            continue
+        if finished:
+            raise CalendarStreamError(f"Calendar payload ended early or is malformed ({state})")
+
+        # Need more bytes: drop what was consumed and read the next chunk
+        buffer = buffer[position:]
+        position = 0
+        try:
+            buffer += text.decode(next(chunks))
+        except StopIteration:
+            buffer += text.decode(b"", final=True)
+            finished = True
+
+    # Drain the closing bytes so pass-through consumers (the archive) see the whole body
+    for _ in chunks:
+        pass
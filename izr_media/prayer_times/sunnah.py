@@ -0,0 +1,68 @@
+"""Sunnah times derived from an annual prayer table.
+
+Everything is array arithmetic on the columns of the cached table: the night
+of a day runs from its Maghrib to the next day's Shuruq (standard) or Fajr
+(jafari), so no prayer time has to be fetched or recomputed. Midnight and the
+last third divide the same night, so the last third never starts before
+midnight.
+"""
+
+from typing import Any, Final, List
+
+import numpy as np
+
+from .astronomy import IMSAK_MINUTES
+from .compact import CompactTable
+from .table import minute_labels
+
+MIDNIGHT_STANDARD: Final = "standard"
+MIDNIGHT_JAFARI: Final = "jafari"
+
+# Duha starts once the sun has risen about a spear's length and ends
+# shortly before the sun reaches its zenith
+DUHA_START_MINUTES: Final = 15
+DUHA_END_MINUTES: Final = 10
+
+
+def _next_day(values: np.ndarray) -> np.ndarray:
+    # The last day has no successor in the table and borrows its own
+    # morning; pass one day more than needed where its night matters
+    return np.append(values[1:], values[-1:])
+
+
+def _clock(minutes: np.ndarray) -> List[str]:
+    return minute_labels(np.mod(np.floor(minutes + 0.5), 1440))
+
+
+def sunnah_times(
+    table: CompactTable,
+    midnight: str = MIDNIGHT_STANDARD,
+    imsak_offset: float = -IMSAK_MINUTES,
+    sunset_offset: float = 0,
+) -> List[dict[str, Any]]:
+    """Return Imsak, Sunset, Midnight, last third and Duha for each day of the table.
+
+    ``imsak_offset`` is added to Fajr and ``sunset_offset`` to Maghrib, for
+    tables whose Maghrib is not plain sunset (e.g. tuned separately). The
+    night of the last row ends with its own morning, see :func:`_next_day`.
+    """
+    if not len(table):
+        return []
+    column = {name: table.column(name) for name in ("Fajr", "Shuruq", "Dhuhr", "Maghrib")}
+    sunset = column["Maghrib"] + sunset_offset
+    morning = column["Fajr"] if midnight == MIDNIGHT_JAFARI else column["Shuruq"]
+    night = np.mod(_next_day(morning) - sunset, 1440)
+
+    columns = {
+        "Datum": table.datum_labels(),
+        "Imsak": _clock(column["Fajr"] + imsak_offset),
+        "Fajr": table.time_labels("Fajr"),
+        "Shuruq": table.time_labels("Shuruq"),
+        "Duha_start": _clock(column["Shuruq"] + DUHA_START_MINUTES),
+        "Duha_end": _clock(column["Dhuhr"] - DUHA_END_MINUTES),
+        "Sunset": _clock(sunset),
+        "Midnight": _clock(sunset + night / 2),
+        "Last_third": _clock(sunset + night * 2 / 3),
+    }
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
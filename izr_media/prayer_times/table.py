@@ -0,0 +1,251 @@
+"""Columnar prayer time tables computed in one vectorized pass."""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Any, Final, List, Mapping
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .astronomy import (
+    ASR_FACTORS,
+    JD_EPOCH,
+    LAT_ADJ_ANGLE_BASED,
+    MethodParams,
+    compute_method_matrix,
+    compute_prayer_times,
+    to_minutes,
+)
+from .hijri import format_hijri, to_hijri
+
+# Output columns of the formatted rows, mapped to the engine's timing names
+RECORD_COLUMNS: Final = {
+    "Fajr": "Fajr",
+    "Shuruq": "Sunrise",
+    "Dhuhr": "Dhuhr",
+    "Asr": "Asr",
+    "Maghrib": "Maghrib",
+    "Isha": "Isha",
+}
+
+
+# HH:MM label of every minute of the day; index -1 is the undefined time
+MINUTE_LABELS: Final = tuple(
+    f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(1440)
+) + ("-----",)
+
+
+def minute_labels(minutes: np.ndarray) -> List[str]:
+    """Format an array of minutes since midnight as HH:MM strings."""
+    indices = np.nan_to_num(minutes, nan=-1).astype(int).tolist()
+    return [MINUTE_LABELS[index] for index in indices]
+
+
+_LABEL_MINUTES: Final = {label: float(minute) for minute, label in enumerate(MINUTE_LABELS[:-1])}
+
+
+def label_minutes(labels: List[str]) -> np.ndarray:
+    """Parse HH:MM labels back to minutes since midnight (NaN when undefined)."""
+    return np.array([_LABEL_MINUTES.get(label, np.nan) for label in labels], dtype=float)
+
+
+@lru_cache(maxsize=64)
+def _year_utc_offsets(tz_name: str, year: int) -> np.ndarray:
+    tz = ZoneInfo(tz_name)
+    first = date(year, 1, 1).toordinal()
+    last = date(year, 12, 31).toordinal()
+    offsets = np.array(
+        [
+            datetime.combine(date.fromordinal(ordinal), time(12, 0), tz)
+            .utcoffset()
+            .total_seconds()
+            for ordinal in range(first, last + 1)
+        ]
+    ) / 3600
+    offsets.flags.writeable = False
+    return offsets
+
+
+def utc_offsets(tz_name: str | None, longitude: float, ordinals: np.ndarray) -> np.ndarray:
+    """Return the UTC offset in hours at local noon of each day ordinal."""
+    if tz_name is None:
+        return np.full(len(ordinals), round(longitude / 15), dtype=float)
+    if not len(ordinals):
+        return np.empty(0)
+    first_year = date.fromordinal(int(ordinals[0])).year
+    last_year = date.fromordinal(int(ordinals[-1])).year
+    offsets = np.concatenate(
+        [_year_utc_offsets(tz_name, year) for year in range(first_year, last_year + 1)]
+    )
+    return offsets[ordinals - date(first_year, 1, 1).toordinal()]
+
+
+# Day-of-year index (0-based) of Feb 29, and of Mar 1 in common years
+LEAP_DAY_INDEX: Final = 59
+
+
+def common_year_rows(values: np.ndarray, first: date, count: int) -> np.ndarray:
+    """Spread a 365-row day-of-year series over ``count`` days from ``first``.
+
+    Feb 29 takes the mean of Feb 28 and Mar 1, so every later day of a leap
+    year keeps its own row.
+    """
+    days = np.arange(np.datetime64(first, "D"), np.datetime64(first, "D") + count)
+    years = days.astype("datetime64[Y]")
+    day_of_year = (days - years.astype("datetime64[D]")).astype(np.int64)
+    calendar_year = years.astype(np.int64) + 1970
+    leap = (calendar_year % 4 == 0) & ((calendar_year % 100 != 0) | (calendar_year % 400 == 0))
+    rows = day_of_year - (leap & (day_of_year >= LEAP_DAY_INDEX))
+    result = values[rows]
+    leap_day = leap & (day_of_year == LEAP_DAY_INDEX)
+    if leap_day.any():
+        mean = (float(values[LEAP_DAY_INDEX - 1]) + float(values[LEAP_DAY_INDEX])) / 2
+        result[leap_day] = round(mean) if np.issubdtype(values.dtype, np.integer) else mean
+    return result
+
+
+@dataclass
+class PrayerTable:
+    """Prayer times of consecutive days, one array per column.
+
+    ``times`` maps the engine's timing names (Fajr, Sunrise, ..., Midnight) to
+    minutes since local midnight; undefined times are NaN.
+    """
+
+    ordinals: np.ndarray
+    hijri_year: np.ndarray
+    hijri_month: np.ndarray
+    hijri_day: np.ndarray
+    times: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    @property
+    def dates(self) -> np.ndarray:
+        """Gregorian dates as ``datetime64[D]``."""
+        return (self.ordinals - date(1970, 1, 1).toordinal()).astype("datetime64[D]")
+
+    def index_of(self, day: date) -> int:
+        """Return the row of ``day``, raising KeyError when it is not covered."""
+        index = day.toordinal() - int(self.ordinals[0]) if len(self) else -1
+        if not 0 <= index < len(self):
+            raise KeyError(day.isoformat())
+        return index
+
+    def record(self, index: int) -> dict[str, Any]:
+        """Format one row like ``PrayerTimesCalculator._format_response``."""
+        return self.records(index, index + 1)[0]
+
+    def records(self, start: int = 0, stop: int | None = None) -> List[dict[str, Any]]:
+        """Format the rows ``start:stop`` as a list of dictionaries.
+
+        Formats column by column, which is what makes a whole year cheap.
+        """
+        rows = slice(start, stop)
+        columns: dict[str, List[str]] = {
+            "Datum": [
+                date.fromordinal(ordinal).strftime("%d-%m-%Y")
+                for ordinal in self.ordinals[rows].tolist()
+            ],
+            "Hijri_ar": [],
+            "Hijri": [],
+        }
+        for year, month, day in zip(
+            self.hijri_year[rows].tolist(),
+            self.hijri_month[rows].tolist(),
+            self.hijri_day[rows].tolist(),
+        ):
+            hijri, hijri_ar = format_hijri(year, month, day)
+            columns["Hijri"].append(hijri)
+            columns["Hijri_ar"].append(hijri_ar)
+        for column, name in RECORD_COLUMNS.items():
+            columns[column] = minute_labels(self.times[name][rows])
+
+        keys = list(columns)
+        return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def build_prayer_table(
+    first: date,
+    last: date,
+    latitude: float,
+    longitude: float,
+    tz_name: str | None,
+    params: MethodParams,
+    asr_factor: int = 1,
+    tune: dict[str, float] | None = None,
+    lat_adj_method: int = LAT_ADJ_ANGLE_BASED,
+    midnight: str | None = None,
+) -> PrayerTable:
+    """Compute the prayer table of every day from ``first`` to ``last`` inclusive.
+
+    All days, across as many years as requested, go through the engine as a
+    single array.
+    """
+    ordinals = np.arange(first.toordinal(), last.toordinal() + 1, dtype=np.int64)
+    times = compute_prayer_times(
+        ordinals + JD_EPOCH,
+        latitude=latitude,
+        longitude=longitude,
+        utc_offset=utc_offsets(tz_name, longitude, ordinals),
+        params=params,
+        asr_factor=asr_factor,
+        tune=tune,
+        lat_adj_method=lat_adj_method,
+        midnight=midnight,
+    )
+    hijri_year, hijri_month, hijri_day = to_hijri(ordinals)
+    return PrayerTable(
+        ordinals=ordinals,
+        hijri_year=hijri_year,
+        hijri_month=hijri_month,
+        hijri_day=hijri_day,
+        times={name: to_minutes(values) for name, values in times.items()},
+    )
+
+
+# Columns of the method comparison that differ between methods
+METHOD_COLUMNS: Final = ("Imsak", "Fajr", "Maghrib", "Isha", "Midnight")
+
+
+def build_method_comparison(
+    first: date,
+    last: date,
+    latitude: float,
+    longitude: float,
+    tz_name: str | None,
+    methods: Mapping[str, MethodParams],
+    schools: Mapping[str, int],
+    lat_adj_method: int = LAT_ADJ_ANGLE_BASED,
+) -> dict[str, Any]:
+    """Compare methods and Asr schools from ``first`` to ``last`` inclusive.
+
+    The result is columnar: the columns every method shares appear once,
+    Asr once per school, and the twilight columns once per method.
+    """
+    ordinals = np.arange(first.toordinal(), last.toordinal() + 1, dtype=np.int64)
+    times = compute_method_matrix(
+        ordinals + JD_EPOCH,
+        latitude=latitude,
+        longitude=longitude,
+        utc_offset=utc_offsets(tz_name, longitude, ordinals),
+        methods=list(methods.values()),
+        asr_factors=[ASR_FACTORS[school] for school in schools.values()],
+        lat_adj_method=lat_adj_method,
+    )
+    minutes = {name: to_minutes(values) for name, values in times.items()}
+    return {
+        "Datum": [date.fromordinal(ordinal).strftime("%d-%m-%Y") for ordinal in ordinals.tolist()],
+        "Shuruq": minute_labels(minutes["Sunrise"]),
+        "Dhuhr": minute_labels(minutes["Dhuhr"]),
+        "Sunset": minute_labels(minutes["Sunset"]),
+        "Asr": {
+            school: minute_labels(row) for school, row in zip(schools, minutes["Asr"])
+        },
+        "methods": {
+            method: {column: minute_labels(minutes[column][row]) for column in METHOD_COLUMNS}
+            for row, method in enumerate(methods)
+        },
+    }
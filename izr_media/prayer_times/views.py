@@ -1,132 +1,101 @@
-from pathlib import Path
 from django.conf import settings
-import numpy as np
 from .old_calculation import OldPrayerTimesCalculator
-from .calculation import PrayerTimesCalculator
+from .calculation import (
+    CALCULATION_METHODS,
+    LAT_ADJ_METHODS,
+    MIDNIGHT_MODES,
+    SCHOOLS,
+    CalculationMethodError,
+)
+from .fallback import cache_ttl, fetch_annual_with_fallback, fetch_daily_with_fallback
+from .fourier_table import apply_fourier_override, has_smoothing
+import hashlib
 import json
-from django.http import JsonResponse
+from django.db.models import Max
+from django.http import (
+    HttpResponse,
+    HttpResponsePermanentRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
 from ..models import (
+    FourierFit,
     PrayerCalculationConfig,
+    PrayerConfig,
 )
 import redis
-import pandas as pd
-from datetime import datetime
-from .angles import get_regensburg_angles
+from datetime import date, datetime, timedelta
+from urllib.parse import urlencode
+from uuid import uuid4
+from .angles import dynamic_angles, get_regensburg_angles
+from .compact import HEADER, CompactTable, record_range
+from .countdown import (
+    INDEX_PRAYERS,
+    PrayerIndex,
+    build_prayer_index,
+    instant_payload,
+    iqama_label,
+    local_timezone,
+    merge_indexes,
+)
+from .hijri import (
+    HIJRI_MONTHS_AR,
+    HIJRI_MONTHS_EN,
+    apply_hijri,
+    hijri_month_range,
+    to_hijri,
+)
+from .ics import ICS_CONTENT_TYPE, iter_ics
+from .local_cache import local_cache
+from .local_calculation import LocalPrayerTimesCalculator, timezone_name
+from .periods import period_bounds, year_slices
+from .ramadan import FRIDAY, IQAMA_COLUMNS, RAMADAN, ramadan_timetable
+from .sunnah import sunnah_times
+from .table import build_method_comparison
+from .wire import STREAMED_FORMATS, WIRE_FORMATS, available_formats, encode_table
 from hijri_converter import Hijri, Gregorian
 
+SOURCE_HEADER = "X-Prayer-Times-Source"
+# Longest date range the compare-methods endpoint computes at once
+COMPARE_MAX_DAYS = 366
+# Query parameters accepted by the v2 GET API
+V2_PARAMS = (
+    "city", "lat", "lng", "method", "year", "period", "value", "from", "to",
+    "hijri", "lat_adj", "format",
+)
+
+
 def old_calculation(request):
+    """calculTimes/: this year's table, izr for Regensburg and mwl elsewhere.
+
+    Kept for existing clients, served by the same code path as the v2 API.
+    """
     if request.method == "POST":
         try:
             data = json.loads(request.body)
-
-            print(data)
-
             config = PrayerCalculationConfig.objects.latest("id")
-            calculation_type = config.calculation_type
             city_name = data.get("city_name", "Regensburg")
-            lat = data.get("lat", None)
-            lng = data.get("lng", None)
 
             if city_name.lower() == "regensburg":
-                method = 'izr'
+                method = "izr"
                 lat = config.default_latitude
                 lng = config.default_longitude
-                fajr_angle = config.fajr_angle
-                isha_angle = config.isha_angle
-                tune = True
-                tuning_params = {
-                    "imsak_tune": config.imsak_tune,
-                    "fajr_tune": config.fajr_tune,
-                    "sunrise_tune": config.sunrise_tune,
-                    "dhuhr_tune": config.dhuhr_tune,
-                    "asr_tune": config.asr_tune,
-                    "maghrib_tune": config.maghrib_tune,
-                    "sunset_tune": config.sunset_tune,
-                    "isha_tune": config.isha_tune,
-                    "midnight_tune": config.midnight_tune,
-                }
             else:
-                fajr_angle = None
-                isha_angle = None
-                tune = False
-                tuning_params = {}
                 method = "mwl"
+                lat = data.get("lat", None)
+                lng = data.get("lng", None)
 
-            # Validate required parameters
-            if lat is None or lng is None:
-                return JsonResponse(
-                    {"error": "Latitude and Longitude must be provided"}, status=400
-                )
-            # Initialize the calculator
-            calculator = PrayerTimesCalculator(
-                latitude=lat,
-                longitude=lng,
-                calculation_method=method,
-                # Only used for monthly/annual calculations
-                fajr_angle=fajr_angle,
-                isha_angle=isha_angle,
-                tune=tune,
-                **tuning_params,
-            )
-
-            current_year = datetime.now().year
-            print("current year :",current_year)
-            redis_client = settings.REDIS_CLIENT
-            redis_key = f"prayer_times:{city_name.lower()}:{current_year}:{calculation_type}"
-
-            
-            cached_data = redis_client.get(redis_key)
-            if cached_data:
-                data = json.loads(cached_data)
-                return JsonResponse(data, safe=False)
-
-            prayer_times = calculator.fetch_annual_prayer_times(
-                year=current_year, hijri=False
-            )
-            
-            # --- 📘 Read CSV data for smoothed Fajr/Isha for Regensburg ---
-            if city_name.lower() == 'regensburg' and  calculation_type != 'static':
-                csv_path = Path(__file__).parent / "prayer-times-isha-fajr-fourier-fit.csv"
-                prayer_df = pd.DataFrame(prayer_times)
-                prayer_df["Day"] = np.arange(1, len(prayer_df) + 1)
-                csv_df = pd.read_csv(csv_path,delimiter=";")
-                print(csv_df.columns.tolist())
-                print(csv_df.head(1))
-                if {"Day", "Fajr", "Isha"} <= set(csv_df.columns):
-                    print("here changin columns")
-
-                    merged = prayer_df.merge(
-                        csv_df[["Day", "Fajr", "Isha"]],
-                        on="Day",
-                        how="left",
-                        suffixes=('', '_csv')
-                    )
-
-                    # Replace Fajr and Isha with CSV values when available
-                    merged["Fajr"] = merged["Fajr_csv"].fillna(merged["Fajr"])
-                    merged["Isha"] = merged["Isha_csv"].fillna(merged["Isha"])
-
-                    # Drop helper columns
-                    merged = merged.drop(columns=["Fajr_csv", "Isha_csv"])
-
-                    prayer_times = merged.to_dict(orient="records")
-
-            # --- 🧠 Store to Redis until end of the year ---
-            end_of_year = datetime(current_year, 12, 31, 23, 59, 59)
-            seconds_to_expire = int((end_of_year - datetime.now()).total_seconds())
-            redis_client.setex(redis_key, seconds_to_expire, json.dumps(prayer_times))
-            print(f"✅ Cached prayer times in Redis (expires end of {current_year})")
-            
-            cached_data = redis_client.get(redis_key)
-            
-            if cached_data:
-                print("✅ Returning cached prayer times from Redis")
-                return JsonResponse(json.loads(cached_data), safe=False)
-            
-            return JsonResponse(prayer_times, safe=False)
+            source, table = query_prayer_times(config, city_name, lat, lng, method)
+            response = JsonResponse(table.records(config.correction_day), safe=False)
+            response[SOURCE_HEADER] = source
+            return response
 
         except KeyError as e:
             return JsonResponse({"error": f"Missing key: {str(e)}"}, status=400)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
         except Exception as e:
             return JsonResponse({"error": str(e)}, status=500)
     else:
@@ -140,7 +109,6 @@ def get_today_prayer_times(request):
     try:
         # --- Base setup ---
         today = datetime.now()
-        today_str = today.strftime("%Y-%m-%d")
         day_of_year = today.timetuple().tm_yday
         current_year = today.year
 
@@ -149,32 +117,29 @@ def get_today_prayer_times(request):
         calculation_type = config.calculation_type  # "static" or "dynamic"
 
         # --- Redis setup ---
-        redis_client = settings.REDIS_CLIENT
-        redis_key = f"new_prayer_times:regensburg:{current_year}:{calculation_type}:annual"
+        redis_key = annual_cache_key(
+            "regensburg", current_year, calculation_type, "izr",
+            config.default_latitude, config.default_longitude,
+        )
 
-        # --- Try reading cached annual data ---
-        cached_data = redis_client.get(redis_key)
-        if cached_data:
+        # --- Try reading today's row of the cached annual table ---
+        cached = cached_day(redis_key, day_of_year - 1)
+        if cached is not None and cached.first == today.date():
             print(f"✅ Found cached {calculation_type} prayer times for {current_year} in Redis")
 
-            # Parse and return today's record
-            cached = json.loads(cached_data)
-            today_entry = next((item for item in cached if item.get("Day") == day_of_year), None)
-
-            if today_entry:
-                today_entry["Jumaa"] = str(config.jumaa_time)[:5]
-                if config.ramadan == "on":
-                    today_entry["Tarawih"] = str(config.tarawih_time)[:5]
+            today_entry = cached.records(config.correction_day)[0]
+            today_entry["Jumaa"] = str(config.jumaa_time)[:5]
+            if config.ramadan == "on":
+                today_entry["Tarawih"] = str(config.tarawih_time)[:5]
 
-                response = JsonResponse(today_entry, safe=False)
-                response["Access-Control-Allow-Origin"] = "*"
-                return response
-            else:
-                print(f"⚠️ Day {day_of_year} not found in cache; recalculating below...")
+            response = JsonResponse(today_entry, safe=False)
+            response["Access-Control-Allow-Origin"] = "*"
+            response[SOURCE_HEADER] = "cache"
+            return response
 
         # --- No cache found → calculate manually ---
         if calculation_type == "dynamic":
-            angles = get_regensburg_angles()
+            angles = get_regensburg_angles(config, today.date())
             if not angles or "fajr_angle" not in angles or "isha_angle" not in angles:
                 print("⚠️ get_regensburg_angles() returned invalid data, using static fallback")
                 fajr_angle = config.fajr_angle
@@ -186,8 +151,8 @@ def get_today_prayer_times(request):
             fajr_angle = config.fajr_angle
             isha_angle = config.isha_angle
 
-        # --- Initialize calculator ---
-        calculator = PrayerTimesCalculator(
+        # --- Calculator settings ---
+        calculator_kwargs = dict(
             latitude=config.default_latitude,
             longitude=config.default_longitude,
             calculation_method="izr",
@@ -205,8 +170,20 @@ def get_today_prayer_times(request):
             midnight_tune=config.midnight_tune,
         )
 
-        # --- Fetch and format daily times ---
-        prayer_times = calculator.fetch_daily_prayer_times(today_str)
+        # --- Fetch and format daily times (upstream → local → CSV) ---
+        source, prayer_times = fetch_daily_with_fallback(
+            calculator_kwargs,
+            today.date(),
+            regensburg=True,
+            angle_series=dynamic_angles(
+                "regensburg", config.default_latitude, config.default_longitude
+            )
+            if calculation_type == "dynamic"
+            else None,
+        )
+        apply_hijri([prayer_times], config.correction_day)
+        # Same shape as a row of the cached table
+        prayer_times["Day"] = day_of_year
         prayer_times["Jumaa"] = str(config.jumaa_time)[:5]
         if config.ramadan == "on":
             prayer_times["Tarawih"] = str(config.tarawih_time)[:5]
@@ -214,6 +191,7 @@ def get_today_prayer_times(request):
         # --- Return final response ---
         response = JsonResponse(prayer_times, safe=False)
         response["Access-Control-Allow-Origin"] = "*"
+        response[SOURCE_HEADER] = source
         return response
 
     except Exception as e:
@@ -222,7 +200,447 @@ def get_today_prayer_times(request):
 
 
 
+def annual_cache_key(city_lower, year, calculation_type, method, lat, lng, hijri=False, lat_adj_method=""):
+    """Redis key of an annual table; derived data is stored under it + ":<suffix>".
+
+    The method and the coordinates (to 4 decimals, about 10 m) are part of
+    the key, so overriding them never serves or overwrites another table.
+    """
+    redis_key = (
+        f"new_prayer_times:{city_lower}:{year}:{calculation_type}:annual"
+        f":{method.lower()}:{float(lat):.4f}:{float(lng):.4f}"
+    )
+    if hijri:
+        redis_key += ":hijri"
+    if lat_adj_method:
+        redis_key += f":{lat_adj_method.lower().replace(' ', '-')}"
+    return redis_key
+
+
+def cached_table(redis_key):
+    """Return the packed :class:`CompactTable` under ``redis_key``, or None.
+
+    Served from this worker's L1 cache when it has the table.
+    """
+    cache = local_cache()
+    table = cache.get(redis_key)
+    if table is not None:
+        return table
+    generation = cache.generation
+    blob = settings.REDIS_BINARY_CLIENT.get(redis_key)
+    if not blob:
+        return None
+    try:
+        table = CompactTable.unpack(blob)
+    except ValueError:
+        # Written by an older version (JSON rows), rebuilt below
+        return None
+    cache.set(redis_key, table, generation=generation)
+    return table
+
+
+def cached_day(redis_key, row):
+    """Return row ``row`` of the packed table under ``redis_key`` as a one-day table, or None.
+
+    Reads the header and that day's record only, in one round trip, unless
+    the L1 cache has the day or the whole table.
+    """
+    cache = local_cache()
+    table = cache.get(redis_key)
+    if table is not None:
+        return table.rows(row, row + 1) if row < len(table) else None
+    day = cache.get((redis_key, row))
+    if day is not None:
+        return day
+    generation = cache.generation
+    pipe = settings.REDIS_BINARY_CLIENT.pipeline(transaction=False)
+    pipe.getrange(redis_key, 0, HEADER.size - 1)
+    pipe.getrange(redis_key, *record_range(row))
+    header, record = pipe.execute()
+    try:
+        day = CompactTable.unpack_record(header, row, record)
+    except ValueError:
+        return None
+    cache.set((redis_key, row), day, generation=generation)
+    return day
+
+
+def annual_prayer_times(
+    config, city_name, lat, lng, method="izr", year=None, hijri=False, lat_adj_method=""
+):
+    """Return ``(source, annual CompactTable)``, from Redis or computed and cached.
+
+    ``source`` is "cache" when the table came from Redis. The table has no
+    display strings; format it with ``records(config.correction_day)``.
+    """
+    city_lower = city_name.lower()
+    calculation_type = config.calculation_type  # "static" or "dynamic"
+
+    # ─── Redis setup ──────────────────────────────────────────
+    current_year = datetime.now().year
+    year = year or current_year
+    redis_key = annual_cache_key(city_lower, year, calculation_type, method, lat, lng, hijri, lat_adj_method)
+    generation = local_cache().generation
+
+    # ─── Try returning cached data ─────────────────────────────
+    cached = cached_table(redis_key)
+    if cached is not None:
+        print(f"✅ Returning cached {calculation_type} data for {city_name} ({year})")
+        return "cache", cached
+
+    # ─── Build calculator configuration ───────────────────────
+    tune = True if city_lower == "regensburg" else False
+    tuning_params = {
+        "imsak_tune": config.imsak_tune,
+        "fajr_tune": config.fajr_tune,
+        "sunrise_tune": config.sunrise_tune,
+        "dhuhr_tune": config.dhuhr_tune,
+        "asr_tune": config.asr_tune,
+        "maghrib_tune": config.maghrib_tune,
+        "sunset_tune": config.sunset_tune,
+        "isha_tune": config.isha_tune,
+        "midnight_tune": config.midnight_tune,
+    }
+
+    # ─── Calculator settings ──────────────────────────────────
+    calculator_kwargs = dict(
+        latitude=lat,
+        longitude=lng,
+        calculation_method=method,
+        fajr_angle=config.fajr_angle,   # always from config
+        isha_angle=config.isha_angle,   # always from config
+        latitudeAdjustmentMethod=lat_adj_method,
+        tune=tune,
+        **tuning_params,
+    )
+
+    # ─── Compute annual prayer times (upstream → local → CSV) ──
+    # Only the custom (izr) angles follow the season, named methods keep theirs
+    angle_series = (
+        dynamic_angles(city_lower, lat, lng)
+        if calculation_type == "dynamic" and method.lower() == "izr"
+        else None
+    )
+    source, prayer_times = fetch_annual_with_fallback(
+        calculator_kwargs,
+        year=year,
+        hijri=hijri,
+        regensburg=city_lower == "regensburg",
+        angle_series=angle_series,
+    )
+
+    # ─── Minutes per prayer; labels are only made at the response edge ──
+    table = CompactTable.from_records(prayer_times)
+
+    # ─── Apply Fourier smoothing for dynamic where a fit exists ──
+    if calculation_type == "dynamic" and has_smoothing(city_lower):
+        table = apply_fourier_override(table, city_lower)
+
+    # ─── Cache annual result ──────────────────────────────────
+    # Not if the config or a fit changed while it was computed (stale input)
+    if local_cache().generation != generation:
+        print(f"⚠️ Caches were invalidated meanwhile, not caching {redis_key}")
+        return source, table
+    ttl = cache_ttl(source, lat, angle_series is not None)
+    settings.REDIS_BINARY_CLIENT.setex(redis_key, ttl, table.pack())
+    local_cache().set(redis_key, table, ttl, generation)
+    print(f"✅ Cached annual {source} prayer times in Redis ({redis_key})")
+
+    return source, table
+
+
+def range_prayer_times(config, city_name, lat, lng, first, last, method="izr", lat_adj_method=""):
+    """Return ``(source, table)`` of first..last, sliced out of the annual table(s).
+
+    ``source`` is "mixed" when the years came from different sources.
+    """
+    parts = []
+    sources = set()
+    for year, days in year_slices(first, last):
+        source, table = annual_prayer_times(
+            config, city_name, lat, lng, method, year, lat_adj_method=lat_adj_method
+        )
+        sources.add(source)
+        parts.append(table.rows(days.start, days.stop))
+    return (sources.pop() if len(sources) == 1 else "mixed"), CompactTable.concat(parts)
+
+
+def query_prayer_times(
+    config, city_name, lat, lng, method="izr", period="annual", value=None,
+    date_from=None, date_to=None, hijri=False, lat_adj_method="",
+):
+    """Return ``(source, CompactTable)`` of a prayer times query.
+
+    The one code path behind the v2 GET API and the POST endpoints. Raises
+    ValueError (or CalculationMethodError) on invalid parameters.
+    """
+    if lat is None or lng is None:
+        raise ValueError("Latitude and Longitude must be provided")
+    if period != "annual" and hijri:
+        raise ValueError("hijri is only supported with period='annual'")
+    try:
+        first, last = period_bounds(period, value, date_from, date_to)
+    except ValueError as e:
+        raise ValueError(f"Invalid period: {str(e)}") from e
+
+    # ─── Annual table(s) (cache → upstream → local → CSV), sliced ──
+    if period == "annual":
+        return annual_prayer_times(
+            config, city_name, lat, lng, method, value, hijri, lat_adj_method
+        )
+    return range_prayer_times(config, city_name, lat, lng, first, last, method, lat_adj_method)
+
+
+def accept_quality(media_type):
+    """The q value of an Accept entry, 1 when missing or unreadable."""
+    try:
+        return float(media_type.params.get("q", 1))
+    except ValueError:
+        return 1.0
+
+
+def negotiated_format(request, requested=None):
+    """``requested`` (the format parameter) or the first format the Accept header takes."""
+    if requested:
+        return requested.lower()
+    formats = available_formats()
+    # Django keeps the header's order; most preferred first, q=0 means "not this"
+    accepted_types = sorted(request.accepted_types, key=accept_quality, reverse=True)
+    for accepted in accepted_types:
+        if accept_quality(accepted) <= 0:
+            continue
+        for wire_format in formats:
+            if accepted.match(WIRE_FORMATS[wire_format].split(";")[0]):
+                return wire_format
+    return "json"
+
+
+def table_response(config, digest, wire_format, load, redis_keys):
+    """Response with the table of ``load()`` encoded in ``wire_format``.
+
+    The encoding is kept in Redis under ``digest`` (which must cover the config
+    version, the query and the format) as long as the annual tables under
+    ``redis_keys`` live, so each variant is encoded once.
+    """
+    redis_client = settings.REDIS_BINARY_CLIENT
+    redis_key = f"wire:{digest}"
+    content_type = WIRE_FORMATS[wire_format]
+    cache = local_cache()
+    generation = cache.generation
+    encoded = cache.get(redis_key)
+    if encoded is None:
+        encoded = redis_client.get(redis_key)
+        if encoded is not None:
+            cache.set(redis_key, encoded, generation=generation)
+    if encoded is not None:
+        response = HttpResponse(encoded, content_type=content_type)
+        response[SOURCE_HEADER] = "cache"
+        return response
+
+    source, table = load()
+    ttl = min(redis_client.ttl(key) for key in redis_keys)
+    chunks = encode_table(table, wire_format, config.correction_day)
+    if wire_format in STREAMED_FORMATS:
+        response = StreamingHttpResponse(
+            cached_stream(redis_client, redis_key, chunks, ttl), content_type=content_type
+        )
+        response["Content-Disposition"] = f'inline; filename="prayer-times.{wire_format}"'
+    else:
+        body = b"".join(chunks)
+        if ttl > 0:
+            redis_client.setex(redis_key, ttl, body)
+            cache.set(redis_key, body, ttl, generation)
+        response = HttpResponse(body, content_type=content_type)
+    response[SOURCE_HEADER] = source
+    return response
+
+
+def query_cache_keys(city_name, calculation_type, method, lat, lng, first, last, period, hijri, lat_adj_method):
+    """Redis keys of the annual tables a query is served from."""
+    years = [first.year] if period == "annual" else range(first.year, last.year + 1)
+    return [
+        annual_cache_key(city_name.lower(), year, calculation_type, method, lat, lng, hijri, lat_adj_method)
+        for year in years
+    ]
+
+
 def get_prayer_times(request):
+    """POST variant of the v2 API, kept for existing clients."""
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        config = PrayerCalculationConfig.objects.latest("id")
+        params = dict(
+            city_name=data.get("city_name", "Regensburg"),
+            lat=data.get("lat", config.default_latitude),
+            lng=data.get("lng", config.default_longitude),
+            method=data.get("method", "izr"),
+            period=data.get("period", "annual"),  # annual, day, week, month or range
+            value=data.get("value"),              # year, YYYY-MM-DD or YYYY-MM
+            date_from=data.get("from"),
+            date_to=data.get("to"),
+            hijri=data.get("hijri", False),
+            lat_adj_method=data.get("lat_adj_method", ""),  # e.g. "one seventh"
+        )
+        # json (rows), columns, csv or msgpack; from "format" or the Accept header
+        wire_format = negotiated_format(request, data.get("format"))
+        if wire_format not in available_formats():
+            raise ValueError(f"format must be one of {', '.join(available_formats())}")
+        first, last = period_bounds(params["period"], params["value"], params["date_from"], params["date_to"])
+
+        # ─── Encoded once per config version, query and format ─────
+        version, _ = config_version(config)
+        variant = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.md5(f"{version}:{variant}:{first}:{last}:{wire_format}".encode()).hexdigest()
+        response = table_response(
+            config,
+            digest,
+            wire_format,
+            lambda: query_prayer_times(config, **params),
+            query_cache_keys(
+                params["city_name"], config.calculation_type, params["method"], params["lat"], params["lng"],
+                first, last, params["period"], params["hijri"], params["lat_adj_method"],
+            ),
+        )
+        if not data.get("format"):
+            patch_vary_headers(response, ("Accept",))
+        return response
+
+    except KeyError as e:
+        return JsonResponse({"error": f"Missing key: {str(e)}"}, status=400)
+    except (ValueError, CalculationMethodError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except Exception as e:
+        print("❌ Error in get_prayer_times:", e)
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+def canonical_query(params):
+    """Validate v2 query parameters and return them normalized, keys sorted.
+
+    Defaults are left out, so equivalent requests share one URL (and one
+    entry in every cache on the way).
+    """
+    unknown = set(params) - set(V2_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+    query = {}
+    for key in V2_PARAMS:
+        raw = params.get(key, "").strip()
+        if not raw:
+            continue
+        if key in ("lat", "lng"):
+            query[key] = f"{float(raw):.4f}".rstrip("0").rstrip(".")
+        elif key == "year":
+            query[key] = str(int(raw))
+        elif key == "hijri":
+            if raw.lower() in ("1", "true", "yes"):
+                query[key] = "1"
+        elif key in ("city", "method", "period", "lat_adj", "format"):
+            query[key] = raw.lower()
+        else:
+            query[key] = raw
+    if query.get("method", "izr") not in CALCULATION_METHODS:
+        raise CalculationMethodError("method", list(CALCULATION_METHODS))
+    if query.get("lat_adj", "") and query["lat_adj"] not in LAT_ADJ_METHODS:
+        raise CalculationMethodError("lat_adj", list(LAT_ADJ_METHODS))
+    if query.get("format", "json") not in available_formats():
+        raise ValueError(f"format must be one of {', '.join(available_formats())}")
+    # An explicit format stays in the URL, without one the Accept header decides
+    for key, default in (("city", "regensburg"), ("method", "izr"), ("period", "annual")):
+        if query.get(key) == default:
+            del query[key]
+    return dict(sorted(query.items()))
+
+
+def get_prayer_times_v2(request):
+    """Cacheable GET API over the same code path as the POST endpoints.
+
+    Non-canonical URLs are redirected to their canonical form; responses
+    carry an ETag of the config version and the query.
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    try:
+        config = PrayerCalculationConfig.objects.latest("id")
+        query = canonical_query(request.GET)
+        canonical = urlencode(query)
+        if request.GET.urlencode() != canonical:
+            response = HttpResponsePermanentRedirect(
+                f"{request.path}?{canonical}" if canonical else request.path
+            )
+            response["Cache-Control"] = "public, max-age=86400"
+            return response
+
+        period = query.get("period", "annual")
+        value = int(query["year"]) if period == "annual" and "year" in query else query.get("value")
+        first, last = period_bounds(period, value, query.get("from"), query.get("to"))
+
+        wire_format = negotiated_format(request, query.get("format"))
+
+        # ─── Revalidation against the config version ──────────────
+        version, modified = config_version(config)
+        digest = hashlib.md5(f"{version}:{canonical}:{first}:{last}:{wire_format}".encode()).hexdigest()
+        etag = f'"{digest}"'
+        last_modified = modified.timestamp()
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+        if response is None:
+            city_name = query.get("city", "regensburg")
+            hijri = query.get("hijri") == "1"
+            lat_adj_method = query.get("lat_adj", "")
+            lat = float(query.get("lat", config.default_latitude))
+            lng = float(query.get("lng", config.default_longitude))
+            method = query.get("method", "izr")
+            response = table_response(
+                config,
+                digest,
+                wire_format,
+                lambda: query_prayer_times(
+                    config,
+                    city_name=city_name,
+                    lat=lat,
+                    lng=lng,
+                    method=method,
+                    period=period,
+                    value=value,
+                    date_from=query.get("from"),
+                    date_to=query.get("to"),
+                    hijri=hijri,
+                    lat_adj_method=lat_adj_method,
+                ),
+                query_cache_keys(
+                    city_name, config.calculation_type, method, lat, lng,
+                    first, last, period, hijri, lat_adj_method,
+                ),
+            )
+
+        # ─── Without an explicit date the answer changes at midnight ──
+        max_age = settings.PRAYER_TIMES_HTTP_MAX_AGE
+        if not ({"year", "value", "from"} & set(query)):
+            now = datetime.now()
+            midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+            max_age = min(max_age, max(int((midnight - now).total_seconds()), 1))
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = f"public, max-age={max_age}"
+        patch_vary_headers(response, ("Accept-Encoding",) if "format" in query else ("Accept", "Accept-Encoding"))
+        response["Access-Control-Allow-Origin"] = "*"
+        return response
+
+    except (ValueError, CalculationMethodError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except Exception as e:
+        print("❌ Error in get_prayer_times_v2:", e)
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+def get_sunnah_times(request):
+    """Imsak, Sunset, Midnight, last third of the night and Duha from the annual table."""
     if request.method != "POST":
         return JsonResponse({"error": "Invalid request method"}, status=405)
 
@@ -232,95 +650,404 @@ def get_prayer_times(request):
 
         # ─── Extract parameters ───────────────────────────────────
         city_name = data.get("city_name", "Regensburg")
-        city_lower = city_name.lower()
         lat = data.get("lat", config.default_latitude)
         lng = data.get("lng", config.default_longitude)
         method = data.get("method", "izr")
-        period = data.get("period", "annual")  # only annual is supported
-        value = data.get("value")              # year
-        hijri = data.get("hijri", False)
-        calculation_type = config.calculation_type  # "static" or "dynamic"
+        midnight = data.get("midnight", "standard").lower()
+        day = datetime.strptime(data["date"], "%Y-%m-%d").date() if data.get("date") else None
+        year = day.year if day else data.get("value")
 
         # ─── Validate inputs ──────────────────────────────────────
         if lat is None or lng is None:
             return JsonResponse(
                 {"error": "Latitude and Longitude must be provided"}, status=400
             )
-        if period != "annual":
-            return JsonResponse(
-                {"error": "Only 'annual' calculations are supported. Use period='annual'."},
-                status=400,
-            )
+        if midnight not in MIDNIGHT_MODES:
+            raise CalculationMethodError(midnight, list(MIDNIGHT_MODES))
+
+        # ─── Annual table(s) (cache → upstream → local → CSV) ─────
+        # Plus the following day, whose morning ends the last night (also
+        # across the year end)
+        first = day or date(int(year or datetime.now().year), 1, 1)
+        last = day or date(first.year, 12, 31)
+        source, table = range_prayer_times(
+            config, city_name, lat, lng, first, last + timedelta(days=1), method
+        )
+
+        # ─── Derive the sunnah times column-wise ──────────────────
+        tuned = city_name.lower() == "regensburg"
+        sunnah = sunnah_times(
+            table,
+            midnight=midnight,
+            imsak_offset=(config.imsak_tune - config.fajr_tune if tuned else 0) - 10,
+            sunset_offset=config.sunset_tune - config.maghrib_tune if tuned else 0,
+        )
+        sunnah = sunnah[0] if day else sunnah[:-1]
+
+        response = JsonResponse(sunnah, safe=False)
+        response[SOURCE_HEADER] = source
+        return response
+
+    except (KeyError, ValueError) as e:
+        return JsonResponse({"error": f"Invalid parameter: {str(e)}"}, status=400)
+    except CalculationMethodError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except Exception as e:
+        print("❌ Error in get_sunnah_times:", e)
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+def current_hijri_month(config):
+    """Return the (year, month) of today's Hijri date, with correction_day."""
+    today = datetime.now().date()
+    years, months, _ = to_hijri([(today + timedelta(days=config.correction_day)).toordinal()])
+    return int(years[0]), int(months[0])
+
+
+def hijri_month_records(config, hijri_year, month):
+    """Return ``(source, first, last, table)`` of a Hijri month of Regensburg.
+
+    The Gregorian range comes from the precomputed Hijri table, the rows from
+    the cached annual table(s) it falls into.
+    """
+    first, last = hijri_month_range(hijri_year, month, config.correction_day)
+    source, table = range_prayer_times(
+        config, "Regensburg", config.default_latitude, config.default_longitude, first, last
+    )
+    return source, first, last, table
 
-        # ─── Redis setup ──────────────────────────────────────────
-        redis_client = settings.REDIS_CLIENT
-        current_year = datetime.now().year
-        year = value or current_year
-        redis_key = f"new_prayer_times:{city_lower}:{year}:{calculation_type}:annual"
 
-        # ─── Try returning cached data ─────────────────────────────
+def get_hijri_month(request):
+    """Prayer times of one Hijri month (default the current one) for Regensburg."""
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    try:
+        config = PrayerCalculationConfig.objects.latest("id")
+        hijri_year, month = current_hijri_month(config)
+        hijri_year = int(request.GET.get("year", hijri_year))
+        month = int(request.GET.get("month", month))
+        if not 1 <= month <= 12:
+            raise ValueError("month must be between 1 and 12")
+
+        source, first, last, table = hijri_month_records(config, hijri_year, month)
+        response = JsonResponse(
+            {
+                "hijri_year": hijri_year,
+                "month": month,
+                "month_name": HIJRI_MONTHS_EN[month - 1],
+                "month_name_ar": HIJRI_MONTHS_AR[month - 1],
+                "start": first.isoformat(),
+                "end": last.isoformat(),
+                "days": table.records(config.correction_day),
+            }
+        )
+        response["Access-Control-Allow-Origin"] = "*"
+        response[SOURCE_HEADER] = source
+        return response
+
+    except (ValueError, OverflowError) as e:
+        return JsonResponse({"error": f"Invalid parameter: {str(e)}"}, status=400)
+    except Exception as e:
+        print("❌ Error in get_hijri_month:", e)
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+def get_ramadan_timetable(request):
+    """Ramadan days of Regensburg with Imsak, Iftar, Tarawih and iqama times."""
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    try:
+        config = PrayerCalculationConfig.objects.latest("id")
+        calculation_type = config.calculation_type
+
+        # ─── Hijri year: requested, or the next Ramadan not yet over ──
+        if request.GET.get("year"):
+            hijri_year = int(request.GET["year"])
+        else:
+            today = datetime.now().date()
+            hijri_year, _ = current_hijri_month(config)
+            if hijri_month_range(hijri_year, RAMADAN, config.correction_day)[1] < today:
+                hijri_year += 1
+
+        # ─── Try returning cached timetable ───────────────────────
+        redis_client = settings.REDIS_CLIENT
+        redis_key = f"ramadan:regensburg:{hijri_year}:{calculation_type}"
         cached_data = redis_client.get(redis_key)
         if cached_data:
-            print(f"✅ Returning cached {calculation_type} data for {city_name} ({year})")
-            return JsonResponse(json.loads(cached_data), safe=False)
-
-        # ─── Build calculator configuration ───────────────────────
-        tune = True if city_lower == "regensburg" else False
-        tuning_params = {
-            "imsak_tune": config.imsak_tune,
-            "fajr_tune": config.fajr_tune,
-            "sunrise_tune": config.sunrise_tune,
-            "dhuhr_tune": config.dhuhr_tune,
-            "asr_tune": config.asr_tune,
-            "maghrib_tune": config.maghrib_tune,
-            "sunset_tune": config.sunset_tune,
-            "isha_tune": config.isha_tune,
-            "midnight_tune": config.midnight_tune,
+            response = JsonResponse(json.loads(cached_data), safe=False)
+            response["Access-Control-Allow-Origin"] = "*"
+            response[SOURCE_HEADER] = "cache"
+            return response
+
+        # ─── Slice the month out of the annual table(s) ───────────
+        source, first, last, month = hijri_month_records(config, hijri_year, RAMADAN)
+
+        timetable = ramadan_timetable(
+            month,
+            tarawih_time=config.tarawih_time,
+            jumaa_time=config.jumaa_time,
+            iqama_config=PrayerConfig.objects.filter(enabled=True).first(),
+            imsak_offset=config.imsak_tune - config.fajr_tune - 10,
+            correction_day=config.correction_day,
+        )
+        payload = {
+            "hijri_year": hijri_year,
+            "start": first.isoformat(),
+            "end": last.isoformat(),
+            "days": timetable,
         }
 
-        # ─── Initialize calculator ────────────────────────────────
-        calculator = PrayerTimesCalculator(
-            latitude=lat,
-            longitude=lng,
-            calculation_method=method,
-            fajr_angle=config.fajr_angle,   # always from config
-            isha_angle=config.isha_angle,   # always from config
-            tune=tune,
-            **tuning_params,
+        # ─── Cache like a fresh table; one cut from cached tables is rebuilt soon ──
+        if source == "cache":
+            ttl = settings.PRAYER_TIMES_FALLBACK_TTL
+        else:
+            ttl = cache_ttl(source, config.default_latitude, config.calculation_type == "dynamic")
+        redis_client.setex(redis_key, ttl, json.dumps(payload))
+        print(f"✅ Cached Ramadan {hijri_year} timetable in Redis ({redis_key})")
+
+        response = JsonResponse(payload, safe=False)
+        response["Access-Control-Allow-Origin"] = "*"
+        response[SOURCE_HEADER] = source
+        return response
+
+    except (KeyError, ValueError, OverflowError) as e:
+        return JsonResponse({"error": f"Invalid parameter: {str(e)}"}, status=400)
+    except Exception as e:
+        print("❌ Error in get_ramadan_timetable:", e)
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+def prayer_index(config, year, city_name="Regensburg", lat=None, lng=None):
+    """Return the :class:`PrayerIndex` of a city's annual table of ``year``.
+
+    Stored next to the table under its key + ":index", with the table's
+    remaining lifetime so both are dropped together.
+    """
+    lat = config.default_latitude if lat is None else lat
+    lng = config.default_longitude if lng is None else lng
+    redis_client = settings.REDIS_CLIENT
+    annual_key = annual_cache_key(city_name.lower(), year, config.calculation_type, "izr", lat, lng)
+    cached_index = redis_client.get(f"{annual_key}:index")
+    if cached_index:
+        return PrayerIndex.from_json(cached_index)
+
+    _, table = annual_prayer_times(config, city_name, lat, lng, "izr", year)
+    index = build_prayer_index(table, timezone_name(lat, lng), lng)
+    ttl = redis_client.ttl(annual_key)
+    if ttl and ttl > 0:
+        redis_client.setex(f"{annual_key}:index", ttl, index.to_json())
+    return index
+
+
+def get_next_prayer(request):
+    """Current and next prayer of Regensburg with the seconds until the next one.
+
+    Cacheable until the next prayer starts.
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    try:
+        config = PrayerCalculationConfig.objects.latest("id")
+        lat, lng = config.default_latitude, config.default_longitude
+        tz = local_timezone(timezone_name(lat, lng), lng)
+        now = datetime.now(tz)
+
+        # ─── Binary search in the year's instants, the neighbour year at the edges ──
+        index = prayer_index(config, now.year)
+        position = index.locate(now.timestamp())
+        if position < 0:
+            index = merge_indexes(prayer_index(config, now.year - 1), index)
+            position = index.locate(now.timestamp())
+        if position + 1 >= len(index.instants):
+            index = merge_indexes(index, prayer_index(config, now.year + 1))
+
+        current = instant_payload(index, position, tz)
+        upcoming = instant_payload(index, position + 1, tz)
+        remaining = max(int(upcoming["timestamp"] - now.timestamp()), 1)
+
+        # ─── Iqama of the next prayer, Jumaa instead of Dhuhr on Fridays ──
+        iqama_config = PrayerConfig.objects.filter(enabled=True).first()
+        field = IQAMA_COLUMNS.get(upcoming["prayer"])
+        if iqama_config is not None and field:
+            upcoming["iqama"] = iqama_label(upcoming["time"], getattr(iqama_config, field))
+        if upcoming["prayer"] == "Dhuhr" and date.fromisoformat(upcoming["date"]).weekday() == FRIDAY:
+            upcoming["jumaa"] = str(config.jumaa_time)[:5]
+
+        response = JsonResponse(
+            {
+                "now": now.isoformat(timespec="seconds"),
+                "current": current,
+                "next": upcoming,
+                "seconds_remaining": remaining,
+            }
         )
+        response["Access-Control-Allow-Origin"] = "*"
+        response["Cache-Control"] = f"public, max-age={remaining}"
+        return response
 
-        # ─── Compute annual prayer times ───────────────────────────
-        prayer_times = calculator.fetch_annual_prayer_times(year=year, hijri=hijri)
-
-        # ─── Apply Fourier smoothing only for Regensburg dynamic ──
-        if city_lower == "regensburg" and calculation_type == "dynamic":
-            csv_path = Path(__file__).parent / "prayer-times-isha-fajr-fourier-fit.csv"
-            prayer_df = pd.DataFrame(prayer_times)
-            prayer_df["Day"] = np.arange(1, len(prayer_df) + 1)
-            csv_df = pd.read_csv(csv_path, delimiter=";")
-            if {"Day", "Fajr", "Isha"} <= set(csv_df.columns):
-                merged = prayer_df.merge(
-                    csv_df[["Day", "Fajr", "Isha"]],
-                    on="Day",
-                    how="left",
-                    suffixes=('', '_csv')
+    except Exception as e:
+        print("❌ Error in get_next_prayer:", e)
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+def config_version(config):
+    """Return ``(version, last_modified)`` of what the cached tables are built from."""
+    modified = config.updated_at
+    fitted = FourierFit.objects.aggregate(latest=Max("fitted_at"))["latest"]
+    if fitted and fitted > modified:
+        modified = fitted
+    return f"{config.pk}-{int(modified.timestamp())}", modified
+
+
+def cached_stream(redis_client, redis_key, chunks, ttl):
+    """Yield ``chunks`` while appending them to Redis, stored as ``redis_key`` once complete.
+
+    A half-written blob of an aborted download expires on its own.
+    """
+    partial = f"{redis_key}:partial:{uuid4().hex}"
+    for chunk in chunks:
+        redis_client.append(partial, chunk)
+        redis_client.expire(partial, 300)
+        yield chunk
+    if ttl and ttl > 0:
+        redis_client.rename(partial, redis_key)
+        redis_client.expire(redis_key, ttl)
+        print(f"✅ Cached streamed response in Redis ({redis_key})")
+    else:
+        redis_client.delete(partial)
+
+
+def get_prayer_calendar(request):
+    """iCalendar feed of a year of prayer times, with optional reminder alarms.
+
+    ``prayers`` is a comma separated selection (default the five prayers),
+    ``alarm`` the reminder in minutes before each prayer.
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    try:
+        config = PrayerCalculationConfig.objects.latest("id")
+        city_name = request.GET.get("city", "Regensburg")
+        lat = float(request.GET.get("lat", config.default_latitude))
+        lng = float(request.GET.get("lng", config.default_longitude))
+        year = int(request.GET.get("year", datetime.now().year))
+        selection = request.GET.get("prayers", "fajr,dhuhr,asr,maghrib,isha").lower().split(",")
+        prayers = [prayer for prayer in INDEX_PRAYERS if prayer.lower() in selection]
+        if len(prayers) != len(set(selection)):
+            raise ValueError(f"prayers must be chosen from {', '.join(INDEX_PRAYERS)}")
+        alarm = int(request.GET["alarm"]) if request.GET.get("alarm") else None
+        if alarm is not None and not 0 <= alarm <= 1440:
+            raise ValueError("alarm must be between 0 and 1440 minutes")
+
+        # ─── Revalidation: same config version and selection → 304 ──
+        version, modified = config_version(config)
+        variant = f"{version}:{city_name.lower()}:{lat:.6f}:{lng:.6f}:{year}:{','.join(prayers)}:{alarm}"
+        digest = hashlib.md5(variant.encode()).hexdigest()
+        etag = f'"{digest}"'
+        last_modified = modified.timestamp()
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+        if response is None:
+            # ─── Prebuilt blob, or stream while building it ───────────
+            redis_client = settings.REDIS_CLIENT
+            redis_key = f"ics:{city_name.lower()}:{year}:{config.calculation_type}:{digest}"
+            cached_feed = redis_client.get(redis_key)
+            if cached_feed:
+                response = HttpResponse(cached_feed, content_type=ICS_CONTENT_TYPE)
+                response[SOURCE_HEADER] = "cache"
+            else:
+                index = prayer_index(config, year, city_name, lat, lng)
+                ttl = redis_client.ttl(
+                    annual_cache_key(city_name.lower(), year, config.calculation_type, "izr", lat, lng)
                 )
-                merged["Fajr"] = merged["Fajr_csv"].fillna(merged["Fajr"])
-                merged["Isha"] = merged["Isha_csv"].fillna(merged["Isha"])
-                merged = merged.drop(columns=["Fajr_csv", "Isha_csv"])
-                prayer_times = merged.to_dict(orient="records")
+                chunks = iter_ics(
+                    index,
+                    calendar_name=f"Gebetszeiten {city_name} {year}",
+                    uid_prefix=f"{city_name.lower()}-{digest[:8]}",
+                    prayers=prayers,
+                    alarm_minutes=alarm,
+                    stamp=modified,
+                )
+                response = StreamingHttpResponse(
+                    cached_stream(redis_client, redis_key, chunks, ttl),
+                    content_type=ICS_CONTENT_TYPE,
+                )
+            response["Content-Disposition"] = f'inline; filename="prayer-times-{year}.ics"'
 
-        # ─── Cache annual result ──────────────────────────────────
-        end_of_year = datetime(current_year, 12, 31, 23, 59, 59)
-        ttl = int((end_of_year - datetime.now()).total_seconds())
-        redis_client.setex(redis_key, ttl, json.dumps(prayer_times))
-        print(f"✅ Cached annual prayer times in Redis ({redis_key})")
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = "public, max-age=3600"
+        response["Access-Control-Allow-Origin"] = "*"
+        return response
 
-        # ─── Return response ───────────────────────────────────────
-        return JsonResponse(prayer_times, safe=False)
+    except ValueError as e:
+        return JsonResponse({"error": f"Invalid parameter: {str(e)}"}, status=400)
+    except Exception as e:
+        print("❌ Error in get_prayer_calendar:", e)
+        return JsonResponse({"error": str(e)}, status=500)
 
-    except KeyError as e:
-        return JsonResponse({"error": f"Missing key: {str(e)}"}, status=400)
+
+def get_compare_methods(request):
+    """All calculation methods and both Asr schools for one location and date range."""
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        config = PrayerCalculationConfig.objects.latest("id")
+
+        # ─── Extract parameters ───────────────────────────────────
+        lat = float(data.get("lat", config.default_latitude))
+        lng = float(data.get("lng", config.default_longitude))
+        today = datetime.now().date()
+        start = datetime.strptime(data["start"], "%Y-%m-%d").date() if data.get("start") else today
+        end = datetime.strptime(data["end"], "%Y-%m-%d").date() if data.get("end") else start
+        lat_adj_method = data.get("lat_adj_method", "angle based")
+
+        # ─── Validate inputs ──────────────────────────────────────
+        if end < start or (end - start).days >= COMPARE_MAX_DAYS:
+            return JsonResponse(
+                {"error": f"'end' must be on or after 'start' and at most {COMPARE_MAX_DAYS} days later"},
+                status=400,
+            )
+        if lat_adj_method.lower() not in LAT_ADJ_METHODS:
+            raise CalculationMethodError(lat_adj_method, list(LAT_ADJ_METHODS))
+
+        # ─── Method parameters, izr with the configured angles ────
+        methods = {
+            name: LocalPrayerTimesCalculator(
+                latitude=lat,
+                longitude=lng,
+                calculation_method=name,
+                fajr_angle=config.fajr_angle,
+                isha_angle=config.isha_angle,
+            )._method_params()
+            for name in CALCULATION_METHODS
+        }
+
+        # ─── One pass over the method × day matrix ─────────────────
+        comparison = build_method_comparison(
+            start,
+            end,
+            latitude=lat,
+            longitude=lng,
+            tz_name=timezone_name(lat, lng),
+            methods=methods,
+            schools=SCHOOLS,
+            lat_adj_method=LAT_ADJ_METHODS[lat_adj_method.lower()],
+        )
+        response = JsonResponse(comparison)
+        response[SOURCE_HEADER] = "local"
+        return response
+
+    except (KeyError, ValueError) as e:
+        return JsonResponse({"error": f"Invalid parameter: {str(e)}"}, status=400)
+    except CalculationMethodError as e:
+        return JsonResponse({"error": str(e)}, status=400)
     except Exception as e:
-        print("❌ Error in get_prayer_times:", e)
+        print("❌ Error in get_compare_methods:", e)
         return JsonResponse({"error": str(e)}, status=500)
@@ -0,0 +1,96 @@
+"""Wire formats of prayer tables.
+
+Besides the JSON rows the calculators have always returned, a table can be
+sent as columnar JSON or MessagePack (one array of minutes per prayer, the
+dates implied by ``first`` and the Hijri calendar as month runs) or as a CSV
+stream of the formatted rows.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Final, Iterator
+
+from .compact import COLUMNS, UNDEFINED, CompactTable
+from .hijri import HIJRI_MONTHS_AR, HIJRI_MONTHS_EN, hijri_months
+
+try:
+    import msgpack
+except ImportError:  # optional, only needed for format=msgpack
+    msgpack = None
+
+# Format name → media type, in the order Accept headers are matched
+WIRE_FORMATS: Final = {
+    "json": "application/json",
+    "columns": "application/vnd.izr.prayer-columns+json",
+    "csv": "text/csv; charset=utf-8",
+    "msgpack": "application/msgpack",
+}
+# Formats sent as a stream of chunks rather than one body
+STREAMED_FORMATS: Final = ("csv",)
+# Spreadsheet columns; the Arabic Hijri label and Day would double the size
+CSV_FIELDS: Final = ("Datum", "Hijri", *COLUMNS)
+
+
+def available_formats() -> tuple[str, ...]:
+    """The formats this installation can encode (MessagePack is optional)."""
+    return tuple(name for name in WIRE_FORMATS if name != "msgpack" or msgpack is not None)
+
+
+def columnar(table: CompactTable, correction_day: int = 0) -> dict[str, Any]:
+    """One array per prayer of minutes since midnight (None when undefined).
+
+    Row ``i`` is the day ``first + i``; ``hijri`` lists the rows where a
+    Hijri month starts (and the first row) with that row's Hijri date.
+    """
+    payload: dict[str, Any] = {
+        "first": table.first.isoformat(),
+        "days": len(table),
+        "hijri": [
+            {
+                "row": row,
+                "year": year,
+                "month": month,
+                "day": day,
+                "name": HIJRI_MONTHS_EN[month - 1],
+                "name_ar": HIJRI_MONTHS_AR[month - 1],
+            }
+            for row, year, month, day in hijri_months(table.first, len(table), correction_day)
+        ],
+    }
+    for index, name in enumerate(COLUMNS):
+        values = table.minutes[index].tolist()
+        payload[name] = [None if value == UNDEFINED else value for value in values]
+    return payload
+
+
+def iter_csv(table: CompactTable, correction_day: int = 0, rows_per_chunk: int = 64) -> Iterator[str]:
+    """Yield the formatted rows as CSV, ``rows_per_chunk`` rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction="ignore", lineterminator="\r\n")
+    writer.writeheader()
+    for start in range(0, len(table), rows_per_chunk):
+        writer.writerows(table.records(correction_day, start, start + rows_per_chunk))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if not len(table):
+        yield buffer.getvalue()
+
+
+def encode_table(table: CompactTable, wire_format: str, correction_day: int = 0) -> Iterator[bytes]:
+    """Yield ``table`` encoded in ``wire_format``; one chunk unless it is streamed.
+
+    Raises ValueError for unknown formats and MessagePack without the package.
+    """
+    if wire_format not in available_formats():
+        raise ValueError(f"format must be one of {', '.join(available_formats())}")
+    if wire_format == "json":
+        yield json.dumps(table.records(correction_day)).encode()
+    elif wire_format == "columns":
+        yield json.dumps(columnar(table, correction_day), separators=(",", ":")).encode()
+    elif wire_format == "msgpack":
+        yield msgpack.packb(columnar(table, correction_day), use_bin_type=True)
+    else:
+        for chunk in iter_csv(table, correction_day):
+            yield chunk.encode()
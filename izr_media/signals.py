@@ -2,7 +2,9 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.conf import settings
-from .models import PrayerCalculationConfig
+from .models import FourierFit, PrayerCalculationConfig, PrayerConfig
+from .prayer_times.fourier_table import clear_stored_fits
+from .prayer_times.local_cache import invalidate_local_caches
 
 
 
@@ -12,7 +14,8 @@ def clear_static_cache_for_regensburg(redis_client):
     """
     patterns = [
         "prayer_times:regensburg:*:static",       # old cache keys
-        "new_prayer_times:regensburg:*:static:annual"    # new API cache keys
+        "new_prayer_times:regensburg:*:static:annual*",    # new API cache keys
+        "ramadan:regensburg:*",    # Ramadan timetables (correction day, Tarawih)
     ]
 
     total_deleted = 0
@@ -42,3 +45,38 @@ def clear_static_cache_for_regensburg(redis_client):
 def delete_cache_on_change(sender, instance, **kwargs):
     redis_client = settings.REDIS_CLIENT
     clear_static_cache_for_regensburg(redis_client)
+    # Every cached table carries Hijri labels shifted by correction_day
+    for pattern in ("prayer_times:*", "new_prayer_times:*:annual*"):
+        for key in redis_client.scan_iter(match=pattern):
+            redis_client.delete(key)
+            print(f"🗑️ Deleted Redis key: {key}")
+    # Only once Redis is cleared, or the workers would refill from the old keys
+    invalidate_local_caches("PrayerCalculationConfig")
+
+
+@receiver([post_save, post_delete], sender=FourierFit)
+def delete_smoothed_cache_on_change(sender, instance, **kwargs):
+    """Drop the cached dynamic tables of the city so they are smoothed with the new fit."""
+    clear_stored_fits()
+    redis_client = settings.REDIS_CLIENT
+    patterns = [
+        f"prayer_times:{instance.city}:*:dynamic",
+        f"new_prayer_times:{instance.city}:*:dynamic:annual*",
+        # Ramadan timetables are built from the smoothed table
+        f"ramadan:{instance.city}:*:dynamic",
+    ]
+    for pattern in patterns:
+        for key in redis_client.scan_iter(match=pattern):
+            redis_client.delete(key)
+            print(f"🗑️ Deleted Redis key: {key}")
+    invalidate_local_caches("FourierFit")
+
+
+@receiver([post_save, post_delete], sender=PrayerConfig)
+def delete_ramadan_cache_on_iqama_change(sender, instance, **kwargs):
+    """The Ramadan timetables carry the iqama times."""
+    redis_client = settings.REDIS_CLIENT
+    for key in redis_client.scan_iter(match="ramadan:regensburg:*"):
+        redis_client.delete(key)
+        print(f"🗑️ Deleted Redis key: {key}")
+    invalidate_local_caches("PrayerConfig")
@@ -0,0 +1,107 @@
+from datetime import date
+from io import StringIO
+import os
+from pathlib import Path
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+import numpy as np
+
+from izr_media.prayer_times import angle_series
+from izr_media.prayer_times.angle_series import AngleSeries, load_angle_series, solve_depression_angles
+from izr_media.prayer_times.angles import SeasonalAngles
+from izr_media.prayer_times.local_calculation import LocalPrayerTimesCalculator, timezone_name
+
+REGENSBURG = (49.007734, 12.102841)
+WINTER = (date(2025, 1, 1), date(2025, 3, 31))
+
+
+def izr(**kwargs):
+    return LocalPrayerTimesCalculator(*REGENSBURG, calculation_method="izr", **kwargs)
+
+
+class TestSolveDepressionAngles(SimpleTestCase):
+    def test_engine_times_give_back_their_angles(self):
+        table = izr(fajr_angle=18, isha_angle=17).compute_table(*WINTER)
+        tz_name = timezone_name(*REGENSBURG)
+        for prayer, morning, angle in (("Fajr", True, 18), ("Isha", False, 17)):
+            with self.subTest(prayer):
+                solved = solve_depression_angles(
+                    table.ordinals, table.times[prayer], *REGENSBURG, tz_name, morning
+                )
+                # The table holds whole minutes, about 0.15° of depression each
+                np.testing.assert_allclose(solved, angle, atol=0.1)
+
+    def test_undefined_time_gives_nan(self):
+        solved = solve_depression_angles(
+            np.array([date(2025, 6, 21).toordinal()]), np.array([np.nan]), *REGENSBURG, None, True
+        )
+        self.assertTrue(np.isnan(solved[0]))
+
+
+class TestAngleSeries(SimpleTestCase):
+    def setUp(self):
+        days = np.arange(365, dtype=float)
+        self.series = AngleSeries(fajr=10 + days / 100, isha=20 + days / 100)
+
+    def test_leap_day_takes_the_mean_of_its_neighbours(self):
+        fajr, isha = self.series.for_days(date(2024, 2, 28), 3)
+        np.testing.assert_allclose(fajr, [10.58, 10.585, 10.59])
+        np.testing.assert_allclose(isha, [20.58, 20.585, 20.59])
+        self.assertEqual(self.series.on(date(2024, 12, 31)), (13.64, 23.64))
+
+    def test_days_across_the_year_end(self):
+        fajr, _ = self.series.for_days(date(2025, 12, 30), 3)
+        np.testing.assert_allclose(fajr, [13.63, 13.64, 10.0])
+
+    def test_constant_series_matches_static_angles(self):
+        series = AngleSeries(fajr=np.full(365, 18.0), isha=np.full(365, 17.0))
+        static = izr(fajr_angle=18, isha_angle=17).compute_table(*WINTER)
+        dynamic = izr(fajr_angle=18, isha_angle=17, angle_series=series).compute_table(*WINTER)
+        for prayer in ("Fajr", "Isha"):
+            np.testing.assert_allclose(dynamic.times[prayer], static.times[prayer])
+
+    def test_write_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(angle_series, "SERIES_DIR", Path(directory)):
+            self.assertIsNone(load_angle_series("testdorf"))
+            self.series.write(angle_series.series_path("testdorf"))
+            loaded = load_angle_series("testdorf")
+            np.testing.assert_allclose(loaded.fajr, self.series.fajr, atol=0.005)
+            self.assertIs(load_angle_series("testdorf"), loaded)
+
+            AngleSeries(fajr=np.full(365, 18.0), isha=np.full(365, 17.0)).write(
+                angle_series.series_path("testdorf")
+            )
+            path = angle_series.series_path("testdorf")
+            os.utime(path, (0, os.stat(path).st_mtime + 1))
+            self.assertEqual(load_angle_series("testdorf").on(date(2025, 5, 1)), (18.0, 17.0))
+
+    def test_bundled_regensburg_series(self):
+        series = load_angle_series("regensburg")
+        self.assertEqual((len(series.fajr), len(series.isha)), (365, 365))
+        self.assertFalse(np.isnan(series.fajr).any() or np.isnan(series.isha).any())
+
+
+class TestSeasonalAngles(SimpleTestCase):
+    def test_days_across_the_year_end_match_each_day(self):
+        provider = SeasonalAngles(*REGENSBURG)
+        fajr, isha = provider.for_days(date(2024, 12, 30), 4)
+        expected = [provider.on(date.fromordinal(date(2024, 12, 30).toordinal() + n)) for n in range(4)]
+        np.testing.assert_allclose(np.column_stack([fajr, isha]), expected)
+
+
+class TestSolveAnglesCommand(SimpleTestCase):
+    def test_solves_a_common_year_from_the_fourier_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "angles.csv"
+            call_command(
+                "solve_angles", latitude=REGENSBURG[0], longitude=REGENSBURG[1],
+                output=output, stdout=StringIO(),
+            )
+            lines = output.read_text().splitlines()
+        self.assertEqual(lines[0], "Day;Fajr;Isha")
+        self.assertEqual(len(lines), 366)
+        self.assertEqual(lines[-1].split(";")[0], "365")
@@ -0,0 +1,183 @@
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from izr_media.prayer_times.archive import (
+    MODE_READ_THROUGH,
+    MODE_REPLAY,
+    ArchiveMissError,
+    ResponseArchive,
+    get_archive,
+    request_key,
+)
+from izr_media.prayer_times.calculation import API_URL, PrayerTimesCalculator
+from izr_media.prayer_times.fallback import SOURCE_LOCAL, fetch_annual_with_fallback
+
+
+def aladhan_day(gregorian, hijri_year, hijri_month, hijri_day, fajr, isha):
+    """A day object shaped like aladhan's, with fixed timings besides Fajr and Isha."""
+    return {
+        "timings": {
+            "Fajr": f"{fajr} (CEST)",
+            "Sunrise": "05:07 (CEST)",
+            "Dhuhr": "13:13 (CEST)",
+            "Asr": "17:31 (CEST)",
+            "Maghrib": "21:20 (CEST)",
+            "Isha": f"{isha} (CEST)",
+        },
+        "date": {
+            "gregorian": {"date": gregorian},
+            "hijri": {"year": str(hijri_year), "month": {"number": hijri_month}, "day": str(hijri_day)},
+        },
+    }
+
+
+def calculator():
+    return PrayerTimesCalculator(
+        latitude=49.007734, longitude=12.102841, calculation_method="izr",
+        fajr_angle=18, isha_angle=18,
+    )
+
+
+class TestResponseArchive(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+
+    def test_request_key_ignores_parameter_order_and_types(self):
+        self.assertEqual(
+            request_key("https://x/a", {"a": 1, "b": "x"}),
+            request_key("https://x/a", {"b": "x", "a": "1"}),
+        )
+        self.assertNotEqual(request_key("https://x/a", {"a": 1}), request_key("https://x/b", {"a": 1}))
+
+    def test_put_get_round_trip(self):
+        archive = ResponseArchive(self.root.name, MODE_READ_THROUGH)
+        archive.put("https://x/a", {"a": 1}, b'{"ok": true}')
+        self.assertEqual(archive.get("https://x/a", {"a": "1"}), b'{"ok": true}')
+        self.assertEqual(b"".join(archive.iter_chunks("https://x/a", {"a": 1}, chunk_size=3)), b'{"ok": true}')
+        self.assertIsNone(archive.get("https://x/a", {"a": 2}))
+
+    def test_interrupted_tee_archives_nothing(self):
+        archive = ResponseArchive(self.root.name, MODE_READ_THROUGH)
+
+        def broken():
+            yield b"partial"
+            raise OSError("connection reset")
+
+        with self.assertRaises(OSError):
+            for _ in archive.tee("https://x/a", None, broken()):
+                pass
+        self.assertIsNone(archive.get("https://x/a", None))
+        self.assertEqual(list(archive.path(request_key("https://x/a", None)).parent.iterdir()), [])
+
+    def age(self, archive, url, seconds):
+        path = archive.path(request_key(url, None))
+        then = time.time() - seconds
+        os.utime(path, (then, then))
+
+    def test_least_recently_used_files_go_beyond_max_bytes(self):
+        archive = ResponseArchive(self.root.name, MODE_READ_THROUGH, max_bytes=25)
+        for index, url in enumerate(("https://x/a", "https://x/b")):
+            archive.put(url, None, b"0123456789")
+            self.age(archive, url, 100 - index)
+        # Reading "a" makes "b" the least recently used one
+        self.assertIsNotNone(archive.get("https://x/a", None))
+        archive.put("https://x/c", None, b"0123456789")
+        self.assertIsNone(archive.get("https://x/b", None))
+        self.assertIsNotNone(archive.get("https://x/a", None))
+        self.assertIsNotNone(archive.get("https://x/c", None))
+
+    def test_files_unused_for_max_age_go(self):
+        archive = ResponseArchive(self.root.name, MODE_READ_THROUGH, max_age=3600)
+        archive.put("https://x/old", None, b"old")
+        self.age(archive, "https://x/old", 7200)
+        archive.put("https://x/new", None, b"new")
+        self.assertIsNone(archive.get("https://x/old", None))
+        self.assertEqual(archive.get("https://x/new", None), b"new")
+
+    def test_settings_limits(self):
+        with override_settings(
+            ALADHAN_ARCHIVE_MODE=MODE_READ_THROUGH, ALADHAN_ARCHIVE_DIR=self.root.name,
+            ALADHAN_ARCHIVE_MAX_MB=2, ALADHAN_ARCHIVE_MAX_AGE_DAYS=0,
+        ):
+            archive = get_archive()
+        self.assertEqual((archive.max_bytes, archive.max_age), (2 * 1024 * 1024, None))
+
+
+class TestReplay(SimpleTestCase):
+    """Replay mode answers from the archive and never goes over the network."""
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        settings = override_settings(ALADHAN_ARCHIVE_MODE=MODE_REPLAY, ALADHAN_ARCHIVE_DIR=root.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        network = mock.patch(
+            "izr_media.prayer_times.calculation.get_client",
+            side_effect=AssertionError("replay mode went to the network"),
+        )
+        network.start()
+        self.addCleanup(network.stop)
+        self.archive = ResponseArchive(root.name, MODE_REPLAY)
+        self.calculator = calculator()
+        self.params = self.calculator._build_params()
+
+    def test_daily_from_archive(self):
+        body = {"code": 200, "data": aladhan_day("21-06-2025", 1446, 12, 25, "02:47", "23:40")}
+        self.archive.put(f"{API_URL}/timings/21-06-2025", self.params, json.dumps(body).encode())
+
+        record = self.calculator.fetch_daily_prayer_times("2025-06-21")
+        self.assertEqual(record["Datum"], "21-06-2025")
+        self.assertEqual(record["Hijri"], "25 Dhu al-Hijjah 1446")
+        self.assertEqual((record["Fajr"], record["Shuruq"], record["Isha"]), ("02:47", "05:07", "23:40"))
+
+    def test_annual_is_streamed_from_archive(self):
+        body = {
+            "code": 200,
+            "status": "OK",
+            "data": {
+                "1": [aladhan_day("01-01-2025", 1446, 7, 1, "06:10", "18:21")],
+                "2": [aladhan_day("01-02-2025", 1446, 8, 2, "05:56", "18:58")],
+            },
+        }
+        self.archive.put(f"{API_URL}/calendar/2025", self.params, json.dumps(body).encode())
+
+        records = self.calculator.fetch_annual_prayer_times(2025)
+        self.assertEqual([record["Datum"] for record in records], ["01-01-2025", "01-02-2025"])
+        self.assertEqual([record["Isha"] for record in records], ["18:21", "18:58"])
+
+    def test_monthly_fan_out_is_streamed_from_archive(self):
+        for month in range(1, 13):
+            body = {
+                "code": 200,
+                "status": "OK",
+                "data": [aladhan_day(f"01-{month:02d}-2025", 1446, 7, month, "05:00", "20:00")],
+            }
+            self.archive.put(f"{API_URL}/calendar/2025/{month}", self.params, json.dumps(body).encode())
+
+        records = self.calculator.fetch_annual_prayer_times(2025, fan_out=True)
+        self.assertEqual([record["Datum"][3:5] for record in records], [f"{m:02d}" for m in range(1, 13)])
+
+    def test_miss_raises_instead_of_fetching(self):
+        with self.assertRaises(ArchiveMissError):
+            self.calculator.fetch_daily_prayer_times("2025-06-22")
+        with self.assertRaises(ArchiveMissError):
+            self.calculator.fetch_annual_prayer_times(2026)
+        with self.assertRaises(ArchiveMissError):
+            self.calculator.fetch_annual_prayer_times(2026, fan_out=True)
+
+    @override_settings(PRAYER_TIMES_BACKEND="aladhan", PRAYER_TIMES_LATENCY_BUDGET=5)
+    def test_miss_falls_through_to_the_local_engine(self):
+        kwargs = dict(
+            latitude=49.007734, longitude=12.102841, calculation_method="izr",
+            fajr_angle=18, isha_angle=18,
+        )
+        source, records = fetch_annual_with_fallback(kwargs, 2026)
+        self.assertEqual(source, SOURCE_LOCAL)
+        self.assertEqual(len(records), 365)
@@ -0,0 +1,28 @@
+from django.test import SimpleTestCase
+
+from izr_media.prayer_times.periods import period_bounds
+from izr_media.prayer_times.views import annual_cache_key, query_cache_keys
+
+REGENSBURG = (49.007734, 12.102841)
+
+
+class TestAnnualCacheKey(SimpleTestCase):
+    def test_method_and_coordinates_are_part_of_the_key(self):
+        izr = annual_cache_key("regensburg", 2026, "static", "izr", *REGENSBURG)
+        self.assertNotEqual(izr, annual_cache_key("regensburg", 2026, "static", "mwl", *REGENSBURG))
+        self.assertNotEqual(izr, annual_cache_key("regensburg", 2026, "static", "izr", 52.52, 13.405))
+        # Coordinates count to 4 decimals, the precision of the canonical v2 query
+        self.assertEqual(izr, annual_cache_key("regensburg", 2026, "static", "IZR", "49.00773", 12.10284))
+
+    def test_keys_still_match_the_invalidation_patterns(self):
+        key = annual_cache_key(
+            "regensburg", 2026, "static", "izr", *REGENSBURG, hijri=True, lat_adj_method="One Seventh"
+        )
+        self.assertTrue(key.startswith("new_prayer_times:regensburg:2026:static:annual"))
+        self.assertTrue(key.endswith(":hijri:one-seventh"))
+
+    def test_query_keys_of_a_range_across_years(self):
+        first, last = period_bounds("range", None, "2025-12-30", "2026-01-02")
+        keys = query_cache_keys("Regensburg", "static", "mwl", *REGENSBURG, first, last, "range", False, "")
+        self.assertEqual([key.split(":")[2] for key in keys], ["2025", "2026"])
+        self.assertTrue(all(":mwl:49.0077:12.1028" in key for key in keys))
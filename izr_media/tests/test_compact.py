@@ -0,0 +1,80 @@
+from datetime import date
+import json
+
+from django.test import SimpleTestCase
+import numpy as np
+
+from izr_media.prayer_times.compact import (
+    COLUMNS,
+    HEADER,
+    UNDEFINED,
+    CompactTable,
+    record_range,
+)
+
+
+def table(first, days, seed=0):
+    """A table of ``days`` rows from ``first`` with arbitrary valid minutes."""
+    rng = np.random.default_rng(seed)
+    return CompactTable(first, rng.integers(0, 1440, size=(len(COLUMNS), days), dtype=np.uint16))
+
+
+def getrange(blob, start, end):
+    """What Redis GETRANGE returns: bytes ``start``..``end`` inclusive."""
+    return blob[start:end + 1]
+
+
+class TestPack(SimpleTestCase):
+    def setUp(self):
+        # Dec 2025 and Jan 2026, Fajr and Isha undefined from Dec 31 to Jan 2
+        self.table = CompactTable.concat([table(date(2025, 12, 1), 31, 1), table(date(2026, 1, 1), 31, 2)])
+        self.table.minutes[COLUMNS.index("Fajr"), 30:33] = UNDEFINED
+        self.table.minutes[COLUMNS.index("Isha"), 30:33] = UNDEFINED
+
+    def test_pack_unpack_round_trip(self):
+        blob = self.table.pack()
+        self.assertEqual(len(blob), HEADER.size + 12 * 62)
+        unpacked = CompactTable.unpack(blob)
+        self.assertEqual(unpacked.first, date(2025, 12, 1))
+        self.assertEqual(unpacked.last, date(2026, 1, 31))
+        np.testing.assert_array_equal(unpacked.minutes, self.table.minutes)
+        self.assertEqual(unpacked.records(), self.table.records())
+
+    def test_getrange_of_every_row(self):
+        blob = self.table.pack()
+        header = getrange(blob, 0, HEADER.size - 1)
+        for row in range(len(self.table)):
+            with self.subTest(row=row):
+                day = CompactTable.unpack_record(header, row, getrange(blob, *record_range(row)))
+                self.assertEqual(day.first, self.table.rows(row, row + 1).first)
+                np.testing.assert_array_equal(day.minutes[:, 0], self.table.minutes[:, row])
+
+    def test_undefined_survives_and_formats_as_dashes(self):
+        blob = self.table.pack()
+        header = getrange(blob, 0, HEADER.size - 1)
+        day = CompactTable.unpack_record(header, 31, getrange(blob, *record_range(31)))
+        self.assertEqual(day.first, date(2026, 1, 1))
+        record = day.records()[0]
+        self.assertEqual((record["Fajr"], record["Isha"]), ("-----", "-----"))
+        self.assertTrue(np.isnan(day.column("Fajr")[0]))
+
+    def test_cross_year_records_and_slices(self):
+        unpacked = CompactTable.unpack(self.table.pack())
+        part = unpacked.between(date(2025, 12, 30), date(2026, 1, 2))
+        self.assertEqual(
+            [(record["Datum"], record["Day"]) for record in part.records()],
+            [("30-12-2025", 364), ("31-12-2025", 365), ("01-01-2026", 1), ("02-01-2026", 2)],
+        )
+        self.assertEqual([record["Day"] for record in unpacked.records(0, 30, 32)], [365, 1])
+
+    def test_rejects_other_blobs(self):
+        blob = self.table.pack()
+        for other in (b"", b"PT2", json.dumps(self.table.records()).encode(), b"XX9" + blob[3:], blob[:-1]):
+            with self.subTest(other=other[:12]):
+                with self.assertRaises(ValueError):
+                    CompactTable.unpack(other)
+        header = getrange(blob, 0, HEADER.size - 1)
+        with self.assertRaises(ValueError):
+            CompactTable.unpack_record(header, len(self.table), getrange(blob, *record_range(0)))
+        with self.assertRaises(ValueError):
+            CompactTable.unpack_record(header, 0, getrange(blob, *record_range(len(self.table))))
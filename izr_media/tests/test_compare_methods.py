@@ -0,0 +1,74 @@
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from izr_media.prayer_times import views
+from izr_media.prayer_times.calculation import CALCULATION_METHODS
+from izr_media.prayer_times.local_calculation import LocalPrayerTimesCalculator
+
+CONFIG = SimpleNamespace(
+    default_latitude=49.007734, default_longitude=12.102841, fajr_angle=18, isha_angle=17,
+)
+
+
+def daily(method, day, school=""):
+    calculator = LocalPrayerTimesCalculator(
+        CONFIG.default_latitude, CONFIG.default_longitude, calculation_method=method,
+        school=school, fajr_angle=CONFIG.fajr_angle, isha_angle=CONFIG.isha_angle,
+    )
+    return calculator.fetch_daily_prayer_times(day)
+
+
+@mock.patch.object(views.PrayerCalculationConfig.objects, "latest", return_value=CONFIG)
+class TestCompareMethods(SimpleTestCase):
+    def post(self, **data):
+        request = RequestFactory().post(
+            "/prayer-times/compare-methods", json.dumps(data), content_type="application/json"
+        )
+        return views.get_compare_methods(request)
+
+    def compare(self, **data):
+        response = self.post(**data)
+        self.assertEqual(response.status_code, 200, response.content)
+        return json.loads(response.content)
+
+    def test_every_method_and_school_over_the_range(self, latest):
+        comparison = self.compare(start="2025-03-30", end="2025-04-01")
+        self.assertEqual(comparison["Datum"], ["30-03-2025", "31-03-2025", "01-04-2025"])
+        self.assertEqual(set(comparison["methods"]), set(CALCULATION_METHODS))
+        self.assertEqual(set(comparison["Asr"]), {"shafi", "hanafi"})
+        for labels in comparison["Asr"].values():
+            self.assertEqual(len(labels), 3)
+        self.assertTrue(all(
+            hanafi > shafi for shafi, hanafi in zip(comparison["Asr"]["shafi"], comparison["Asr"]["hanafi"])
+        ))
+
+    def test_matches_the_daily_calculation_of_each_method(self, latest):
+        comparison = self.compare(start="2025-06-21")
+        for method in ("mwl", "isna", "karachi", "izr"):
+            record = daily(method, "2025-06-21")
+            with self.subTest(method):
+                for column in ("Fajr", "Maghrib", "Isha"):
+                    self.assertEqual(comparison["methods"][method][column], [record[column]])
+        self.assertEqual(comparison["Asr"]["hanafi"], [daily("mwl", "2025-06-21", "hanafi")["Asr"]])
+        self.assertEqual(comparison["Shuruq"], [record["Shuruq"]])
+
+    def test_izr_uses_the_configured_angles(self, latest):
+        # The config's 18°/17° are the MWL angles
+        comparison = self.compare(start="2025-01-15")
+        self.assertEqual(comparison["methods"]["izr"]["Fajr"], comparison["methods"]["mwl"]["Fajr"])
+        self.assertEqual(comparison["methods"]["izr"]["Isha"], comparison["methods"]["mwl"]["Isha"])
+
+    def test_invalid_requests(self, latest):
+        for data in (
+            {"start": "2025-02-01", "end": "2025-01-31"},
+            {"start": "2025-01-01", "end": "2026-01-02"},
+            {"start": "2025-13-01"},
+            {"lat_adj_method": "nearest"},
+        ):
+            with self.subTest(**data):
+                self.assertEqual(self.post(**data).status_code, 400)
+        get = views.get_compare_methods(RequestFactory().get("/prayer-times/compare-methods"))
+        self.assertEqual(get.status_code, 405)
@@ -0,0 +1,93 @@
+from datetime import date, datetime, time
+import json
+from types import SimpleNamespace
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.test import RequestFactory, SimpleTestCase
+
+from izr_media.prayer_times import views
+from izr_media.prayer_times.compact import CompactTable
+from izr_media.prayer_times.countdown import build_prayer_index
+from izr_media.prayer_times.local_calculation import LocalPrayerTimesCalculator, timezone_name
+
+CONFIG = SimpleNamespace(
+    calculation_type="static", default_latitude=49.007734, default_longitude=12.102841,
+    jumaa_time=time(13, 0),
+)
+IQAMA = SimpleNamespace(fajr=20, dhuhr=10, asr=10, maghrib=5, isha=15)
+BERLIN = ZoneInfo("Europe/Berlin")
+
+
+def annual_table(year):
+    calculator = LocalPrayerTimesCalculator(
+        CONFIG.default_latitude, CONFIG.default_longitude, calculation_method="izr",
+        fajr_angle=18, isha_angle=18,
+    )
+    return CompactTable.from_records(calculator.compute_years(year).records())
+
+
+def local_index(config, year):
+    lat, lng = config.default_latitude, config.default_longitude
+    return build_prayer_index(annual_table(year), timezone_name(lat, lng), lng)
+
+
+def at(moment):
+    """A ``datetime`` whose ``now`` is ``moment``."""
+    return type("FixedDatetime", (datetime,), {"now": classmethod(lambda cls, tz=None: moment.astimezone(tz))})
+
+
+def label(year, day, prayer):
+    return annual_table(year).records()[day.timetuple().tm_yday - 1][prayer]
+
+
+@mock.patch.object(views.PrayerConfig.objects, "filter", return_value=mock.Mock(first=lambda: IQAMA))
+@mock.patch.object(views.PrayerCalculationConfig.objects, "latest", return_value=CONFIG)
+class TestNextPrayer(SimpleTestCase):
+    def next_prayer(self, moment):
+        with mock.patch.object(views, "datetime", at(moment)), \
+                mock.patch.object(views, "prayer_index", side_effect=local_index) as index:
+            response = views.get_next_prayer(RequestFactory().get("/prayer-times/next"))
+        self.assertEqual(response.status_code, 200, response.content)
+        return response, json.loads(response.content), sorted(call.args[1] for call in index.call_args_list)
+
+    def test_after_isha_rolls_to_the_next_fajr(self, latest, iqama):
+        now = datetime(2025, 10, 10, 23, 30, tzinfo=BERLIN)
+        response, payload, _ = self.next_prayer(now)
+        self.assertEqual((payload["current"]["prayer"], payload["current"]["date"]), ("Isha", "2025-10-10"))
+        self.assertEqual((payload["next"]["prayer"], payload["next"]["date"]), ("Fajr", "2025-10-11"))
+        self.assertEqual(payload["next"]["time"], label(2025, date(2025, 10, 11), "Fajr"))
+        self.assertEqual(payload["seconds_remaining"], payload["next"]["timestamp"] - int(now.timestamp()))
+        self.assertEqual(response["Cache-Control"], f"public, max-age={payload['seconds_remaining']}")
+
+    def test_after_isha_on_new_years_eve(self, latest, iqama):
+        _, payload, years = self.next_prayer(datetime(2025, 12, 31, 23, 30, tzinfo=BERLIN))
+        self.assertEqual((payload["current"]["prayer"], payload["current"]["date"]), ("Isha", "2025-12-31"))
+        self.assertEqual((payload["next"]["prayer"], payload["next"]["date"]), ("Fajr", "2026-01-01"))
+        self.assertEqual(payload["next"]["time"], label(2026, date(2026, 1, 1), "Fajr"))
+        self.assertEqual(years, [2025, 2026])
+
+    def test_before_fajr_on_new_years_day(self, latest, iqama):
+        _, payload, years = self.next_prayer(datetime(2026, 1, 1, 0, 30, tzinfo=BERLIN))
+        self.assertEqual((payload["current"]["prayer"], payload["current"]["date"]), ("Isha", "2025-12-31"))
+        self.assertEqual((payload["next"]["prayer"], payload["next"]["date"]), ("Fajr", "2026-01-01"))
+        self.assertEqual(years, [2025, 2026])
+
+    def test_jumaa_and_iqama_before_friday_dhuhr(self, latest, iqama):
+        _, payload, _ = self.next_prayer(datetime(2025, 6, 13, 10, 0, tzinfo=BERLIN))
+        upcoming = payload["next"]
+        self.assertEqual((upcoming["prayer"], upcoming["jumaa"]), ("Dhuhr", "13:00"))
+        dhuhr = datetime.strptime(upcoming["time"], "%H:%M")
+        self.assertEqual((datetime.strptime(upcoming["iqama"], "%H:%M") - dhuhr).seconds, 600)
+
+
+class TestPrayerIndex(SimpleTestCase):
+    def test_instants_follow_daylight_saving_time(self):
+        index = local_index(CONFIG, 2025)
+        self.assertEqual(len(index.instants), 365 * 6)
+        self.assertTrue((index.instants[1:] > index.instants[:-1]).all())
+        # Clocks go forward on Mar 30; both days still read back as their labels
+        for day in (date(2025, 3, 29), date(2025, 3, 30)):
+            dhuhr = index.instants[(day.timetuple().tm_yday - 1) * 6 + 2]
+            moment = datetime.fromtimestamp(int(dhuhr), BERLIN)
+            self.assertEqual(moment.strftime("%H:%M"), label(2025, day, "Dhuhr"))
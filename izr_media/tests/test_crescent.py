@@ -0,0 +1,78 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase
+import numpy as np
+
+from izr_media.prayer_times import crescent
+from izr_media.prayer_times.astronomy import JD_EPOCH
+from izr_media.prayer_times.hijri import hijri_month_range
+from izr_media.prayer_times.ramadan import RAMADAN
+
+REGENSBURG = (49.007734, 12.102841)
+# On the Greenwich meridian the local day of the conjunction is its UTC date
+GREENWICH = (49.0, 0.0)
+
+
+def crescent_seen_from(days_after_conjunction):
+    """A stand-in for crescent_at_sunset: q passes from that evening on."""
+
+    def evaluate(ordinals, conjunctions, latitude, longitude):
+        ordinals = np.asarray(ordinals, dtype=float)
+        conjunction_days = np.floor(np.asarray(conjunctions) - JD_EPOCH + 0.5)
+        age = ordinals - conjunction_days
+        zeros = np.zeros_like(ordinals)
+        return {
+            "sunset": ordinals + JD_EPOCH,
+            "age_hours": age * 24,
+            "elongation": zeros,
+            "lag_minutes": zeros,
+            "q": np.where(age >= days_after_conjunction, 1.0, -1.0),
+        }
+
+    return evaluate
+
+
+def month_starts(days_after_conjunction, hijri_year=1446):
+    with mock.patch.object(crescent, "crescent_at_sunset", crescent_seen_from(days_after_conjunction)):
+        # Past the lru_cache, which would keep the stand-in's results
+        return crescent.hijri_month_starts.__wrapped__(hijri_year, *GREENWICH)
+
+
+class TestHijriMonthStarts(SimpleTestCase):
+    def test_month_starts_after_the_first_visible_evening(self):
+        for estimate in month_starts(1):
+            with self.subTest(month=estimate.month):
+                # Evenings are counted from the conjunction's day, the next one after noon
+                conjunction_day = (estimate.conjunction + timedelta(hours=12)).date()
+                self.assertEqual(estimate.evening, conjunction_day + timedelta(days=1))
+                self.assertEqual(estimate.start, estimate.evening + timedelta(days=1))
+                self.assertEqual(estimate.visibility, "A")
+
+    def test_previous_month_is_completed_when_never_visible(self):
+        estimates = month_starts(np.inf)
+        previous = hijri_month_range(1445, 12)[0]
+        for estimate in estimates:
+            with self.subTest(month=estimate.month):
+                self.assertEqual(estimate.start, previous + timedelta(days=30))
+                self.assertEqual(estimate.evening, estimate.start - timedelta(days=1))
+                self.assertEqual(estimate.visibility, "F")
+            previous = estimate.start
+
+    def test_ramadan_1446_in_regensburg(self):
+        # Conjunction on Feb 28, 2025 00:45 UTC: too young that evening, easily seen on Mar 1
+        ramadan = crescent.hijri_month_starts(1446, *REGENSBURG)[RAMADAN - 1]
+        self.assertEqual(ramadan.evening, date(2025, 3, 1))
+        self.assertEqual(ramadan.visibility, "A")
+        self.assertEqual((ramadan.start, ramadan.umm_al_qura), (date(2025, 3, 2), date(2025, 3, 1)))
+
+
+class TestProposeCorrection(SimpleTestCase):
+    def test_correction_of_the_month(self):
+        estimates = month_starts(1)
+        ramadan = estimates[RAMADAN - 1]
+        self.assertEqual(crescent.propose_correction(estimates), (ramadan.umm_al_qura - ramadan.start).days)
+        self.assertEqual(crescent.propose_correction(estimates, 1), estimates[0].correction)
+
+    def test_month_not_estimated(self):
+        self.assertEqual(crescent.propose_correction(()), 0)
@@ -0,0 +1,137 @@
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from izr_media.prayer_times import fallback, views
+from izr_media.prayer_times.calculation import PrayerTimesCalculator
+from izr_media.prayer_times.compact import COLUMNS
+from izr_media.prayer_times.fallback import AllSourcesFailedError, run_with_fallback
+from izr_media.prayer_times.http_client import Deadline
+from izr_media.prayer_times.local_cache import LocalCache
+from izr_media.prayer_times.local_calculation import LocalPrayerTimesCalculator
+
+REGENSBURG = (49.007734, 12.102841)
+TUNES = (
+    "imsak_tune", "fajr_tune", "sunrise_tune", "dhuhr_tune", "asr_tune",
+    "maghrib_tune", "sunset_tune", "isha_tune", "midnight_tune",
+)
+
+
+def config(calculation_type):
+    return SimpleNamespace(
+        calculation_type=calculation_type, fajr_angle=18, isha_angle=18, correction_day=0,
+        **dict.fromkeys(TUNES, 0),
+    )
+
+
+def static_year(year):
+    """What aladhan answers for a year at the static 18°/18°."""
+    calculator = LocalPrayerTimesCalculator(
+        *REGENSBURG, calculation_method="izr", fajr_angle=18, isha_angle=18
+    )
+    return calculator.fetch_annual_prayer_times(year)
+
+
+@override_settings(PRAYER_TIMES_BACKEND="aladhan", REDIS_BINARY_CLIENT=mock.Mock())
+class TestDynamicAngles(SimpleTestCase):
+    def setUp(self):
+        for target, value in (
+            ("izr_media.prayer_times.views.cached_table", None),
+            ("izr_media.prayer_times.views.has_smoothing", False),
+            ("izr_media.prayer_times.views.local_cache", LocalCache()),
+        ):
+            patcher = mock.patch(target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            PrayerTimesCalculator, "fetch_annual_prayer_times",
+            side_effect=lambda year, **kwargs: static_year(year),
+        )
+        self.aladhan = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def annual(self, calculation_type):
+        return views.annual_prayer_times(config(calculation_type), "Testdorf", *REGENSBURG, "izr", 2025)
+
+    def test_dynamic_table_differs_from_static_while_aladhan_answers(self):
+        static_source, static = self.annual("static")
+        dynamic_source, dynamic = self.annual("dynamic")
+        self.assertEqual((static_source, dynamic_source), ("aladhan", "local"))
+        self.assertEqual(self.aladhan.call_count, 1)
+        for name in ("Fajr", "Isha"):
+            with self.subTest(name):
+                index = COLUMNS.index(name)
+                self.assertTrue((static.minutes[index] != dynamic.minutes[index]).any())
+        index = COLUMNS.index("Dhuhr")
+        self.assertEqual(static.minutes[index].tolist(), dynamic.minutes[index].tolist())
+
+    def test_dynamic_table_is_cached_for_the_year(self):
+        self.annual("dynamic")
+        (key, ttl, _), _ = views.settings.REDIS_BINARY_CLIENT.setex.call_args
+        self.assertIn(":dynamic:annual:izr:", key)
+        self.assertGreater(ttl, views.settings.PRAYER_TIMES_FALLBACK_TTL)
+
+
+def failing(message):
+    def fetch():
+        raise ValueError(message)
+    return fetch
+
+
+class TestRunWithFallback(SimpleTestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def slow(self, result):
+        def fetch():
+            self.release.wait(5)
+            return result
+        return fetch
+
+    def test_first_source_that_answers_is_served(self):
+        local = mock.Mock(return_value="local")
+        source = run_with_fallback([("aladhan", lambda: "aladhan"), ("local", local)], budget=5)
+        self.assertEqual(source, ("aladhan", "aladhan"))
+        local.assert_not_called()
+
+    def test_failed_source_falls_through_in_order(self):
+        sources = [("aladhan", failing("down")), ("local", failing("broken")), ("fourier-csv", lambda: "csv")]
+        self.assertEqual(run_with_fallback(sources, budget=5), ("fourier-csv", "csv"))
+
+    def test_slow_source_is_hedged_after_the_budget(self):
+        deadline = Deadline(60)
+        sources = [("aladhan", self.slow("aladhan")), ("local", lambda: "local")]
+        self.assertEqual(run_with_fallback(sources, budget=0.05, deadline=deadline), ("local", "local"))
+        # The hedged upstream makes no further calls
+        self.assertTrue(deadline.expired)
+
+    def test_slow_source_still_wins_when_the_hedge_fails(self):
+        sources = [("aladhan", self.slow("aladhan")), ("local", failing("broken"))]
+        timer = threading.Timer(0.1, self.release.set)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        self.assertEqual(run_with_fallback(sources, budget=0.05), ("aladhan", "aladhan"))
+
+    def test_all_failures_are_reported(self):
+        sources = [("aladhan", failing("down")), ("local", failing("broken"))]
+        with self.assertRaisesRegex(AllSourcesFailedError, "aladhan: down; local: broken"):
+            run_with_fallback(sources, budget=5)
+
+
+class TestPreferredSource(SimpleTestCase):
+    @override_settings(PRAYER_TIMES_BACKEND="aladhan", PRAYER_TIMES_LOCAL_LATITUDE=60)
+    def test_aladhan_first_unless_high_latitude_or_per_day_angles(self):
+        self.assertEqual(fallback.preferred_source(49.0), "aladhan")
+        self.assertEqual(fallback.preferred_source(-65.0), "local")
+        self.assertEqual(fallback.preferred_source(49.0, per_day_angles=True), "local")
+
+    @override_settings(PRAYER_TIMES_BACKEND="local")
+    def test_local_backend_skips_aladhan(self):
+        self.assertEqual(fallback.preferred_source(49.0), "local")
+        sources = fallback._sources(
+            {"latitude": 49.0, "longitude": 12.1, "calculation_method": "mwl"}, mock.Mock(), mock.Mock()
+        )
+        self.assertEqual([name for name, _ in sources], ["local", "fourier-csv"])
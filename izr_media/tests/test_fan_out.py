@@ -0,0 +1,73 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from izr_media.prayer_times.archive import ArchiveMissError
+from izr_media.prayer_times.calculation import InvalidResponseError, PrayerTimesCalculator
+from izr_media.prayer_times.http_client import Deadline
+
+
+def month_days(month, year, hijri=False):
+    return [{"Datum": f"01-{month:02d}-{year}"}]
+
+
+class TestFanOut(SimpleTestCase):
+    def setUp(self):
+        self.calculator = PrayerTimesCalculator(49.0, 12.1, "mwl")
+        self.calls = []
+
+    def fetch(self, failures):
+        """Monthly fetch that fails the first ``failures[month]`` calls of a month."""
+        failures = dict(failures)
+        lock = threading.Lock()
+
+        def fetch_month(month, year, hijri=False):
+            with lock:
+                self.calls.append(month)
+                if failures.get(month, 0):
+                    failures[month] -= 1
+                    raise InvalidResponseError(f"month {month} failed")
+            return month_days(month, year)
+
+        return mock.patch.object(self.calculator, "fetch_monthly_prayer_times", side_effect=fetch_month)
+
+    def test_failed_months_are_requested_again(self):
+        with self.fetch({3: 1, 7: 2}):
+            days = self.calculator.fetch_annual_prayer_times(2025, fan_out=True)
+        self.assertEqual([day["Datum"] for day in days], [f"01-{m:02d}-2025" for m in range(1, 13)])
+        self.assertEqual(sorted(self.calls), sorted(list(range(1, 13)) + [3, 7, 7]))
+
+    def test_month_failing_every_round_fails_the_year(self):
+        with self.fetch({5: 3}), self.assertRaisesRegex(InvalidResponseError, r"Failed months: \[5\]"):
+            self.calculator.fetch_annual_prayer_times(2025, fan_out=True)
+        self.assertEqual(self.calls.count(5), 3)
+
+    def test_replay_miss_is_not_requested_again(self):
+        def fetch_month(month, year, hijri=False):
+            self.calls.append(month)
+            if month == 2:
+                raise ArchiveMissError("calendar/2025/2")
+            return month_days(month, year)
+
+        with mock.patch.object(self.calculator, "fetch_monthly_prayer_times", side_effect=fetch_month), \
+                self.assertRaises(ArchiveMissError):
+            self.calculator.fetch_annual_prayer_times(2025, fan_out=True)
+        self.assertEqual(self.calls.count(2), 1)
+
+    def test_months_pending_at_the_deadline_are_given_up(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.calculator.deadline = Deadline(0.2)
+
+        def fetch_month(month, year, hijri=False):
+            self.calls.append(month)
+            if month == 12:
+                release.wait(5)
+            return month_days(month, year)
+
+        with mock.patch.object(self.calculator, "fetch_monthly_prayer_times", side_effect=fetch_month), \
+                self.assertRaisesRegex(InvalidResponseError, r"Failed months: \[12\]"):
+            self.calculator.fetch_annual_prayer_times(2025, fan_out=True)
+        # No second round once the deadline passed
+        self.assertEqual(self.calls.count(12), 1)
@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+from io import StringIO
+from pathlib import Path
+import tempfile
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from izr_media.management.commands import fit_fourier
+
+REGENSBURG = dict(latitude=49.007734, longitude=12.102841)
+
+
+class TestFitFourierCsv(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        patcher = mock.patch.object(fit_fourier.PrayerCalculationConfig.objects, "first", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def csv(self, rows):
+        path = Path(self.root.name) / "times.csv"
+        lines = ["Day;Fajr;Isha"] + [f"{day + 1};05:{day % 60:02d};20:{day % 60:02d}" for day in range(rows)]
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    def fitted_ordinals(self, rows, year):
+        with mock.patch.object(fit_fourier, "fit", wraps=fit_fourier.fit) as fit:
+            call_command(
+                "fit_fourier", csv=self.csv(rows), year=year, dry_run=True, stdout=StringIO(), **REGENSBURG
+            )
+        ordinals = fit.call_args_list[0].args[0]
+        return [date.fromordinal(ordinal) for ordinal in ordinals.tolist()]
+
+    def test_common_year_rows_skip_feb_29(self):
+        days = self.fitted_ordinals(365, 2024)
+        self.assertEqual(len(days), 365)
+        self.assertNotIn(date(2024, 2, 29), days)
+        self.assertEqual((days[58], days[59], days[-1]), (date(2024, 2, 28), date(2024, 3, 1), date(2024, 12, 31)))
+
+    def test_leap_year_rows_are_consecutive(self):
+        days = self.fitted_ordinals(366, 2024)
+        self.assertEqual(days, [date(2024, 1, 1) + timedelta(days=day) for day in range(366)])
+
+    def test_common_year(self):
+        self.assertEqual(self.fitted_ordinals(365, 2025)[-1], date(2025, 12, 31))
+
+    def test_rows_not_fitting_the_year_are_rejected(self):
+        for rows, year in ((364, 2025), (366, 2025), (367, 2024)):
+            with self.subTest(rows=rows, year=year), self.assertRaises(CommandError):
+                self.fitted_ordinals(rows, year)
@@ -0,0 +1,39 @@
+from datetime import date
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from izr_media.prayer_times.fourier_table import CSV_YEAR, regensburg_table
+from izr_media.prayer_times.local_calculation import LocalPrayerTimesCalculator
+
+
+class TestFourierTableRange(SimpleTestCase):
+    def test_csv_year_is_returned_unchanged(self):
+        columns = regensburg_table.columns()
+        shifted = regensburg_table.range(date(CSV_YEAR, 1, 1), 365)
+        for name, values in columns.items():
+            np.testing.assert_array_equal(shifted[name], values, err_msg=name)
+
+    def test_other_years_follow_their_own_dst_switches(self):
+        # Sunrise and Maghrib of the CSV are aladhan's, so any day on the wrong
+        # side of a DST switch would be an hour off the local engine
+        calculator = LocalPrayerTimesCalculator(
+            latitude=49.007734, longitude=12.102841, calculation_method="izr",
+            fajr_angle=18, isha_angle=18,
+        )
+        for year in (2026, 2027, 2028):
+            with self.subTest(year=year):
+                first = date(year, 1, 1)
+                days = (date(year + 1, 1, 1) - first).days
+                columns = regensburg_table.range(first, days)
+                table = calculator.compute_years(year)
+                for column, timing in (("Shuruq", "Sunrise"), ("Maghrib", "Maghrib")):
+                    difference = np.abs(columns[column] - table.times[timing])
+                    self.assertLessEqual(difference.max(), 2, column)
+
+    def test_dst_switch_days(self):
+        # 2026 switches on Mar 29 and Oct 25, a week before 2025's Mar 30 / Oct 26
+        fajr = regensburg_table.range(date(2026, 3, 28), 2)["Fajr"].astype(int)
+        self.assertGreater(fajr[1] - fajr[0], 30)
+        fajr = regensburg_table.range(date(2026, 10, 24), 2)["Fajr"].astype(int)
+        self.assertLess(fajr[1] - fajr[0], -30)
@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+
+from django.test import SimpleTestCase
+
+from izr_media.prayer_times.calculation import PrayerTimesCalculator
+from izr_media.prayer_times.hijri import apply_hijri, format_hijri, hijri_month_range, to_hijri
+
+
+def rows(first, count):
+    return [
+        {"Datum": (first + timedelta(days=offset)).strftime("%d-%m-%Y")} for offset in range(count)
+    ]
+
+
+def aladhan_day(gregorian, year, month, day):
+    return {
+        "date": {
+            "gregorian": {"date": gregorian},
+            "hijri": {"year": str(year), "month": {"number": month}, "day": f"{day:02d}"},
+        },
+        "timings": dict.fromkeys(
+            ("Fajr", "Sunrise", "Dhuhr", "Asr", "Maghrib", "Isha"), "05:00 (CET)"
+        ),
+    }
+
+
+class TestApplyHijri(SimpleTestCase):
+    def test_labels_follow_the_day(self):
+        records = apply_hijri(rows(date(2025, 2, 28), 2))
+        self.assertEqual([record["Hijri"] for record in records], ["29 Shaʿban 1446", "01 Ramadan 1446"])
+        self.assertEqual(records[1]["Hijri_ar"], format_hijri(1446, 9, 1)[1])
+
+    def test_correction_day_shows_a_later_date(self):
+        records = apply_hijri(rows(date(2025, 2, 28), 2), correction_day=1)
+        self.assertEqual([record["Hijri"] for record in records], ["01 Ramadan 1446", "02 Ramadan 1446"])
+        self.assertEqual(hijri_month_range(1446, 9, 1)[0], date(2025, 2, 28))
+
+    def test_negative_correction_across_the_year_end(self):
+        first = date(2024, 12, 30)
+        records = apply_hijri(rows(first, 4), correction_day=-2)
+        years, months, days = to_hijri([first.toordinal() - 2 + offset for offset in range(4)])
+        expected = [format_hijri(*day)[0] for day in zip(years.tolist(), months.tolist(), days.tolist())]
+        self.assertEqual([record["Hijri"] for record in records], expected)
+
+    def test_every_day_of_a_year_with_correction(self):
+        first = date(2025, 1, 1)
+        records = apply_hijri(rows(first, 365), correction_day=2)
+        years, months, days = to_hijri([first.toordinal() + 2 + offset for offset in range(365)])
+        expected = [format_hijri(*day)[0] for day in zip(years.tolist(), months.tolist(), days.tolist())]
+        self.assertEqual([record["Hijri"] for record in records], expected)
+
+
+class TestAladhanHijri(SimpleTestCase):
+    def test_relabelled_as_year_month_day(self):
+        calculator = PrayerTimesCalculator(49.0, 12.1, "mwl")
+        record = calculator._format_response(aladhan_day("01-03-2025", 1446, 9, 1))
+        self.assertEqual((record["Hijri"], record["Hijri_ar"]), format_hijri(1446, 9, 1))
+        self.assertEqual(record["Hijri"], "01 Ramadan 1446")
+        self.assertEqual(record["Fajr"], "05:00")
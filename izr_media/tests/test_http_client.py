@@ -0,0 +1,161 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+import requests
+
+from izr_media.prayer_times import http_client
+from izr_media.prayer_times.http_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    DeadlineExceededError,
+    UpstreamClient,
+)
+
+URL = "https://api.aladhan.com/v1/calendar/2025/1"
+
+
+class Clock:
+    """Stand-in for ``time.monotonic`` that only moves when told to."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(SimpleTestCase):
+    def setUp(self):
+        self.clock = Clock()
+        patcher = mock.patch.object(http_client.time, "monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    def open_circuit(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.retry_in(), 30)
+
+    def test_success_resets_the_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_lets_one_trial_through(self):
+        self.open_circuit()
+        self.clock.now += 30
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_successful_trial_closes(self):
+        self.open_circuit()
+        self.clock.now += 30
+        self.breaker.allow()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_trial_opens_again(self):
+        self.open_circuit()
+        self.clock.now += 30
+        self.breaker.allow()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.retry_in(), 30)
+
+    def test_cancelled_trial_lets_another_through(self):
+        self.open_circuit()
+        self.clock.now += 30
+        self.breaker.allow()
+        self.breaker.record_cancelled()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+
+
+class TestRetryPolicy(SimpleTestCase):
+    def test_only_gets_are_retried_on_transient_statuses(self):
+        session = UpstreamClient(max_retries=2)._build_session()
+        retry = session.get_adapter(URL).max_retries
+        self.assertEqual((retry.total, retry.connect, retry.read, retry.status), (2, 2, 2, 2))
+        self.assertEqual(set(retry.status_forcelist), {429, 500, 502, 503, 504})
+        self.assertEqual(retry.allowed_methods, frozenset({"GET"}))
+        self.assertFalse(retry.respect_retry_after_header)
+        self.assertFalse(retry.raise_on_status)
+
+    def test_session_is_rebuilt_after_a_fork(self):
+        client = UpstreamClient()
+        session = client.session
+        self.assertIs(client.session, session)
+        with mock.patch.object(http_client.os, "getpid", return_value=-1):
+            self.assertIsNot(client.session, session)
+
+
+class TestDeadline(SimpleTestCase):
+    def test_timeouts_are_cut_to_fit_all_attempts(self):
+        client = UpstreamClient(connect_timeout=3.05, read_timeout=8.0, max_retries=2)
+        self.assertEqual(client.timeout_within(None), (3.05, 8.0))
+        with mock.patch.object(Deadline, "remaining", return_value=6.0 + http_client.MAX_BACKOFF):
+            self.assertEqual(client.timeout_within(Deadline(0)), (2.0, 2.0))
+        with mock.patch.object(Deadline, "remaining", return_value=0.0):
+            self.assertEqual(client.timeout_within(Deadline(0)), (0.1, 0.1))
+
+    def test_expire_ends_the_deadline_early(self):
+        deadline = Deadline(60)
+        self.assertFalse(deadline.expired)
+        deadline.expire()
+        self.assertTrue(deadline.expired)
+        self.assertEqual(deadline.remaining(), 0.0)
+
+
+class TestUpstreamClient(SimpleTestCase):
+    def setUp(self):
+        self.client = UpstreamClient(breaker=CircuitBreaker(failure_threshold=1))
+        self.session = mock.Mock()
+        self.client._session = self.session
+        self.client._session_pid = http_client.os.getpid()
+
+    def test_no_call_after_the_deadline(self):
+        deadline = Deadline(60)
+        deadline.expire()
+        with self.assertRaises(DeadlineExceededError):
+            self.client.get(URL, deadline=deadline)
+        self.session.get.assert_not_called()
+
+    def test_server_error_opens_the_circuit(self):
+        self.session.get.return_value = mock.Mock(status_code=503)
+        self.client.get(URL)
+        with self.assertRaises(CircuitOpenError):
+            self.client.get(URL)
+        self.assertEqual(self.session.get.call_count, 1)
+        self.assertEqual(self.client.latency.summary()["calendar"]["errors"], 1)
+
+    def test_timeout_cut_by_the_deadline_is_not_a_failure(self):
+        deadline = Deadline(60)
+
+        def time_out(*args, **kwargs):
+            deadline.expire()
+            raise requests.Timeout()
+
+        self.session.get.side_effect = time_out
+        with self.assertRaises(requests.Timeout):
+            self.client.get(URL, deadline=deadline)
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_timeout_within_the_deadline_is_a_failure(self):
+        self.session.get.side_effect = requests.Timeout()
+        with self.assertRaises(requests.Timeout):
+            self.client.get(URL, deadline=Deadline(60))
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.OPEN)
@@ -0,0 +1,94 @@
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+import numpy as np
+
+from izr_media.prayer_times.compact import CompactTable
+from izr_media.prayer_times.countdown import INDEX_PRAYERS, PrayerIndex, build_prayer_index
+from izr_media.prayer_times.ics import LINE_OCTETS, iter_ics
+from izr_media.prayer_times.local_calculation import LocalPrayerTimesCalculator, timezone_name
+
+REGENSBURG = (49.007734, 12.102841)
+BERLIN = ZoneInfo("Europe/Berlin")
+STAMP = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def records(first, last):
+    calculator = LocalPrayerTimesCalculator(*REGENSBURG, calculation_method="izr", fajr_angle=18, isha_angle=18)
+    return calculator.compute_table(first, last).records()
+
+
+def index_of(rows):
+    return build_prayer_index(CompactTable.from_records(rows), timezone_name(*REGENSBURG), REGENSBURG[1])
+
+
+def calendar(index, **kwargs):
+    kwargs.setdefault("calendar_name", "Gebetszeiten Regensburg")
+    kwargs.setdefault("uid_prefix", "regensburg")
+    return "".join(iter_ics(index, stamp=STAMP, **kwargs))
+
+
+def unfolded(ics):
+    return ics.replace("\r\n ", "").split("\r\n")
+
+
+def starts(ics):
+    """Local (Berlin) date and time of each DTSTART, with the event's SUMMARY."""
+    lines = unfolded(ics)
+    return [
+        (
+            datetime.strptime(line[8:], "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc).astimezone(BERLIN),
+            summary[8:],
+        )
+        for line, summary in zip(lines, lines[2:])
+        if line.startswith("DTSTART:")
+    ]
+
+
+class TestIcs(SimpleTestCase):
+    def test_utc_starts_across_daylight_saving_changes(self):
+        for first, last in ((date(2025, 3, 29), date(2025, 3, 31)), (date(2025, 10, 25), date(2025, 10, 27))):
+            rows = records(first, last)
+            events = starts(calendar(index_of(rows), prayers=INDEX_PRAYERS))
+            with self.subTest(first=first):
+                self.assertEqual(len(events), 6 * len(rows))
+                for (moment, prayer), (row, name) in zip(
+                    events, ((row, name) for row in rows for name in INDEX_PRAYERS)
+                ):
+                    self.assertEqual(prayer, name)
+                    self.assertEqual(moment.strftime("%d-%m-%Y %H:%M"), f"{row['Datum']} {row[name]}")
+
+    def test_utc_offset_changes_with_the_clock(self):
+        rows = records(date(2025, 3, 29), date(2025, 3, 30))
+        dhuhr = [line for line in unfolded(calendar(index_of(rows), prayers=["Dhuhr"])) if line.startswith("DTSTART:")]
+        local = [int(row["Dhuhr"][:2]) for row in rows]
+        utc = [int(line[17:19]) for line in dhuhr]
+        self.assertEqual([hour - utc_hour for hour, utc_hour in zip(local, utc)], [1, 2])
+
+    def test_text_is_escaped_and_folded(self):
+        name = "Gebetszeiten Regensburg, Süd; Moschee\\Gemeinde " + "ä" * 40
+        ics = calendar(index_of(records(date(2025, 1, 1), date(2025, 1, 1))), calendar_name=name)
+        for line in ics.split("\r\n"):
+            self.assertLessEqual(len(line.encode("utf-8")), LINE_OCTETS)
+        calname = next(line for line in unfolded(ics) if line.startswith("X-WR-CALNAME:"))
+        self.assertEqual(
+            calname,
+            "X-WR-CALNAME:Gebetszeiten Regensburg\\, Süd\\; Moschee\\\\Gemeinde " + "ä" * 40,
+        )
+
+    def test_selection_alarm_and_stable_output(self):
+        index = index_of(records(date(2025, 1, 1), date(2025, 1, 31)))
+        ics = calendar(index, prayers=["Fajr"], alarm_minutes=10)
+        lines = unfolded(ics)
+        self.assertEqual(lines[0], "BEGIN:VCALENDAR")
+        self.assertEqual(lines[-2:], ["END:VCALENDAR", ""])
+        self.assertEqual({prayer for _, prayer in starts(ics)}, {"Fajr"})
+        self.assertEqual(lines.count("TRIGGER:-PT10M"), 31)
+        self.assertIn("UID:regensburg-fajr-20250101", lines)
+        self.assertIn("DTSTAMP:20250101T000000Z", lines)
+        self.assertEqual(calendar(index, prayers=["Fajr"], alarm_minutes=10, events_per_chunk=5), ics)
+
+    def test_empty_index(self):
+        empty = PrayerIndex(instants=np.array([], dtype=np.int64), prayers=np.array([], dtype=np.uint8))
+        self.assertNotIn("BEGIN:VEVENT", calendar(empty))
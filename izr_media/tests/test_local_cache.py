@@ -0,0 +1,99 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+import redis
+
+from izr_media.prayer_times import fourier_table, local_cache
+from izr_media.prayer_times.local_cache import LocalCache, _clear_hooks
+
+
+def subscribed_cache(**kwargs):
+    cache = LocalCache(**kwargs)
+    cache.subscribed = True
+    return cache
+
+
+class TestLocalCache(SimpleTestCase):
+    def test_set_with_a_stale_generation_is_dropped(self):
+        cache = subscribed_cache()
+        generation = cache.generation
+        cache.clear()
+        cache.set("key", "read before the clear", generation=generation)
+        self.assertIsNone(cache.get("key"))
+        cache.set("key", "read after the clear", generation=cache.generation)
+        self.assertEqual(cache.get("key"), "read after the clear")
+
+    def test_nothing_is_served_or_stored_while_unsubscribed(self):
+        cache = subscribed_cache()
+        cache.set("key", "value")
+        cache.subscribed = False
+        self.assertIsNone(cache.get("key"))
+        cache.set("other", "value")
+        cache.subscribed = True
+        self.assertIsNone(cache.get("other"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = subscribed_cache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+
+    def test_expired_entry_is_missing(self):
+        cache = subscribed_cache(ttl=60)
+        with mock.patch("izr_media.prayer_times.local_cache.time.monotonic", return_value=1000.0):
+            cache.set("key", "value", ttl=10)
+        with mock.patch("izr_media.prayer_times.local_cache.time.monotonic", return_value=1011.0):
+            self.assertIsNone(cache.get("key"))
+
+    def test_lost_subscription_clears_and_unsubscribes(self):
+        cache = LocalCache()
+        states = []
+        pubsub = mock.Mock()
+
+        def messages():
+            states.append(cache.subscribed)
+            yield {"data": "config saved"}
+            raise redis.ConnectionError("gone")
+
+        pubsub.listen.side_effect = messages
+        client = mock.Mock(pubsub=mock.Mock(return_value=pubsub))
+        with mock.patch.object(local_cache.time, "sleep", side_effect=StopIteration), \
+                self.assertLogs(local_cache.logger, "WARNING"), self.assertRaises(StopIteration):
+            cache.listen(client)
+        self.assertEqual(states, [True])
+        self.assertFalse(cache.subscribed)
+        # Cleared on subscribe, on the message and when the subscription was lost
+        self.assertEqual(cache.generation, 3)
+        pubsub.close.assert_called_once_with()
+
+    def test_outage_clears_once_and_backs_off(self):
+        cache = LocalCache()
+        # Subscribed, lost, three failed attempts, subscribed and lost again
+        pubsub = mock.Mock()
+        pubsub.subscribe.side_effect = [None] + [redis.ConnectionError("down")] * 3 + [None]
+        pubsub.listen.side_effect = redis.ConnectionError("gone")
+        client = mock.Mock(pubsub=mock.Mock(return_value=pubsub))
+        sleep = mock.Mock(side_effect=[None] * 4 + [StopIteration])
+        with mock.patch.object(local_cache.time, "sleep", sleep), \
+                self.assertLogs(local_cache.logger, "DEBUG") as logs, self.assertRaises(StopIteration):
+            cache.listen(client)
+        # Cleared on each subscribe and each loss, not on the failed attempts
+        self.assertEqual(cache.generation, 4)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [5.0, 10.0, 20.0, 40.0, 5.0])
+        self.assertEqual(sum(line.startswith("WARNING") for line in logs.output), 2)
+
+    def test_failed_publish_is_logged(self):
+        client = mock.Mock(publish=mock.Mock(side_effect=redis.ConnectionError("gone")))
+        with self.settings(REDIS_CLIENT=client), self.assertLogs(local_cache.logger, "WARNING") as logs:
+            local_cache.invalidate_local_caches("test")
+        self.assertIn("Could not publish L1 cache invalidation", logs.output[0])
+
+
+class TestClearHooks(SimpleTestCase):
+    def test_stored_fits_are_dropped_with_the_l1_cache(self):
+        self.assertIn(fourier_table.clear_stored_fits, _clear_hooks)
+        with mock.patch.object(fourier_table._stored_fits, "cache_clear") as cache_clear:
+            LocalCache(hooks=_clear_hooks).clear()
+        cache_clear.assert_called_once_with()
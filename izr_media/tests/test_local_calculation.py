@@ -0,0 +1,147 @@
+import csv
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from izr_media.prayer_times.local_calculation import LocalPrayerTimesCalculator
+from izr_media.prayer_times.table import MINUTE_LABELS
+
+REGENSBURG = dict(latitude=49.007734, longitude=12.102841)
+OSLO = dict(latitude=59.9139, longitude=10.7522)
+DAY = date(2025, 6, 21)
+# Published 2025 Regensburg times; Shuruq, Dhuhr and Maghrib are aladhan's
+REGENSBURG_CSV = (
+    Path(__file__).resolve().parent.parent / "prayer_times" / "prayer-times-isha-fajr-fourier-fit.csv"
+)
+
+# PrayTimes 2.3 (the algorithm aladhan runs) for Regensburg, izr method at
+# 18°/18°, angle based high-latitude rule, Shafi Asr
+PRAYTIMES_REGENSBURG = {
+    date(2025, 1, 1): {
+        "Imsak": "06:00", "Fajr": "06:10", "Sunrise": "08:06", "Dhuhr": "12:15", "Asr": "14:08",
+        "Sunset": "16:25", "Maghrib": "16:25", "Isha": "18:21", "Midnight": "00:15",
+    },
+    # First day of daylight saving time
+    date(2025, 3, 30): {
+        "Imsak": "04:53", "Fajr": "05:03", "Sunrise": "06:53", "Dhuhr": "13:16", "Asr": "16:48",
+        "Sunset": "19:40", "Maghrib": "19:40", "Isha": "21:30", "Midnight": "01:16",
+    },
+    # The sun stays above -18°, Fajr and Isha come from the high-latitude rule
+    date(2025, 6, 21): {
+        "Imsak": "02:37", "Fajr": "02:47", "Sunrise": "05:07", "Dhuhr": "13:13", "Asr": "17:31",
+        "Sunset": "21:20", "Maghrib": "21:20", "Isha": "23:40", "Midnight": "01:13",
+    },
+    # Last day of daylight saving time
+    date(2025, 10, 26): {
+        "Imsak": "04:53", "Fajr": "05:03", "Sunrise": "06:49", "Dhuhr": "11:56", "Asr": "14:32",
+        "Sunset": "17:01", "Maghrib": "17:01", "Isha": "18:47", "Midnight": "23:55",
+    },
+    date(2025, 12, 21): {
+        "Imsak": "05:56", "Fajr": "06:06", "Sunrise": "08:03", "Dhuhr": "12:10", "Asr": "14:00",
+        "Sunset": "16:17", "Maghrib": "16:17", "Isha": "18:13", "Midnight": "00:10",
+    },
+}
+
+# Calculator argument of each value of the aladhan tune string, and the engine
+# timing it moves
+TUNES = {
+    "imsak_tune": "Imsak",
+    "fajr_tune": "Fajr",
+    "sunrise_tune": "Sunrise",
+    "dhuhr_tune": "Dhuhr",
+    "asr_tune": "Asr",
+    "maghrib_tune": "Maghrib",
+    "sunset_tune": "Sunset",
+    "isha_tune": "Isha",
+    "midnight_tune": "Midnight",
+}
+
+
+def izr_times(day=DAY, **kwargs):
+    """Minutes since midnight of every timing of ``day`` with the izr method."""
+    kwargs = {**REGENSBURG, "fajr_angle": 18, "isha_angle": 18, **kwargs}
+    calculator = LocalPrayerTimesCalculator(calculation_method="izr", **kwargs)
+    table = calculator.compute_table(day, day)
+    return {name: float(values[0]) for name, values in table.times.items()}
+
+
+def labels(times):
+    return {name: MINUTE_LABELS[int(minutes) % 1440] for name, minutes in times.items()}
+
+
+class TestReferenceTimes(SimpleTestCase):
+    def test_izr_method_matches_praytimes(self):
+        for day, expected in PRAYTIMES_REGENSBURG.items():
+            with self.subTest(day=day):
+                self.assertEqual(labels(izr_times(day)), expected)
+
+    def test_year_matches_published_regensburg_times(self):
+        with open(REGENSBURG_CSV, newline="") as f:
+            rows = list(csv.DictReader(f, delimiter=";"))
+        calculator = LocalPrayerTimesCalculator(
+            **REGENSBURG, calculation_method="izr", fajr_angle=18, isha_angle=18
+        )
+        computed = calculator.compute_years(2025).records()
+        self.assertEqual(len(computed), len(rows))
+        for offset, (row, record) in enumerate(zip(rows, computed)):
+            for column in ("Shuruq", "Dhuhr", "Maghrib"):
+                self.assertEqual(
+                    record[column], row[column], f"{column} on {date(2025, 1, 1) + timedelta(offset)}"
+                )
+
+    def test_high_latitude_rules(self):
+        expected = {
+            # Regensburg at midsummer, Fajr and Isha undefined at 18°
+            ("regensburg", "angle based"): ("02:47", "23:40"),
+            ("regensburg", "one seventh"): ("04:00", "22:26"),
+            ("regensburg", "middle of the night"): ("01:13", "01:13"),
+            # Oslo, 18°/17°
+            ("oslo", "angle based"): ("02:21", "00:12"),
+            ("oslo", "one seventh"): ("03:10", "23:28"),
+            ("oslo", "middle of the night"): ("01:19", "01:19"),
+        }
+        for (city, method), (fajr, isha) in expected.items():
+            with self.subTest(city=city, method=method):
+                location = OSLO if city == "oslo" else REGENSBURG
+                times = labels(
+                    izr_times(
+                        **location,
+                        isha_angle=17 if city == "oslo" else 18,
+                        latitudeAdjustmentMethod=method,
+                    )
+                )
+                self.assertEqual((times["Fajr"], times["Isha"]), (fajr, isha))
+
+    def test_hanafi_asr_and_jafari_midnight(self):
+        times = labels(izr_times(school="hanafi", midnightMode="jafari"))
+        self.assertEqual(times["Asr"], "18:45")
+        self.assertEqual(times["Midnight"], "00:03")
+
+    def test_all_tunes_match_praytimes(self):
+        times = izr_times(
+            tune=True, imsak_tune=1, fajr_tune=2, sunrise_tune=-3, dhuhr_tune=4, asr_tune=5,
+            maghrib_tune=6, sunset_tune=-7, isha_tune=8, midnight_tune=9,
+        )
+        self.assertEqual(
+            labels(times),
+            {
+                "Imsak": "02:38", "Fajr": "02:49", "Sunrise": "05:04", "Dhuhr": "13:17", "Asr": "17:36",
+                "Sunset": "21:13", "Maghrib": "21:26", "Isha": "23:48", "Midnight": "01:22",
+            },
+        )
+
+
+class TestTunes(SimpleTestCase):
+    def test_each_tune_moves_its_own_timing(self):
+        plain = izr_times()
+        for argument, name in TUNES.items():
+            with self.subTest(argument):
+                tuned = izr_times(tune=True, **{argument: 3})
+                self.assertEqual(tuned[name] - plain[name], 3)
+
+    def test_maghrib_and_sunset_tunes_are_not_swapped(self):
+        plain = izr_times()
+        tuned = izr_times(tune=True, maghrib_tune=3, sunset_tune=-2)
+        self.assertEqual(tuned["Maghrib"] - plain["Maghrib"], 3)
+        self.assertEqual(tuned["Sunset"] - plain["Sunset"], -2)
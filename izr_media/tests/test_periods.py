@@ -0,0 +1,63 @@
+from datetime import date
+
+from django.test import SimpleTestCase
+
+from izr_media.prayer_times.periods import period_bounds, year_slices
+
+TODAY = date(2025, 12, 31)
+
+
+class TestPeriodBounds(SimpleTestCase):
+    def test_defaults_to_the_current_period(self):
+        self.assertEqual(period_bounds("annual", today=TODAY), (date(2025, 1, 1), date(2025, 12, 31)))
+        self.assertEqual(period_bounds("day", today=TODAY), (TODAY, TODAY))
+        self.assertEqual(period_bounds("month", today=TODAY), (date(2025, 12, 1), date(2025, 12, 31)))
+
+    def test_week_across_the_year_end(self):
+        # Wednesday Dec 31, 2025: Monday Dec 29 to Sunday Jan 4
+        self.assertEqual(period_bounds("week", today=TODAY), (date(2025, 12, 29), date(2026, 1, 4)))
+        self.assertEqual(period_bounds("week", "2026-01-01"), (date(2025, 12, 29), date(2026, 1, 4)))
+
+    def test_month_lengths(self):
+        self.assertEqual(period_bounds("month", "2024-02"), (date(2024, 2, 1), date(2024, 2, 29)))
+        self.assertEqual(period_bounds("month", "2025-02"), (date(2025, 2, 1), date(2025, 2, 28)))
+        self.assertEqual(period_bounds("month", "2025-12"), (date(2025, 12, 1), date(2025, 12, 31)))
+
+    def test_range_across_the_year_end(self):
+        self.assertEqual(
+            period_bounds("range", date_from="2025-12-20", date_to="2026-01-10"),
+            (date(2025, 12, 20), date(2026, 1, 10)),
+        )
+        self.assertEqual(
+            period_bounds("range", date_from="2024-01-01", date_to="2024-12-31"),
+            (date(2024, 1, 1), date(2024, 12, 31)),
+        )
+
+    def test_invalid_periods(self):
+        for args, kwargs in (
+            (("range",), {"date_from": "2025-01-01"}),
+            (("range",), {"date_from": "2025-01-02", "date_to": "2025-01-01"}),
+            (("range",), {"date_from": "2024-01-01", "date_to": "2025-01-01"}),
+            (("month", "2025-13"), {}),
+            (("day", "31-12-2025"), {}),
+            (("fortnight",), {}),
+        ):
+            with self.subTest(args=args, **kwargs), self.assertRaises(ValueError):
+                period_bounds(*args, **kwargs)
+
+
+class TestYearSlices(SimpleTestCase):
+    def test_within_one_year(self):
+        self.assertEqual(list(year_slices(date(2025, 3, 1), date(2025, 3, 31))), [(2025, slice(59, 90))])
+        self.assertEqual(list(year_slices(date(2024, 3, 1), date(2024, 3, 1))), [(2024, slice(60, 61))])
+
+    def test_across_the_year_end(self):
+        self.assertEqual(
+            list(year_slices(date(2025, 12, 29), date(2026, 1, 4))),
+            [(2025, slice(362, 365)), (2026, slice(0, 4))],
+        )
+
+    def test_through_a_whole_leap_year(self):
+        slices = list(year_slices(date(2023, 12, 31), date(2025, 1, 1)))
+        self.assertEqual(slices, [(2023, slice(364, 365)), (2024, slice(0, 366)), (2025, slice(0, 1))])
+        self.assertEqual(sum(rows.stop - rows.start for _, rows in slices), 368)
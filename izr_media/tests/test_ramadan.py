@@ -0,0 +1,98 @@
+from datetime import date, datetime, time
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from izr_media.prayer_times import views
+from izr_media.prayer_times.compact import CompactTable
+from izr_media.prayer_times.local_calculation import LocalPrayerTimesCalculator
+
+CONFIG = SimpleNamespace(
+    calculation_type="static", default_latitude=49.007734, default_longitude=12.102841,
+    fajr_angle=18, isha_angle=18, correction_day=0,
+    jumaa_time=time(13, 0), tarawih_time=time(21, 30),
+    imsak_tune=0, fajr_tune=0,
+)
+IQAMA = SimpleNamespace(fajr=20, dhuhr=10, asr=10, maghrib=5, isha=15)
+
+
+def local_range(config, city_name, lat, lng, first, last, **kwargs):
+    calculator = LocalPrayerTimesCalculator(lat, lng, calculation_method="izr", fajr_angle=18, isha_angle=18)
+    return "local", CompactTable.from_records(calculator.compute_table(first, last).records())
+
+
+def minutes(label):
+    hours, mins = label.split(":")
+    return int(hours) * 60 + int(mins)
+
+
+def on(day):
+    """A ``datetime`` whose ``now`` is noon of ``day``."""
+    return type("FixedDatetime", (datetime,), {"now": classmethod(lambda cls: cls(day.year, day.month, day.day, 12))})
+
+
+class TestRamadanTimetable(SimpleTestCase):
+    def setUp(self):
+        self.redis = mock.Mock(get=mock.Mock(return_value=None))
+        for patcher in (
+            mock.patch.object(views.PrayerCalculationConfig.objects, "latest", return_value=CONFIG),
+            mock.patch.object(views.PrayerConfig.objects, "filter", return_value=mock.Mock(first=lambda: IQAMA)),
+            mock.patch.object(views, "range_prayer_times", side_effect=local_range),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        redis_settings = override_settings(REDIS_CLIENT=self.redis)
+        redis_settings.enable()
+        self.addCleanup(redis_settings.disable)
+
+    def get(self, **params):
+        return views.get_ramadan_timetable(RequestFactory().get("/prayer-times/ramadan", params))
+
+    def timetable(self, **params):
+        response = self.get(**params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response[views.SOURCE_HEADER], json.loads(response.content)
+
+    def test_days_of_the_month(self):
+        source, payload = self.timetable(year=1446)
+        self.assertEqual(source, "local")
+        self.assertEqual((payload["start"], payload["end"]), ("2025-03-01", "2025-03-29"))
+        days = payload["days"]
+        self.assertEqual(len(days), 29)
+        self.assertEqual((days[0]["Datum"], days[0]["Hijri"]), ("01-03-2025", "01 Ramadan 1446"))
+        self.assertEqual(days[-1]["Hijri"], "29 Ramadan 1446")
+
+    def test_imsak_iftar_tarawih_and_iqama(self):
+        _, payload = self.timetable(year=1446)
+        for row in payload["days"]:
+            self.assertEqual(minutes(row["Fajr"]) - minutes(row["Imsak"]), 10)
+            self.assertEqual(row["Tarawih"], "21:30")
+            self.assertEqual(minutes(row["Iqama"]["Fajr"]) - minutes(row["Fajr"]), 20)
+            self.assertEqual(minutes(row["Iqama"]["Maghrib"]) - minutes(row["Iftar"]), 5)
+        fridays = [row["Datum"] for row in payload["days"] if "Jumaa" in row]
+        self.assertEqual(fridays, ["07-03-2025", "14-03-2025", "21-03-2025", "28-03-2025"])
+
+    def test_correction_day_moves_the_month(self):
+        with mock.patch.object(CONFIG, "correction_day", 1):
+            _, payload = self.timetable(year=1446)
+        self.assertEqual((payload["start"], payload["end"]), ("2025-02-28", "2025-03-28"))
+        self.assertEqual(payload["days"][0]["Hijri"], "01 Ramadan 1446")
+
+    def test_next_ramadan_once_this_one_is_over(self):
+        for today, hijri_year in ((date(2025, 3, 15), 1446), (date(2025, 3, 30), 1447)):
+            with self.subTest(today=today), mock.patch.object(views, "datetime", on(today)):
+                self.assertEqual(self.timetable()[1]["hijri_year"], hijri_year)
+
+    def test_cached_for_next_time(self):
+        _, payload = self.timetable(year=1446)
+        (key, ttl, cached), _ = self.redis.setex.call_args
+        self.assertEqual(key, "ramadan:regensburg:1446:static")
+        self.assertEqual(json.loads(cached), payload)
+
+        self.redis.get.return_value = cached
+        self.assertEqual(self.timetable(year=1446), ("cache", payload))
+
+    def test_invalid_year(self):
+        self.assertEqual(self.get(year="next").status_code, 400)
@@ -0,0 +1,35 @@
+import json
+
+from django.test import SimpleTestCase
+
+from izr_media.prayer_times.streaming import CalendarStreamError, iter_calendar_days
+
+
+def chunked(body, size):
+    data = json.dumps(body, ensure_ascii=False).encode()
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+class TestIterCalendarDays(SimpleTestCase):
+    def test_annual_body_in_small_chunks(self):
+        body = {
+            "code": 200,
+            "status": "OK",
+            "data": {"1": [{"day": 1}, {"day": 2}], "2": [{"day": 3, "name": "شَعْبان"}]},
+        }
+        for size in (1, 7, 4096):
+            with self.subTest(size=size):
+                days = list(iter_calendar_days(chunked(body, size)))
+                self.assertEqual([day["day"] for day in days], [1, 2, 3])
+                self.assertEqual(days[2]["name"], "شَعْبان")
+
+    def test_monthly_body(self):
+        body = {"code": 200, "status": "OK", "data": [{"day": 1}, {"day": 2}]}
+        for size in (1, 5, 4096):
+            with self.subTest(size=size):
+                self.assertEqual([day["day"] for day in iter_calendar_days(chunked(body, size))], [1, 2])
+
+    def test_truncated_body_raises(self):
+        data = b"".join(chunked({"code": 200, "data": [{"day": 1}, {"day": 2}]}, 4096))
+        with self.assertRaises(CalendarStreamError):
+            list(iter_calendar_days([data[:-8]]))
@@ -0,0 +1,83 @@
+from datetime import date
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+import numpy as np
+
+from izr_media.prayer_times import views
+from izr_media.prayer_times.compact import COLUMNS, CompactTable
+from izr_media.prayer_times.local_calculation import LocalPrayerTimesCalculator
+from izr_media.prayer_times.sunnah import MIDNIGHT_JAFARI, sunnah_times
+from izr_media.prayer_times.table import label_minutes
+
+REGENSBURG = (49.007734, 12.102841)
+CONFIG = SimpleNamespace(
+    default_latitude=REGENSBURG[0], default_longitude=REGENSBURG[1],
+    imsak_tune=0, fajr_tune=0, sunset_tune=0, maghrib_tune=0,
+)
+
+
+def two_days(**columns):
+    """A table of Jan 1-2, 2025 with the given times ("HH:MM" per day)."""
+    times = {"Fajr": ("06:00", "06:00"), "Shuruq": ("08:00", "08:00"), "Dhuhr": ("12:00", "12:00"),
+             "Asr": ("14:00", "14:00"), "Maghrib": ("16:00", "16:00"), "Isha": ("18:00", "18:00"),
+             **columns}
+    minutes = np.stack([label_minutes(list(times[name])) for name in COLUMNS]).astype(np.uint16)
+    return CompactTable(date(2025, 1, 1), minutes)
+
+
+def local_year(config, city_name, lat, lng, method="izr", year=None, **kwargs):
+    calculator = LocalPrayerTimesCalculator(lat, lng, calculation_method=method, fajr_angle=18, isha_angle=18)
+    return "local", CompactTable.from_records(calculator.fetch_annual_prayer_times(year))
+
+
+def clock(minutes):
+    return "%02d:%02d" % divmod(int(np.floor(minutes + 0.5)) % 1440, 60)
+
+
+class TestSunnahTimes(SimpleTestCase):
+    def test_night_ends_with_the_next_morning(self):
+        first, _ = sunnah_times(two_days(Shuruq=("08:00", "07:00"), Fajr=("06:00", "05:00")))
+        # 16:00 → 07:00 is 15 hours
+        self.assertEqual((first["Midnight"], first["Last_third"]), ("23:30", "02:00"))
+
+    def test_jafari_night_ends_with_fajr(self):
+        first, _ = sunnah_times(two_days(), midnight=MIDNIGHT_JAFARI)
+        self.assertEqual((first["Midnight"], first["Last_third"]), ("23:00", "01:20"))
+
+    def test_last_third_never_before_midnight(self):
+        first, _ = sunnah_times(two_days(Fajr=("04:00", "04:00"), Shuruq=("09:00", "09:00")))
+        self.assertEqual((first["Midnight"], first["Last_third"]), ("00:30", "03:20"))
+
+
+@mock.patch.object(views, "annual_prayer_times", side_effect=local_year)
+@mock.patch.object(views.PrayerCalculationConfig.objects, "latest", return_value=CONFIG)
+class TestSunnahEndpoint(SimpleTestCase):
+    def post(self, **data):
+        request = RequestFactory().post(
+            "/prayer-times/sunnah", json.dumps({"city_name": "Testdorf", **data}),
+            content_type="application/json",
+        )
+        response = views.get_sunnah_times(request)
+        self.assertEqual(response.status_code, 200, response.content)
+        return json.loads(response.content)
+
+    def expected_night(self, year):
+        """Midnight and last third of Dec 31 from that year's Maghrib and Jan 1's Shuruq."""
+        _, this_year = local_year(CONFIG, "Testdorf", *REGENSBURG, year=year)
+        _, next_year = local_year(CONFIG, "Testdorf", *REGENSBURG, year=year + 1)
+        sunset = this_year.column("Maghrib")[-1]
+        night = next_year.column("Shuruq")[0] + 1440 - sunset
+        return clock(sunset + night / 2), clock(sunset + night * 2 / 3)
+
+    def test_december_31_uses_the_morning_of_january_1(self, *mocks):
+        day = self.post(date="2025-12-31")
+        self.assertEqual((day["Midnight"], day["Last_third"]), self.expected_night(2025))
+
+    def test_year_ends_with_december_31(self, *mocks):
+        days = self.post(value=2025)
+        self.assertEqual(len(days), 365)
+        self.assertEqual(days[-1]["Datum"], "31-12-2025")
+        self.assertEqual((days[-1]["Midnight"], days[-1]["Last_third"]), self.expected_night(2025))
@@ -0,0 +1,57 @@
+from datetime import date, time
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from izr_media.prayer_times import views
+from izr_media.prayer_times.compact import CompactTable
+from izr_media.prayer_times.local_calculation import LocalPrayerTimesCalculator
+
+CONFIG = SimpleNamespace(
+    calculation_type="static", default_latitude=49.007734, default_longitude=12.102841,
+    fajr_angle=18, isha_angle=18, correction_day=0, ramadan="off",
+    jumaa_time=time(13, 0), tarawih_time=time(21, 30),
+    imsak_tune=0, fajr_tune=0, sunrise_tune=0, dhuhr_tune=0, asr_tune=0,
+    maghrib_tune=0, sunset_tune=0, isha_tune=0, midnight_tune=0,
+)
+
+
+def today_record():
+    calculator = LocalPrayerTimesCalculator(
+        CONFIG.default_latitude, CONFIG.default_longitude, calculation_method="izr",
+        fajr_angle=18, isha_angle=18,
+    )
+    return calculator.fetch_daily_prayer_times(date.today().isoformat())
+
+
+@mock.patch.object(views.PrayerCalculationConfig.objects, "latest", return_value=CONFIG)
+class TestTodayPrayerTimes(SimpleTestCase):
+    def get(self):
+        response = views.get_today_prayer_times(RequestFactory().get("/getPrayers/"))
+        self.assertEqual(response.status_code, 200, response.content)
+        return response[views.SOURCE_HEADER], json.loads(response.content)
+
+    def from_cache(self):
+        table = CompactTable.from_records([today_record()])
+        with mock.patch.object(views, "cached_day", return_value=table):
+            return self.get()
+
+    def computed(self):
+        with mock.patch.object(views, "cached_day", return_value=None), \
+                mock.patch.object(views, "fetch_daily_with_fallback", return_value=("local", today_record())):
+            return self.get()
+
+    def test_day_of_year_on_both_paths(self, latest):
+        day = date.today().timetuple().tm_yday
+        for source, record in (self.from_cache(), self.computed()):
+            with self.subTest(source=source):
+                self.assertEqual(record["Day"], day)
+                self.assertEqual(record["Datum"], date.today().strftime("%d-%m-%Y"))
+
+    def test_same_shape_from_cache_and_computed(self, latest):
+        (cache_source, cached), (computed_source, computed) = self.from_cache(), self.computed()
+        self.assertEqual((cache_source, computed_source), ("cache", "local"))
+        self.assertEqual(list(cached), list(computed))
+        self.assertEqual(cached, computed)
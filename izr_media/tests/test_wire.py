@@ -0,0 +1,182 @@
+import csv
+from datetime import date, datetime, timezone
+import io
+import json
+from types import SimpleNamespace
+from unittest import mock, skipIf
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+import numpy as np
+
+from izr_media.prayer_times import views, wire
+from izr_media.prayer_times.compact import COLUMNS, UNDEFINED, CompactTable
+from izr_media.prayer_times.local_cache import LocalCache
+from izr_media.prayer_times.local_calculation import LocalPrayerTimesCalculator
+from izr_media.prayer_times.wire import CSV_FIELDS, WIRE_FORMATS, encode_table
+
+CONFIG = SimpleNamespace(
+    calculation_type="static", default_latitude=49.007734, default_longitude=12.102841, correction_day=1,
+)
+# Runs into the next year and across Hijri month starts
+FIRST, LAST = date(2025, 12, 20), date(2026, 1, 10)
+
+
+def local_table(first=FIRST, last=LAST):
+    calculator = LocalPrayerTimesCalculator(
+        CONFIG.default_latitude, CONFIG.default_longitude, calculation_method="izr",
+        fajr_angle=18, isha_angle=18,
+    )
+    return CompactTable.from_records(calculator.compute_table(first, last).records())
+
+
+def decode(body, wire_format):
+    if wire_format == "json":
+        return json.loads(body)
+    if wire_format == "columns":
+        return json.loads(body)
+    if wire_format == "msgpack":
+        return wire.msgpack.unpackb(body, raw=False)
+    return list(csv.DictReader(io.StringIO(body.decode(), newline="")))
+
+
+def from_columns(payload):
+    """Rebuild the table and the Hijri label of every row from a columnar payload."""
+    minutes = np.array(
+        [[UNDEFINED if value is None else value for value in payload[name]] for name in COLUMNS],
+        dtype=np.uint16,
+    )
+    labels = []
+    runs = payload["hijri"] + [{"row": payload["days"]}]
+    for run, following in zip(runs, runs[1:]):
+        for day in range(run["day"], run["day"] + following["row"] - run["row"]):
+            labels.append(f"{day:02d} {run['name']} {run['year']}")
+    return CompactTable(date.fromisoformat(payload["first"]), minutes), labels
+
+
+class TestWireFormats(SimpleTestCase):
+    def setUp(self):
+        self.table = local_table()
+        self.records = self.table.records(CONFIG.correction_day)
+
+    def encoded(self, wire_format, table=None):
+        return b"".join(encode_table(table or self.table, wire_format, CONFIG.correction_day))
+
+    def test_json_rows(self):
+        self.assertEqual(decode(self.encoded("json"), "json"), self.records)
+
+    def test_columns_round_trip(self):
+        table, labels = from_columns(decode(self.encoded("columns"), "columns"))
+        self.assertEqual(table.first, FIRST)
+        np.testing.assert_array_equal(table.minutes, self.table.minutes)
+        self.assertEqual(labels, [record["Hijri"] for record in self.records])
+
+    @skipIf(wire.msgpack is None, "msgpack is not installed")
+    def test_msgpack_carries_the_columns(self):
+        self.assertEqual(decode(self.encoded("msgpack"), "msgpack"), decode(self.encoded("columns"), "columns"))
+
+    def test_csv_rows(self):
+        rows = decode(self.encoded("csv"), "csv")
+        self.assertEqual(rows, [{field: str(record[field]) for field in CSV_FIELDS} for record in self.records])
+
+    def test_csv_streams_in_chunks(self):
+        chunks = list(wire.iter_csv(self.table, CONFIG.correction_day, rows_per_chunk=5))
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual("".join(chunks).encode(), self.encoded("csv"))
+        self.assertEqual(list(wire.iter_csv(self.table.rows(0, 0))), [",".join(CSV_FIELDS) + "\r\n"])
+
+    def test_undefined_times(self):
+        table = local_table(FIRST, FIRST)
+        table.minutes[COLUMNS.index("Isha"), 0] = UNDEFINED
+        payload = decode(self.encoded("columns", table), "columns")
+        self.assertEqual(payload["Isha"], [None])
+        restored, _ = from_columns(payload)
+        np.testing.assert_array_equal(restored.minutes, table.minutes)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            self.encoded("xml")
+
+
+class TestNegotiatedFormat(SimpleTestCase):
+    def negotiated(self, accept=None, requested=None):
+        headers = {} if accept is None else {"HTTP_ACCEPT": accept}
+        return views.negotiated_format(RequestFactory().get("/v2/prayer-times", **headers), requested)
+
+    def test_accept_header(self):
+        for accept, wire_format in (
+            (None, "json"),
+            ("*/*", "json"),
+            ("text/html", "json"),
+            ("text/csv", "csv"),
+            ("application/vnd.izr.prayer-columns+json", "columns"),
+            ("application/msgpack, application/json;q=0.5", "msgpack"),
+            ("text/csv;q=0.5, application/vnd.izr.prayer-columns+json", "columns"),
+            ("application/msgpack;q=0, text/csv;q=0.2", "csv"),
+        ):
+            with self.subTest(accept=accept):
+                self.assertEqual(self.negotiated(accept), wire_format)
+
+    def test_format_parameter_wins(self):
+        self.assertEqual(self.negotiated("text/csv", "COLUMNS"), "columns")
+
+    def test_msgpack_is_not_offered_without_the_package(self):
+        with mock.patch.object(wire, "msgpack", None):
+            self.assertEqual(self.negotiated("application/msgpack, text/csv;q=0.5"), "csv")
+
+
+@mock.patch.object(views, "config_version", return_value=("1-0", datetime(2025, 1, 1, tzinfo=timezone.utc)))
+@mock.patch.object(views.PrayerCalculationConfig.objects, "latest", return_value=CONFIG)
+class TestV2Formats(SimpleTestCase):
+    def setUp(self):
+        self.redis = mock.Mock(get=mock.Mock(return_value=None), ttl=mock.Mock(return_value=3600))
+        redis_settings = override_settings(REDIS_BINARY_CLIENT=self.redis)
+        redis_settings.enable()
+        self.addCleanup(redis_settings.disable)
+        for patcher in (
+            mock.patch.object(views, "local_cache", return_value=LocalCache()),
+            mock.patch.object(views, "query_prayer_times", return_value=("local", local_table())),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get(self, accept=None, **params):
+        # Keys in canonical (sorted) order, or the view redirects
+        query = dict(sorted({"from": FIRST.isoformat(), "period": "range", "to": LAST.isoformat(), **params}.items()))
+        headers = {} if accept is None else {"HTTP_ACCEPT": accept}
+        response = views.get_prayer_times_v2(RequestFactory().get("/v2/prayer-times", query, **headers))
+        self.assertEqual(response.status_code, 200, getattr(response, "content", b""))
+        body = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_each_format_by_accept_header(self, latest, version):
+        records = local_table().records(CONFIG.correction_day)
+        for wire_format, media_type in WIRE_FORMATS.items():
+            with self.subTest(wire_format):
+                response, body = self.get(accept=media_type)
+                self.assertEqual(response["Content-Type"], media_type)
+                self.assertIn("Accept", response["Vary"])
+                decoded = decode(body, wire_format)
+                if wire_format in ("columns", "msgpack"):
+                    self.assertEqual(decoded["days"], (LAST - FIRST).days + 1)
+                else:
+                    self.assertEqual([row["Datum"] for row in decoded], [record["Datum"] for record in records])
+
+    def test_explicit_format_is_not_varied_on_accept(self, latest, version):
+        response, body = self.get(accept="application/json", format="csv")
+        self.assertEqual(response["Content-Type"], WIRE_FORMATS["csv"])
+        self.assertNotIn("Accept,", response["Vary"] + ",")
+        self.assertEqual(len(decode(body, "csv")), (LAST - FIRST).days + 1)
+
+    def test_formats_get_their_own_etag(self, latest, version):
+        etags = {self.get(accept=media_type)[0]["ETag"] for media_type in WIRE_FORMATS.values()}
+        self.assertEqual(len(etags), len(WIRE_FORMATS))
+
+    def test_cached_encoding_is_served_as_is(self, latest, version):
+        _, body = self.get(accept=WIRE_FORMATS["columns"])
+        (key, ttl, cached), _ = self.redis.setex.call_args
+        self.assertEqual((ttl, cached), (3600, body))
+        self.redis.get.return_value = cached
+        response, again = self.get(accept=WIRE_FORMATS["columns"])
+        self.assertEqual((response[views.SOURCE_HEADER], again), ("cache", body))
+        self.assertEqual(self.redis.get.call_args.args[0], key)
+
@@ -12,7 +12,14 @@ from .views import (
     StatementView,
     send_email_post,
     old_get_prayer_times,
-    prayer_times
+    prayer_times,
+    compare_methods,
+    sunnah_times,
+    ramadan_timetable,
+    hijri_month,
+    next_prayer,
+    prayer_calendar,
+    prayer_times_v2,
 )
 
 
@@ -34,6 +41,13 @@ urlpatterns = [
     path("send_email/", send_email_post, name="send_email_post"),
     path("calculation-methods/", CalculationMethodListAPIView.as_view(),
          name="calculation-methods-list"),
-    path("prayer-times", prayer_times, name="monthly-prayer-times")
+    path("prayer-times", prayer_times, name="monthly-prayer-times"),
+    path("prayer-times/compare-methods", compare_methods, name="compare-methods"),
+    path("prayer-times/sunnah", sunnah_times, name="sunnah-times"),
+    path("prayer-times/ramadan", ramadan_timetable, name="ramadan-timetable"),
+    path("prayer-times/hijri-month", hijri_month, name="hijri-month"),
+    path("prayer-times/next", next_prayer, name="next-prayer"),
+    path("prayer-times/calendar.ics", prayer_calendar, name="prayer-calendar"),
+    path("v2/prayer-times", prayer_times_v2, name="prayer-times-v2"),
 
 ]
@@ -174,6 +174,55 @@ def old_get_prayer_times(request):
     return old_calculation(request=request)
 
 
+@csrf_exempt
+def compare_methods(request):
+    from .prayer_times.views import get_compare_methods
+
+    return get_compare_methods(request)
+
+
+@csrf_exempt
+def sunnah_times(request):
+    from .prayer_times.views import get_sunnah_times
+
+    return get_sunnah_times(request)
+
+
+@csrf_exempt
+def ramadan_timetable(request):
+    from .prayer_times.views import get_ramadan_timetable
+
+    return get_ramadan_timetable(request)
+
+
+@csrf_exempt
+def hijri_month(request):
+    from .prayer_times.views import get_hijri_month
+
+    return get_hijri_month(request)
+
+
+@csrf_exempt
+def next_prayer(request):
+    from .prayer_times.views import get_next_prayer
+
+    return get_next_prayer(request)
+
+
+@csrf_exempt
+def prayer_calendar(request):
+    from .prayer_times.views import get_prayer_calendar
+
+    return get_prayer_calendar(request)
+
+
+@csrf_exempt
+def prayer_times_v2(request):
+    from .prayer_times.views import get_prayer_times_v2
+
+    return get_prayer_times_v2(request)
+
+
 class CalculationMethodListAPIView(generics.ListAPIView):
     queryset = CalculationMethod.objects.all()
     serializer_class = CalculationMethodSerializer
@@ -144,6 +144,40 @@ REDIS_CLIENT = redis.StrictRedis(
     db=REDIS_DB,
     decode_responses=True  # ensures JSON/string encoding works smoothly
 )
+# Same Redis for packed binary values (compact prayer tables)
+REDIS_BINARY_CLIENT = redis.StrictRedis(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    db=REDIS_DB,
+    decode_responses=False
+)
+
+# "aladhan" fetches prayer times from api.aladhan.com, "local" computes them in-process
+PRAYER_TIMES_BACKEND = env.str("PRAYER_TIMES_BACKEND", "aladhan")
+# Fetch annual aladhan tables as 12 concurrent monthly requests
+ALADHAN_MONTHLY_FAN_OUT = env.bool("ALADHAN_MONTHLY_FAN_OUT", True)
+# Seconds a prayer times source may take before the next one is started alongside it
+PRAYER_TIMES_LATENCY_BUDGET = env.float("PRAYER_TIMES_LATENCY_BUDGET", 2.5)
+# Seconds all aladhan calls of one fetch may take together, retries and monthly
+# fan-out rounds included; they also stop once another source has answered
+ALADHAN_DEADLINE = env.float("ALADHAN_DEADLINE", 10.0)
+# Cache lifetime of tables served by a fallback source instead of the preferred one
+PRAYER_TIMES_FALLBACK_TTL = env.int("PRAYER_TIMES_FALLBACK_TTL", 3600)
+# From this latitude on, prayer times are computed locally (with the high-latitude
+# rules) instead of asking aladhan first
+PRAYER_TIMES_LOCAL_LATITUDE = env.float("PRAYER_TIMES_LOCAL_LATITUDE", 55.0)
+# Raw aladhan responses on disk: "read-through" (archive, then upstream), "replay"
+# (archive instead of upstream, no network, for tests and benchmarks) or "off"
+ALADHAN_ARCHIVE_MODE = env.str("ALADHAN_ARCHIVE_MODE", "read-through")
+ALADHAN_ARCHIVE_DIR = env.str("ALADHAN_ARCHIVE_DIR", str(BASE_DIR / "aladhan_archive"))
+# Least recently used responses are dropped beyond this size (MB) and age (days); 0 = no limit
+ALADHAN_ARCHIVE_MAX_MB = env.int("ALADHAN_ARCHIVE_MAX_MB", 256)
+ALADHAN_ARCHIVE_MAX_AGE_DAYS = env.int("ALADHAN_ARCHIVE_MAX_AGE_DAYS", 400)
+# max-age of cacheable GET prayer time responses; revalidated with ETags afterwards
+PRAYER_TIMES_HTTP_MAX_AGE = env.int("PRAYER_TIMES_HTTP_MAX_AGE", 3600)
+# In-process cache of decoded tables per worker: entries (0 turns it off) and seconds
+PRAYER_TIMES_L1_SIZE = env.int("PRAYER_TIMES_L1_SIZE", 256)
+PRAYER_TIMES_L1_TTL = env.float("PRAYER_TIMES_L1_TTL", 300)
 
 
 # Password validation